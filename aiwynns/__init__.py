@@ -6,10 +6,14 @@ A sophisticated system for managing AI-generated fiction novel ideas
 __version__ = "1.2.1"
 __author__ = "Aiwynn"
 
-from .database import ConceptDatabase
-from .search import SearchEngine
-from .stats import StatsGenerator
-from .creator import Creator
+# Public classes are imported on first access so that importing a single
+# submodule (e.g. the CLI) does not pull in every dependency.
+_LAZY_IMPORTS = {
+    'ConceptDatabase': '.database',
+    'SearchEngine': '.search',
+    'StatsGenerator': '.stats',
+    'Creator': '.creator',
+}
 
 __all__ = [
     'ConceptDatabase',
@@ -17,3 +21,12 @@ __all__ = [
     'StatsGenerator',
     'Creator',
 ]
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        from importlib import import_module
+        value = getattr(import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
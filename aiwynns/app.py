@@ -5,16 +5,14 @@ A sophisticated tool for managing AI-generated story concepts
 """
 
 import os
+import re
 import sys
+import functools
+import itertools
+import logging
 from pathlib import Path
-from importlib.metadata import version
 
 import click
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.markdown import Markdown
-from rich import box
 
 # Get workspace root
 # When installed as package, use CWD (user's workspace)
@@ -26,23 +24,187 @@ else:
     # Installed mode: use current working directory as workspace
     PROJECT_ROOT = Path.cwd()
 
-from aiwynns.database import ConceptDatabase
-from aiwynns.search import SearchEngine
-from aiwynns.stats import StatsGenerator
-from aiwynns.creator import Creator
-from aiwynns.logging_config import setup_logging
-import logging
+# A top-level or second-level heading ends a story section
+_MAJOR_HEADING_RE = re.compile(r'^#{1,2} ', re.MULTILINE)
 
-# Setup logging (INFO level for CLI, logs to file if AIWYNNS_LOG_FILE env var is set)
-setup_logging(level=logging.INFO, console_output=False)
+# Longest cell speedtable lays out correctly (it measures cells in a fixed
+# 256-byte buffer); tables with longer cells are rendered with Rich
+SPEEDTABLE_MAX_CELL = 200
+
+# Rich, the database and the analysis modules are imported inside the
+# commands that use them so `--help` and unrelated commands start fast.
 logger = logging.getLogger(__name__)
 
-console = Console()
-db = ConceptDatabase(PROJECT_ROOT)
+
+@functools.lru_cache(maxsize=1)
+def get_console():
+    """Get the shared Rich console (created on first use)"""
+    from rich.console import Console
+    return Console()
+
+
+@functools.lru_cache(maxsize=1)
+def get_db():
+    """Get the workspace database (created on first use)"""
+    from aiwynns.database import ConceptDatabase
+    return ConceptDatabase(PROJECT_ROOT)
+
+
+def print_markdown(text):
+    """
+    Render markdown to the console
+
+    Links are printed inline as text rather than as terminal hyperlinks,
+    so no per-link hyperlink styles are generated.
+    """
+    from rich.markdown import Markdown
+
+    get_console().print(Markdown(text, hyperlinks=False))
+
+
+@functools.lru_cache(maxsize=32)
+def _section_heading_re(section):
+    """Compile the pattern for a story section's heading (once per section name)"""
+    return re.compile(r'^#{2,3} ' + re.escape(section), re.MULTILINE | re.IGNORECASE)
+
+
+def extract_section(markdown_content, section):
+    """
+    Get a section of a story by (the start of) its heading
+
+    The section starts at the first ``##`` or ``###`` heading beginning
+    with ``section`` (case-insensitive) and runs up to the next ``#`` or
+    ``##`` heading that does not also begin with ``section``, so ``###``
+    subsections are included.
+
+    Args:
+        markdown_content: Story markdown without frontmatter
+        section: Section name, e.g. "characters"
+
+    Returns:
+        The section text including its heading, or None if not found
+    """
+    heading_re = _section_heading_re(section)
+    start_match = heading_re.search(markdown_content)
+    if not start_match:
+        return None
+
+    end = None
+    pos = start_match.end()
+    while (line_end := markdown_content.find('\n', pos)) != -1:
+        end_match = _MAJOR_HEADING_RE.search(markdown_content, line_end + 1)
+        if not end_match:
+            break
+        if not heading_re.match(markdown_content, end_match.start()):
+            end = end_match.start() - 1
+            break
+        pos = end_match.end()
+
+    return markdown_content[start_match.start():end]
+
+
+def load_yaml(text):
+    """Parse YAML safely, using the libyaml-backed loader when available"""
+    import yaml
+
+    return yaml.load(text, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+
+def fetch_page(records, page, page_size):
+    """
+    Take one page from an iterator of records
+
+    Only the records up to the end of the page (plus one, to tell whether
+    another page follows) are pulled from the iterator.
+
+    Args:
+        records: Iterator of records in display order
+        page: 1-based page number
+        page_size: Number of records per page
+
+    Returns:
+        Tuple of (records on the page, whether more records follow)
+    """
+    start = (page - 1) * page_size
+    window = list(itertools.islice(records, start, start + page_size + 1))
+    return window[:page_size], len(window) > page_size
+
+
+def print_table(title, columns, rows):
+    """
+    Print a table of rows, using the speedtable C renderer when available
+
+    When stdout is not a terminal (e.g. piped to grep or cut) no table is
+    drawn at all: a header line and one tab-separated line per row are
+    written directly. On a terminal, speedtable (an optional dependency
+    that lays out large tables much faster than Rich) is used if installed
+    and every cell is short ASCII text, since it sizes cells by their UTF-8
+    bytes; otherwise the table is rendered with Rich.
+
+    Args:
+        title: Table title
+        columns: List of ``(name, type_name, rich_column_kwargs)`` tuples
+        rows: List of row tuples of display strings, one value per column
+    """
+    console = get_console()
+
+    if not console.is_terminal:
+        names = [name for name, _, _ in columns]
+        lines = ['\t'.join(names)]
+        lines.extend('\t'.join(_plain_cell(value) for value in row) for row in rows)
+        sys.stdout.write('\n'.join(lines) + '\n')
+        return
+
+    try:
+        import speedtable
+    except ImportError:
+        speedtable = None
+
+    # Multi-byte characters would push a row's borders out of line, and long
+    # cells would not fit speedtable's buffer
+    if speedtable is not None and all(
+        value.isascii() and len(value) <= SPEEDTABLE_MAX_CELL for row in rows for value in row
+    ):
+        names = [name for name, _, _ in columns]
+        table_data = {
+            'columns': [{'name': name, 'type': type_name} for name, type_name, _ in columns],
+            'rows': [dict(zip(names, row)) for row in rows],
+        }
+        print(speedtable.render_table(table_data, 'cyan', 'white', 'white', 'yellow', title, 'magenta'))
+        return
+
+    from rich.table import Table
+    from rich import box
+
+    table = Table(title=title, box=box.ROUNDED)
+    for name, _, options in columns:
+        table.add_column(name, **options)
+    for row in rows:
+        table.add_row(*row)
+    console.print(table)
+
+
+def _plain_cell(value):
+    """Make a value safe for a tab-separated line"""
+    return value.replace('\t', ' ').replace('\n', ' ')
+
+
+def print_status(message):
+    """
+    Print a dimmed status line below a listing
+
+    When stdout is piped the line goes to stderr instead, so it does not
+    mix with the tab-separated rows.
+    """
+    console = get_console()
+    if console.is_terminal:
+        console.print(f"[dim]{message}[/dim]")
+    else:
+        click.echo(message, err=True)
 
 
 @click.group()
-@click.version_option(version=version("aiwynns-idea-factory"))
+@click.version_option(package_name="aiwynns-idea-factory")
 def cli():
     """
     Aiwynn's Idea Factory - Manage your story concepts with style!
@@ -50,46 +212,51 @@ def cli():
     A sophisticated system for capturing, organizing, and developing
     AI-generated fiction novel ideas.
     """
-    pass
+    from aiwynns.logging_config import setup_logging
+
+    # Setup logging (INFO level for CLI, logs to file if AIWYNNS_LOG_FILE env var is set)
+    setup_logging(level=logging.INFO, console_output=False)
 
 
 @cli.command()
 @click.option('--status', '-s', help='Filter by status')
 @click.option('--genre', '-g', help='Filter by genre')
 @click.option('--sort', '-S', type=click.Choice(['date', 'count', 'genre']), default='date')
-def list_batches(status, genre, sort):
+@click.option('--page', '-p', type=click.IntRange(min=1), default=1, help='Page number to show')
+@click.option('--page-size', type=click.IntRange(min=1), default=50, show_default=True, help='Rows per page')
+@click.option('--after', help='Resume after this cursor (printed below a partial page)')
+def list_batches(status, genre, sort, page, page_size, after):
     """List all concept batches"""
-    batches = db.get_all_batches()
-
-    # Apply filters
-    if status:
-        batches = [b for b in batches if b.get('status') == status]
-    if genre:
-        batches = [b for b in batches if genre.lower() in str(b.get('genre', '')).lower()]
-
-    # Sort
-    if sort == 'date':
-        batches.sort(key=lambda x: x.get('date_generated', ''), reverse=True)
-    elif sort == 'count':
-        batches.sort(key=lambda x: x.get('count', 0), reverse=True)
-    elif sort == 'genre':
-        batches.sort(key=lambda x: x.get('genre', ''))
+    from aiwynns.database import batch_cursor
+    from aiwynns.exceptions import ValidationError
+
+    console = get_console()
+    db = get_db()
+
+    try:
+        batches, has_more = fetch_page(
+            db.iter_batches(status=status, genre=genre, sort=sort, after=after),
+            page,
+            page_size
+        )
+    except ValidationError as e:
+        console.print(f"[red]{e}[/red]")
+        return
 
     if not batches:
         console.print("[yellow]No batches found.[/yellow]")
         return
 
-    # Create table
-    table = Table(title="📚 Concept Batches", box=box.ROUNDED)
-    table.add_column("Batch ID", style="cyan", no_wrap=True)
-    table.add_column("Date", style="green")
-    table.add_column("Genre", style="magenta")
-    table.add_column("Count", justify="right", style="yellow")
-    table.add_column("Status", style="blue")
-    table.add_column("Location", style="dim")
-
-    for batch in batches:
-        table.add_row(
+    columns = [
+        ("Batch ID", "str", {'style': "cyan", 'no_wrap': True}),
+        ("Date", "date", {'style': "green"}),
+        ("Genre", "str", {'style': "magenta"}),
+        ("Count", "int", {'justify': "right", 'style': "yellow"}),
+        ("Status", "str", {'style': "blue"}),
+        ("Location", "str", {'style': "dim"}),
+    ]
+    rows = [
+        (
             str(batch.get('batch_id', 'N/A')),
             str(batch.get('date_generated', 'N/A')),
             str(batch.get('genre', 'N/A')),
@@ -97,48 +264,56 @@ def list_batches(status, genre, sort):
             str(batch.get('status', 'N/A')),
             str(batch.get('location', 'N/A'))
         )
+        for batch in batches
+    ]
 
-    console.print(table)
-    console.print(f"\n[dim]Total: {len(batches)} batches[/dim]")
+    print_table("📚 Concept Batches", columns, rows)
+    if has_more or page > 1 or after:
+        print_status(f"\nShowing {len(batches)} batches (page {page})")
+    else:
+        print_status(f"\nTotal: {len(batches)} batches")
+    if has_more:
+        print_status(f"Next page: rerun with --after {batch_cursor(batches[-1])}")
 
 
 @cli.command()
 @click.option('--status', '-s', help='Filter by status')
 @click.option('--genre', '-g', help='Filter by genre')
 @click.option('--sort', '-S', type=click.Choice(['title', 'created', 'updated', 'genre']), default='updated')
-def list_stories(status, genre, sort):
+@click.option('--page', '-p', type=click.IntRange(min=1), default=1, help='Page number to show')
+@click.option('--page-size', type=click.IntRange(min=1), default=50, show_default=True, help='Rows per page')
+@click.option('--after', help='Resume after this cursor (printed below a partial page)')
+def list_stories(status, genre, sort, page, page_size, after):
     """List all stories in development"""
-    stories = db.get_all_stories()
-
-    # Apply filters
-    if status:
-        stories = [s for s in stories if s.get('status') == status]
-    if genre:
-        stories = [s for s in stories if genre.lower() in str(s.get('genre', '')).lower()]
-
-    # Sort
-    if sort == 'title':
-        stories.sort(key=lambda x: str(x.get('title', '')))
-    elif sort == 'created':
-        stories.sort(key=lambda x: str(x.get('date_created', '')), reverse=True)
-    elif sort == 'updated':
-        stories.sort(key=lambda x: str(x.get('date_updated', '')), reverse=True)
-    elif sort == 'genre':
-        stories.sort(key=lambda x: str(x.get('genre', '')))
+    from aiwynns.database import story_cursor
+    from aiwynns.exceptions import ValidationError
+
+    console = get_console()
+    db = get_db()
+
+    try:
+        stories, has_more = fetch_page(
+            db.iter_stories(status=status, genre=genre, sort=sort, after=after),
+            page,
+            page_size
+        )
+    except ValidationError as e:
+        console.print(f"[red]{e}[/red]")
+        return
 
     if not stories:
         console.print("[yellow]No stories found.[/yellow]")
         return
 
-    # Create table
-    table = Table(title="📖 Stories in Development", box=box.ROUNDED)
-    table.add_column("Story Name", style="cyan", no_wrap=True)
-    table.add_column("Title", style="bold")
-    table.add_column("Genre", style="magenta")
-    table.add_column("Status", style="blue")
-    table.add_column("Created", style="green")
-    table.add_column("Updated", style="yellow")
-
+    columns = [
+        ("Story Name", "str", {'style': "cyan", 'no_wrap': True}),
+        ("Title", "str", {'style': "bold"}),
+        ("Genre", "str", {'style': "magenta"}),
+        ("Status", "str", {'style': "blue"}),
+        ("Created", "date", {'style': "green"}),
+        ("Updated", "date", {'style': "yellow"}),
+    ]
+    rows = []
     for story in stories:
         # Extract story name (filename without .md) from file_path
         file_path = story.get('file_path', '')
@@ -147,18 +322,23 @@ def list_stories(status, genre, sort):
         else:
             story_name = 'N/A'
 
-        table.add_row(
+        rows.append((
             story_name,
             str(story.get('title', 'N/A')),
             str(story.get('genre', 'N/A')),
             str(story.get('status', 'N/A')),
             str(story.get('date_created', 'N/A')),
             str(story.get('date_updated', 'N/A'))
-        )
+        ))
 
-    console.print(table)
-    console.print(f"\n[dim]Total: {len(stories)} stories[/dim]")
-    console.print(f"[dim]Use: idea-factory review-story <story-name>[/dim]")
+    print_table("📖 Stories in Development", columns, rows)
+    if has_more or page > 1 or after:
+        print_status(f"\nShowing {len(stories)} stories (page {page})")
+    else:
+        print_status(f"\nTotal: {len(stories)} stories")
+    if has_more:
+        print_status(f"Next page: rerun with --after {story_cursor(stories[-1])}")
+    print_status("Use: idea-factory review-story <story-name>")
 
 
 @cli.command()
@@ -170,6 +350,13 @@ def list_stories(status, genre, sort):
 @click.option('--limit', '-l', default=20, help='Max results to show')
 def search(query, genre, trope, status, fuzzy, limit):
     """Search through concepts and stories"""
+    from rich.panel import Panel
+    from rich import box
+    from aiwynns.search import SearchEngine
+
+    console = get_console()
+    db = get_db()
+
     search_engine = SearchEngine(db)
 
     results = search_engine.search(
@@ -190,25 +377,35 @@ def search(query, genre, trope, status, fuzzy, limit):
         box=box.DOUBLE
     ))
 
+    # Build all result lines and print them in one go
+    lines = []
     for i, result in enumerate(results, 1):
-        console.print(f"\n[bold cyan]{i}. {result['title']}[/bold cyan]")
-        console.print(f"   [dim]Type:[/dim] {result['type']}")
-        console.print(f"   [dim]Genre:[/dim] {result.get('genre', 'N/A')}")
-        console.print(f"   [dim]File:[/dim] {result['file']}")
+        lines.append(f"\n[bold cyan]{i}. {result['title']}[/bold cyan]")
+        lines.append(f"   [dim]Type:[/dim] {result['type']}")
+        lines.append(f"   [dim]Genre:[/dim] {result.get('genre', 'N/A')}")
+        lines.append(f"   [dim]File:[/dim] {result['file']}")
 
         if 'score' in result:
-            console.print(f"   [dim]Match:[/dim] {result['score']:.0%}")
+            lines.append(f"   [dim]Match:[/dim] {result['score']:.0%}")
 
         if 'preview' in result:
-            console.print(f"   [dim]Preview:[/dim] {result['preview'][:150]}...")
+            lines.append(f"   [dim]Preview:[/dim] {result['preview'][:150]}...")
 
-    console.print(f"\n[dim]Showing {len(results)} of {len(results)} results[/dim]")
+    lines.append(f"\n[dim]Showing {len(results)} of {len(results)} results[/dim]")
+    console.print('\n'.join(lines))
 
 
 @cli.command()
 @click.option('--detailed', '-d', is_flag=True, help='Show detailed statistics')
 def stats(detailed):
     """Display statistics and analytics"""
+    from rich.panel import Panel
+    from rich import box
+    from aiwynns.stats import StatsGenerator
+
+    console = get_console()
+    db = get_db()
+
     stats_gen = StatsGenerator(db)
     stats_data = stats_gen.generate_stats()
 
@@ -254,6 +451,12 @@ def stats(detailed):
 @click.option('--count', '-c', default=10, help='Number of concepts')
 def new_batch(genre, tropes, model, count):
     """Create a new concept batch"""
+    from rich.panel import Panel
+    from rich import box
+    from aiwynns.creator import Creator
+
+    console = get_console()
+
     creator = Creator(PROJECT_ROOT)
     file_path = creator.create_batch(genre, tropes, model, count)
 
@@ -277,6 +480,12 @@ def new_batch(genre, tropes, model, count):
 @click.option('--origin', '-o', help='Origin batch ID (if any)')
 def new_story(title, genre, origin):
     """Create a new story development file"""
+    from rich.panel import Panel
+    from rich import box
+    from aiwynns.creator import Creator
+
+    console = get_console()
+
     creator = Creator(PROJECT_ROOT)
     file_path = creator.create_story(title, genre, origin)
 
@@ -295,6 +504,9 @@ def update_index():
     """Update the INDEX.md database file"""
     from aiwynns.indexer import Indexer
 
+    console = get_console()
+    db = get_db()
+
     indexer = Indexer(PROJECT_ROOT, db)
     indexer.update_index()
 
@@ -309,6 +521,9 @@ def export(format, output, type):
     """Export data to various formats"""
     from aiwynns.exporter import Exporter
 
+    console = get_console()
+    db = get_db()
+
     exporter = Exporter(db)
 
     if not output:
@@ -323,6 +538,12 @@ def export(format, output, type):
 @click.argument('batch_id')
 def show(batch_id):
     """Show detailed view of a specific batch"""
+    from rich.panel import Panel
+    from rich import box
+
+    console = get_console()
+    db = get_db()
+
     batch = db.get_batch(batch_id)
 
     if not batch:
@@ -355,6 +576,12 @@ def show(batch_id):
 @click.option('--no-metadata', is_flag=True, help='Hide YAML frontmatter')
 def review_batch(batch_id, concept, no_metadata):
     """Review a batch with beautiful markdown rendering"""
+    from rich.panel import Panel
+    from rich import box
+
+    console = get_console()
+    db = get_db()
+
     batch = db.get_batch(batch_id)
 
     if not batch:
@@ -368,8 +595,7 @@ def review_batch(batch_id, concept, no_metadata):
         return
 
     # Read the raw file
-    with open(file_path, 'r') as f:
-        content = f.read()
+    content = Path(file_path).read_text(encoding='utf-8')
 
     # Split frontmatter and content
     parts = content.split('---', 2)
@@ -395,29 +621,25 @@ def review_batch(batch_id, concept, no_metadata):
 
     # If specific concept requested, filter to that
     if concept:
-        # Extract just that concept
-        lines = markdown_content.split('\n')
-        concept_lines = []
-        in_target_concept = False
-
-        for line in lines:
-            if line.startswith(f'## Concept {concept}:'):
-                in_target_concept = True
-                concept_lines.append(line)
-            elif in_target_concept:
-                if line.startswith('## Concept '):
-                    break
-                concept_lines.append(line)
-
-        if concept_lines:
-            markdown_content = '\n'.join(concept_lines)
+        # Extract just that concept: from its header line up to the next
+        # concept header
+        header = f'## Concept {concept}:'
+        if markdown_content.startswith(header):
+            start = 0
         else:
+            start = markdown_content.find('\n' + header)
+            if start != -1:
+                start += 1
+
+        if start == -1:
             console.print(f"[yellow]Concept #{concept} not found in this batch[/yellow]")
             return
 
+        end = markdown_content.find('\n## Concept ', start)
+        markdown_content = markdown_content[start:end if end != -1 else None]
+
     # Render the markdown
-    md = Markdown(markdown_content)
-    console.print(md)
+    print_markdown(markdown_content)
 
     # Show file path at bottom
     console.print()
@@ -430,6 +652,11 @@ def review_batch(batch_id, concept, no_metadata):
 def develop_concept(batch_id, concept_number):
     """Extract a concept from a batch and create a story development file"""
     from datetime import datetime
+    from rich.panel import Panel
+    from rich import box
+
+    console = get_console()
+    db = get_db()
 
     # Get the batch
     batch = db.get_batch(batch_id)
@@ -439,7 +666,7 @@ def develop_concept(batch_id, concept_number):
         return
 
     # Find the concept
-    concepts = batch.get('concepts', [])
+    concepts = db.get_concepts(batch)
 
     target_concept = None
     for concept in concepts:
@@ -457,38 +684,18 @@ def develop_concept(batch_id, concept_number):
     content = target_concept.get('content', '')
 
     # Parse content to extract high concept, synopsis, key elements
-    lines = content.split('\n')
-    high_concept = ""
-    synopsis = ""
-    key_elements = []
-    initial_thoughts = ""
-
-    current_section = None
-    for line in lines:
-        line = line.strip()
-        if line.startswith('**High Concept**:'):
-            current_section = 'high_concept'
-            high_concept = line.replace('**High Concept**:', '').strip()
-        elif line.startswith('**Synopsis**:'):
-            current_section = 'synopsis'
-            synopsis = line.replace('**Synopsis**:', '').strip()
-        elif line.startswith('**Key Elements**:'):
-            current_section = 'key_elements'
-        elif line.startswith('**Initial Thoughts**:'):
-            current_section = 'initial_thoughts'
-            initial_thoughts = line.replace('**Initial Thoughts**:', '').strip()
-        elif line.startswith('-') and current_section == 'key_elements':
-            key_elements.append(line[1:].strip())
-        elif line and current_section == 'synopsis' and not line.startswith('**'):
-            synopsis += ' ' + line
-        elif line and current_section == 'initial_thoughts' and not line.startswith('**'):
-            initial_thoughts += ' ' + line
+    from aiwynns.creator import Creator, parse_concept_sections, render_template
+    sections = parse_concept_sections(content)
+    high_concept = sections['high_concept']
+    synopsis = sections['synopsis']
+    key_elements = sections['key_elements']
+    initial_thoughts = sections['initial_thoughts']
 
     # Create story filename from title
-    from aiwynns.creator import Creator
     creator = Creator(PROJECT_ROOT)
     filename = creator._slugify(title)
-    story_id = f"{filename}-{int(datetime.now().timestamp())}"
+    now = datetime.now()
+    story_id = f"{filename}-{int(now.timestamp())}"
 
     story_file = PROJECT_ROOT / "stories" / f"{filename}.md"
 
@@ -498,54 +705,46 @@ def develop_concept(batch_id, concept_number):
             console.print("[yellow]Cancelled[/yellow]")
             return
 
-    # Read the story template
-    template_file = PROJECT_ROOT / "templates" / "story-development.md"
-    with open(template_file, 'r') as f:
-        template_content = f.read()
+    # Read the story template (cached until the file changes)
+    template_content = creator._load_template("story-development.md")
 
     # Replace placeholders
     genre = batch.get('genre', 'Unknown')
-    today = datetime.now().strftime("%Y-%m-%d")
+    today = now.strftime("%Y-%m-%d")
 
-    story_content = template_content.replace("[unique-id]", story_id)
-    story_content = story_content.replace("[Working Title]", title)
-    story_content = story_content.replace("[Story Title]", title)
-    story_content = story_content.replace("[genre]", genre)
-    story_content = story_content.replace("[batch_id if from generated concepts]", batch_id)
-    story_content = story_content.replace("YYYY-MM-DD", today)
+    replacements = {
+        "[unique-id]": story_id,
+        "[Working Title]": title,
+        "[Story Title]": title,
+        "[genre]": genre,
+        "[batch_id if from generated concepts]": batch_id,
+        "YYYY-MM-DD": today,
+    }
 
     # Replace high concept and logline with extracted data
-    story_content = story_content.replace(
-        "[One-line pitch that captures the essence]",
-        high_concept if high_concept else "[One-line pitch that captures the essence]"
-    )
-    story_content = story_content.replace(
-        "[2-3 sentence compelling description]",
-        synopsis if synopsis else "[2-3 sentence compelling description]"
-    )
+    if high_concept:
+        replacements["[One-line pitch that captures the essence]"] = high_concept
+    if synopsis:
+        replacements["[2-3 sentence compelling description]"] = synopsis
 
     # Add key elements and initial thoughts to Development Notes
-    dev_notes = f"\n### [{today}] From Batch {batch_id}, Concept #{concept_number}\n\n"
+    dev_notes = [f"\n### [{today}] From Batch {batch_id}, Concept #{concept_number}\n\n"]
 
     if key_elements:
-        dev_notes += "**Key Elements from Concept:**\n"
-        for element in key_elements:
-            dev_notes += f"- {element}\n"
-        dev_notes += "\n"
+        dev_notes.append("**Key Elements from Concept:**\n")
+        dev_notes.extend(f"- {element}\n" for element in key_elements)
+        dev_notes.append("\n")
 
     if initial_thoughts:
-        dev_notes += f"**Initial Thoughts:**\n{initial_thoughts}\n"
+        dev_notes.append(f"**Initial Thoughts:**\n{initial_thoughts}\n")
 
     # Add to development notes section
-    if "## Development Notes" in story_content:
-        story_content = story_content.replace(
-            "## Development Notes",
-            f"## Development Notes{dev_notes}"
-        )
+    replacements["## Development Notes"] = "## Development Notes" + "".join(dev_notes)
+
+    story_content = render_template(template_content, replacements)
 
     # Write the story file
-    with open(story_file, 'w') as f:
-        f.write(story_content)
+    story_file.write_text(story_content, encoding='utf-8')
 
     console.print(Panel(
         f"[green]✓[/green] Created story development file: [cyan]{filename}[/cyan]\n\n"
@@ -568,6 +767,11 @@ def develop_concept(batch_id, concept_number):
 @click.option('--no-metadata', is_flag=True, help='Hide YAML frontmatter')
 def review_story(story_name, section, no_metadata):
     """Review a story development file with beautiful markdown rendering"""
+    from rich.panel import Panel
+    from rich import box
+
+    console = get_console()
+
     # Find the story file
     story_file = PROJECT_ROOT / "stories" / f"{story_name}.md"
 
@@ -580,8 +784,7 @@ def review_story(story_name, section, no_metadata):
             return
 
     # Read and parse the file
-    with open(story_file, 'r') as f:
-        content = f.read()
+    content = story_file.read_text(encoding='utf-8')
 
     # Split frontmatter and content
     parts = content.split('---', 2)
@@ -589,12 +792,13 @@ def review_story(story_name, section, no_metadata):
         frontmatter_text = parts[1].strip()
         markdown_content = parts[2].strip()
 
-        # Parse frontmatter for display
-        import yaml
-        try:
-            frontmatter = yaml.safe_load(frontmatter_text)
-        except:
-            frontmatter = {}
+        # Parse frontmatter for display (not needed if it is hidden)
+        frontmatter = {}
+        if not no_metadata:
+            try:
+                frontmatter = load_yaml(frontmatter_text)
+            except:
+                frontmatter = {}
     else:
         frontmatter = {}
         markdown_content = content
@@ -617,32 +821,14 @@ def review_story(story_name, section, no_metadata):
 
     # If specific section requested, filter to that
     if section:
-        # Try to extract the section
-        lines = markdown_content.split('\n')
-        section_lines = []
-        in_target_section = False
-        section_header = f"## {section.title()}"
-
-        for line in lines:
-            # Check for section start (case-insensitive)
-            if line.lower().startswith(f"## {section.lower()}") or line.lower().startswith(f"### {section.lower()}"):
-                in_target_section = True
-                section_lines.append(line)
-            elif in_target_section:
-                # Stop at next major section
-                if line.startswith('## ') or line.startswith('# '):
-                    break
-                section_lines.append(line)
-
-        if section_lines:
-            markdown_content = '\n'.join(section_lines)
-        else:
+        section_content = extract_section(markdown_content, section)
+        if section_content is None:
             console.print(f"[yellow]Section '{section}' not found in this story[/yellow]")
             return
+        markdown_content = section_content
 
     # Render the markdown
-    md = Markdown(markdown_content)
-    console.print(md)
+    print_markdown(markdown_content)
 
     # Show file path at bottom
     console.print()
@@ -656,6 +842,9 @@ def review_story(story_name, section, no_metadata):
 def note(story_name, note_text, section):
     """Add a quick note/idea to a story development file"""
     from datetime import datetime
+    from aiwynns.database import date_updated_edit
+
+    console = get_console()
 
     # Find the story file
     story_file = PROJECT_ROOT / "stories" / f"{story_name}.md"
@@ -671,57 +860,51 @@ def note(story_name, note_text, section):
         note_text = click.prompt("Note")
 
     # Read the file
-    with open(story_file, 'r') as f:
-        content = f.read()
+    content = story_file.read_text(encoding='utf-8')
 
     # Format the note with timestamp
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+    now = datetime.now()
+    timestamp = now.strftime("%Y-%m-%d %H:%M")
     note_entry = f"\n### [{timestamp}]\n{note_text}\n"
 
     # If section specified, try to add to that section
     if section:
         # Look for "Development Notes" or specified section
         target_section = f"## {section.title()}"
-        if target_section in content:
-            # Add note at end of that section
-            parts = content.split(target_section)
-            if len(parts) > 1:
-                # Find the next section
-                next_section_idx = parts[1].find('\n## ')
-                if next_section_idx != -1:
-                    parts[1] = parts[1][:next_section_idx] + note_entry + parts[1][next_section_idx:]
-                else:
-                    parts[1] += note_entry
-                content = target_section.join(parts)
+        start = content.find(target_section)
+        if start != -1:
+            # Add note at end of that section: before the next heading, or
+            # before the section's next mention if that comes first
+            start += len(target_section)
+            end = content.find(target_section, start)
+            if end == -1:
+                end = len(content)
+            next_section_idx = content.find('\n## ', start, end)
+            insert_at = end if next_section_idx == -1 else next_section_idx
+            content = content[:insert_at] + note_entry + content[insert_at:]
         else:
             console.print(f"[yellow]Section '{section}' not found, adding to Development Notes[/yellow]")
             section = None
 
     # If no section or section not found, add to Development Notes
     if not section:
-        if "## Development Notes" in content:
-            content = content.replace("## Development Notes", f"## Development Notes{note_entry}", 1)
+        notes_idx = content.find("## Development Notes")
+        if notes_idx != -1:
+            insert_at = notes_idx + len("## Development Notes")
+            content = content[:insert_at] + note_entry + content[insert_at:]
         else:
             # Add Development Notes section at the end
             content += f"\n\n## Development Notes{note_entry}"
 
-    # Update the date_updated in frontmatter
-    parts = content.split('---', 2)
-    if len(parts) >= 3:
-        frontmatter_text = parts[1]
-        # Update or add date_updated
-        import yaml
-        try:
-            frontmatter = yaml.safe_load(frontmatter_text)
-            frontmatter['date_updated'] = datetime.now().strftime("%Y-%m-%d")
-            parts[1] = '\n' + yaml.dump(frontmatter, default_flow_style=False)
-            content = '---'.join(parts)
-        except:
-            pass
+    # Update the date_updated in frontmatter, editing just that line so the
+    # rest of the block keeps its original order and formatting
+    edit = date_updated_edit(content, now.strftime('%Y-%m-%d'))
+    if edit:
+        start, end, frontmatter_text = edit
+        content = content[:start] + frontmatter_text + content[end:]
 
     # Write back
-    with open(story_file, 'w') as f:
-        f.write(content)
+    story_file.write_text(content, encoding='utf-8')
 
     console.print(f"[green]✓[/green] Note added to {story_name}")
     console.print(f"[dim]'{note_text}'[/dim]")
@@ -731,8 +914,13 @@ def note(story_name, note_text, section):
 @click.option('--interactive', '-i', is_flag=True, help='Interactive mode')
 def find_similar(interactive):
     """Find similar concepts across batches"""
+    from rich.panel import Panel
+    from rich import box
     from aiwynns.similarity import SimilarityFinder
 
+    console = get_console()
+    db = get_db()
+
     finder = SimilarityFinder(db)
     duplicates = finder.find_similar_concepts(threshold=0.8)
 
@@ -2,10 +2,15 @@
 Creator module for generating new batches and stories from templates
 """
 
+import os
 from pathlib import Path
 from datetime import datetime
+from typing import Any, Dict
 import re
+import string
 import logging
+import tempfile
+from functools import lru_cache
 from .validation import (
     validate_string,
     validate_integer,
@@ -21,6 +26,88 @@ from .exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# The process umask, read once: mkstemp() creates files readable by the owner
+# only, and generated files should get the same mode as a plain open() gives
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Labelled sections of a concept ("**Synopsis**: ..."), each running until
+# the next bold label, a horizontal rule, or the end of the concept
+_CONCEPT_SECTION_RE = re.compile(
+    r'^[ \t]*\*\*(High Concept|Synopsis|Key Elements|Initial Thoughts)\*\*:[ \t]*(.*?)'
+    r'(?=^[ \t]*(?:\*\*[A-Z]|---)|\Z)',
+    re.DOTALL | re.MULTILINE
+)
+_LIST_ITEM_RE = re.compile(r'^[ \t]*-[ \t]*(\S.*?)[ \t]*$', re.MULTILINE)
+# Sequence suffix of a batch filename ("20250101-007.md" -> "007", zero-padded to at least 3 digits)
+_BATCH_NUM_RE = re.compile(r'-(\d{3,})\.md$')
+# ASCII characters that cannot appear in a slug; non-ASCII is dropped by encoding first
+_SLUG_DELETE_TABLE = str.maketrans('', '', ''.join(
+    chr(c) for c in range(128) if chr(c) not in string.ascii_lowercase + string.digits + '-'
+))
+_SLUG_COLLAPSE_RE = re.compile(r'-+')
+
+
+def render_template(template: str, replacements: Dict[str, str]) -> str:
+    """
+    Replace literal placeholders in a template in a single pass
+
+    Substituted values are never rescanned, so a title that happens to
+    contain another placeholder is inserted verbatim.
+
+    Args:
+        template: Template text
+        replacements: Mapping of placeholder text to replacement text
+
+    Returns:
+        The rendered text
+    """
+    if not replacements:
+        return template
+
+    pattern = _placeholder_pattern(tuple(replacements))
+    return pattern.sub(lambda m: replacements[m.group(0)], template)
+
+
+@lru_cache(maxsize=32)
+def _placeholder_pattern(placeholders: tuple) -> re.Pattern:
+    """Compile an alternation matching any of the given literal placeholders"""
+    # Longest first so a placeholder wins over any shorter prefix of it
+    return re.compile('|'.join(
+        re.escape(placeholder) for placeholder in sorted(placeholders, key=len, reverse=True)
+    ))
+
+
+def parse_concept_sections(content: str) -> Dict[str, Any]:
+    """
+    Extract the labelled sections from a concept's content
+
+    Args:
+        content: Concept body as extracted from a batch file
+
+    Returns:
+        Dictionary with ``high_concept`` (first line only), ``synopsis`` and
+        ``initial_thoughts`` (lines joined with spaces) and ``key_elements``
+        (list of bullet items)
+    """
+    sections = {m.group(1): m.group(2) for m in _CONCEPT_SECTION_RE.finditer(content)}
+
+    def joined(label: str) -> str:
+        return ' '.join(line.strip() for line in sections.get(label, '').splitlines() if line.strip())
+
+    return {
+        'high_concept': sections.get('High Concept', '').split('\n', 1)[0].strip(),
+        'synopsis': joined('Synopsis'),
+        'key_elements': _LIST_ITEM_RE.findall(sections.get('Key Elements', '')),
+        'initial_thoughts': joined('Initial Thoughts'),
+    }
+
+
+@lru_cache(maxsize=8)
+def _read_template(path: str, mtime_ns: int) -> str:
+    """Read a template file; keyed on mtime so edited templates are re-read"""
+    return Path(path).read_text(encoding='utf-8')
+
 
 class Creator:
     """Create new concept batches and story development files"""
@@ -62,49 +149,34 @@ class Creator:
         logger.info(f"Creating batch: genre={genre}, count={count}")
 
         # Generate batch ID
-        today = datetime.now().strftime("%Y%m%d")
-        batch_num = 1
-
-        while (self.concepts_dir / f"{today}-{batch_num:03d}.md").exists():
-            batch_num += 1
+        now = datetime.now()
+        today = now.strftime("%Y%m%d")
+        iso_date = now.strftime("%Y-%m-%d")
+        batch_num = self._next_batch_number(today)
 
         batch_id = f"{today}-{batch_num:03d}"
         new_file = self.concepts_dir / f"{batch_id}.md"
         logger.debug(f"Generated batch ID: {batch_id}")
 
         # Read template
-        template_file = self.templates_dir / "concept-batch.md"
-        if not template_file.exists():
-            logger.error(f"Template not found: {template_file}")
-            raise TemplateNotFoundError("concept-batch.md", str(self.templates_dir))
-
-        logger.debug(f"Reading template: {template_file}")
-        try:
-            with open(template_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except (OSError, IOError, PermissionError) as e:
-            logger.error(f"Failed to read template {template_file}: {e}")
-            raise FileReadError(str(template_file), str(e))
+        content = self._load_template("concept-batch.md")
 
         # Replace placeholders
-        content = content.replace("YYYYMMDD-001", batch_id)
-        content = content.replace("YYYY-MM-DD", datetime.now().strftime("%Y-%m-%d"))
-        content = content.replace("[genre]", genre)
-        content = content.replace("[trope1, trope2, trope3]", tropes)
-        content = content.replace("count: 10", f"count: {count}")
-        content = content.replace('"model used"', f'"{model}"')
+        content = render_template(content, {
+            "YYYYMMDD-001": batch_id,
+            "YYYY-MM-DD": iso_date,
+            "[genre]": genre,
+            "[trope1, trope2, trope3]": tropes,
+            "count: 10": f"count: {count}",
+            '"model used"': f'"{model}"',
+        })
 
         # Ensure directory exists
         self.concepts_dir.mkdir(parents=True, exist_ok=True)
 
         # Write file
         logger.debug(f"Writing batch file: {new_file}")
-        try:
-            with open(new_file, 'w', encoding='utf-8') as f:
-                f.write(content)
-        except (OSError, IOError, PermissionError) as e:
-            logger.error(f"Failed to write batch file {new_file}: {e}")
-            raise FileWriteError(str(new_file), str(e))
+        self._write_file(new_file, content, "batch")
 
         logger.info(f"Created batch: {batch_id} at {new_file}")
         return new_file
@@ -146,67 +218,116 @@ class Creator:
             )
 
         new_file = self.stories_dir / f"{filename}.md"
+        now = datetime.now()
 
         # Check if file exists
         if new_file.exists():
             logger.warning(f"Story file already exists: {new_file}, adding timestamp")
-            timestamp = datetime.now().strftime("%Y%m%d")
+            timestamp = now.strftime("%Y%m%d")
             new_file = self.stories_dir / f"{filename}-{timestamp}.md"
 
         # Generate story ID
-        story_id = f"{filename}-{int(datetime.now().timestamp())}"
+        story_id = f"{filename}-{int(now.timestamp())}"
         logger.debug(f"Generated story ID: {story_id}")
 
         # Read template
-        template_file = self.templates_dir / "story-development.md"
-        if not template_file.exists():
-            logger.error(f"Template not found: {template_file}")
-            raise TemplateNotFoundError("story-development.md", str(self.templates_dir))
-
-        logger.debug(f"Reading template: {template_file}")
-        try:
-            with open(template_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except (OSError, IOError, PermissionError) as e:
-            logger.error(f"Failed to read template {template_file}: {e}")
-            raise FileReadError(str(template_file), str(e))
+        content = self._load_template("story-development.md")
 
         # Replace placeholders
-        content = content.replace("[unique-id]", story_id)
-        content = content.replace("[Working Title]", title)
-        content = content.replace("[Story Title]", title)
-        content = content.replace("[genre]", genre)
-        content = content.replace(
-            "[batch_id if from generated concepts]",
-            origin if origin else "none"
-        )
-        content = content.replace("YYYY-MM-DD", datetime.now().strftime("%Y-%m-%d"))
+        content = render_template(content, {
+            "[unique-id]": story_id,
+            "[Working Title]": title,
+            "[Story Title]": title,
+            "[genre]": genre,
+            "[batch_id if from generated concepts]": origin if origin else "none",
+            "YYYY-MM-DD": now.strftime("%Y-%m-%d"),
+        })
 
         # Ensure directory exists
         self.stories_dir.mkdir(parents=True, exist_ok=True)
 
         # Write file
         logger.debug(f"Writing story file: {new_file}")
-        try:
-            with open(new_file, 'w', encoding='utf-8') as f:
-                f.write(content)
-        except (OSError, IOError, PermissionError) as e:
-            logger.error(f"Failed to write story file {new_file}: {e}")
-            raise FileWriteError(str(new_file), str(e))
+        self._write_file(new_file, content, "story")
 
         logger.info(f"Created story: {filename} at {new_file}")
         return new_file
 
+    def _write_file(self, path: Path, content: str, kind: str) -> None:
+        """
+        Write a generated file atomically
+
+        The content is written to a temporary sibling in one call and then
+        renamed over the target, so readers never see a partial file.
+
+        Raises:
+            FileWriteError: If the file cannot be written
+        """
+        # A temp file of its own, so concurrent writers never truncate or
+        # publish each other's half-written file
+        tmp_file = None
+        try:
+            fd, tmp_file = tempfile.mkstemp(prefix=path.name + '.', suffix='.tmp', dir=path.parent)
+            with open(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+            os.chmod(tmp_file, 0o666 & ~_UMASK)
+            os.replace(tmp_file, path)
+        except OSError as e:
+            logger.error(f"Failed to write {kind} file {path}: {e}")
+            if tmp_file is not None:
+                try:
+                    os.unlink(tmp_file)
+                except OSError:
+                    pass
+            raise FileWriteError(str(path), str(e))
+
+    def _load_template(self, name: str) -> str:
+        """
+        Return the text of a template, reusing it while the file is unchanged
+
+        Raises:
+            TemplateNotFoundError: If the template does not exist
+            FileReadError: If the template cannot be read
+        """
+        template_file = self.templates_dir / name
+        try:
+            mtime_ns = template_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            logger.error(f"Template not found: {template_file}")
+            raise TemplateNotFoundError(name, str(self.templates_dir))
+        except OSError as e:
+            logger.error(f"Failed to read template {template_file}: {e}")
+            raise FileReadError(str(template_file), str(e))
+
+        logger.debug(f"Reading template: {template_file}")
+        try:
+            return _read_template(str(template_file), mtime_ns)
+        except (OSError, UnicodeDecodeError) as e:
+            logger.error(f"Failed to read template {template_file}: {e}")
+            raise FileReadError(str(template_file), str(e))
+
+    def _next_batch_number(self, today: str) -> int:
+        """Return the lowest batch number not yet used today"""
+        prefix = f"{today}-"
+        used = set()
+        try:
+            with os.scandir(self.concepts_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith(prefix):
+                        match = _BATCH_NUM_RE.search(entry.name)
+                        if match:
+                            used.add(int(match.group(1)))
+        except FileNotFoundError:
+            pass
+        batch_num = 1
+        while batch_num in used:
+            batch_num += 1
+        return batch_num
+
     def _slugify(self, text: str) -> str:
         """Convert text to slug (lowercase, hyphens)"""
-        # Convert to lowercase
-        text = text.lower()
-        # Replace spaces with hyphens
-        text = text.replace(' ', '-')
-        # Remove non-alphanumeric characters except hyphens
-        text = re.sub(r'[^a-z0-9-]', '', text)
-        # Remove multiple consecutive hyphens
-        text = re.sub(r'-+', '-', text)
-        # Strip hyphens from ends
-        text = text.strip('-')
-        return text
+        # Lowercase, turn spaces into hyphens and drop anything but a-z, 0-9 and hyphens
+        text = text.lower().replace(' ', '-')
+        text = text.encode('ascii', 'ignore').decode('ascii').translate(_SLUG_DELETE_TABLE)
+        # Collapse runs of hyphens and strip them from the ends
+        return _SLUG_COLLAPSE_RE.sub('-', text).strip('-')
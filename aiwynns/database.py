@@ -2,9 +2,16 @@
 Database module for reading and managing concept batches and stories
 """
 
+import os
+import pickle
+import re
+import tempfile
+from bisect import bisect_right
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from pathlib import Path
-from typing import List, Dict, Optional
-import frontmatter
+from typing import Any, List, Dict, Iterator, Optional, Callable, Sequence, Tuple
 import yaml
 import logging
 from .validation import validate_batch_id
@@ -17,6 +24,350 @@ from .exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# libyaml's C loader parses frontmatter several times faster when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# A frontmatter delimiter line: three or more dashes (python-frontmatter's YAML boundary)
+_FRONTMATTER_BOUNDARY_RE = re.compile(r'^-{3,}\s*$', re.MULTILINE)
+
+# The date_updated line of a frontmatter block
+_DATE_UPDATED_RE = re.compile(r'^date_updated:.*$', re.MULTILINE)
+
+# A frontmatter line _parse_flat_frontmatter() resolves without YAML: a
+# plain key and an empty value, a quoted string without escapes, a
+# non-negative integer, a YYYY-MM-DD date, a batch ID or a plain scalar of words
+_FLAT_LINE_RE = re.compile(
+    r'([A-Za-z_][A-Za-z0-9_-]*):'
+    r'(?: +("[ !#-\[\]-~]*"|\'[ -&(-~]*\'|0|[1-9][0-9]*|[0-9]{4}-[0-9]{2}-[0-9]{2}|[0-9]{8}-[0-9]{3}'
+    r"|[A-Za-z][A-Za-z0-9 _.,'!?()/&+-]*))?"
+)
+
+# Plain scalars YAML 1.1 resolves to booleans or null (in any letter case, to be safe)
+_YAML_SPECIAL_WORDS = frozenset(('yes', 'no', 'true', 'false', 'on', 'off', 'null'))
+
+# Parsed records are persisted here so repeat CLI invocations skip re-parsing
+CACHE_FILENAME = ".aiwynns-cache.pkl"
+CACHE_VERSION = 3
+
+# Batch status subdirectories of concepts/, in scan order
+BATCH_SUBDIRS = ('generated', 'developing', 'favorites')
+
+# Files parsed on a thread pool once at least this many need (re)parsing
+PARALLEL_PARSE_MIN = 8
+# Enough threads to overlap file reads, without dozens on a small machine
+PARALLEL_PARSE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Heading line that starts each concept in a batch file ("## Concept 3: Title")
+_CONCEPT_HEADER_RE = re.compile(r'^## Concept (.*)$', re.MULTILINE)
+
+# Number of batches kept by get_batch()'s in-process cache
+BATCH_CACHE_SIZE = 128
+
+# Named sort orders for find_batches()/find_stories(): key function and
+# whether the order is descending
+BATCH_SORTS: Dict[str, Tuple[Callable[[Dict], Any], bool]] = {
+    'date': (lambda b: b.get('date_generated', ''), True),
+    'count': (lambda b: b.get('count', 0), True),
+    'genre': (lambda b: b.get('genre', ''), False),
+}
+
+STORY_SORTS: Dict[str, Tuple[Callable[[Dict], Any], bool]] = {
+    'title': (lambda s: str(s.get('title', '')), False),
+    'created': (lambda s: str(s.get('date_created', '')), True),
+    'updated': (lambda s: str(s.get('date_updated', '')), True),
+    'genre': (lambda s: str(s.get('genre', '')), False),
+}
+
+
+def _file_key(stat: os.stat_result) -> Tuple[int, int]:
+    """Identify a version of a file by its mtime and size"""
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _parse_flat_frontmatter(text: str) -> Optional[Dict]:
+    """
+    Parse frontmatter made only of simple ``key: value`` lines without YAML
+
+    Handles the lines batch and story files are generated with: plain
+    words, quoted strings without escapes, non-negative integers, batch IDs
+    and ``YYYY-MM-DD`` dates, each resolved exactly as YAML would. Returns
+    None for anything else (lists, nesting, comments, words YAML reads as
+    booleans or null, ...) so the caller falls back to the YAML parser.
+    """
+    metadata = {}
+    for line in text.split('\n'):
+        line = line.rstrip(' ')
+        if not line:
+            continue
+        match = _FLAT_LINE_RE.fullmatch(line)
+        if match is None:
+            return None
+        key, value = match.groups()
+        if key.lower() in _YAML_SPECIAL_WORDS:
+            return None
+
+        if not value:
+            metadata[key] = None
+        elif value[0] in '"\'':
+            metadata[key] = value[1:-1]
+        elif value[0].isdigit():
+            if '-' not in value:
+                metadata[key] = int(value)
+            elif len(value) == 12:
+                metadata[key] = value
+            else:
+                try:
+                    metadata[key] = date(int(value[:4]), int(value[5:7]), int(value[8:]))
+                except ValueError:
+                    return None
+        elif value.lower() in _YAML_SPECIAL_WORDS:
+            return None
+        else:
+            metadata[key] = value
+    return metadata
+
+
+def _read_text(file_path: Path) -> str:
+    """
+    Read a UTF-8 text file the way ``Path.read_text`` does
+
+    Reads the raw bytes in one call and decodes them at once rather than
+    through a text-mode wrapper; line endings are translated to ``\\n``
+    as universal newlines mode would.
+    """
+    with open(file_path, 'rb') as f:
+        text = f.read().decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def parse_frontmatter(text: str) -> Tuple[Dict, str]:
+    """
+    Split a markdown document into its YAML frontmatter and body
+
+    Matches ``frontmatter.loads`` for YAML frontmatter: surrounding
+    whitespace is stripped, a document that does not open with a
+    delimiter has no metadata, and non-mapping YAML is ignored.
+
+    Args:
+        text: Full document text
+
+    Returns:
+        Tuple of (metadata dict, body text)
+
+    Raises:
+        yaml.YAMLError: If the frontmatter is not valid YAML
+    """
+    text = text.strip()
+    if not _FRONTMATTER_BOUNDARY_RE.match(text):
+        return {}, text
+
+    parts = _FRONTMATTER_BOUNDARY_RE.split(text, 2)
+    if len(parts) != 3:
+        return {}, text
+
+    metadata = _parse_flat_frontmatter(parts[1])
+    if metadata is None:
+        metadata = yaml.load(parts[1], Loader=_YamlLoader)
+    return (metadata if isinstance(metadata, dict) else {}), parts[2].strip()
+
+
+def date_updated_edit(text: str, day: str) -> Optional[Tuple[int, int, str]]:
+    """
+    Build the edit that sets the date_updated of a document's frontmatter
+
+    Only a document that opens with a delimiter has frontmatter, so the
+    ``---`` scene breaks of a story without one are left alone. An existing
+    ``date_updated`` line is replaced; otherwise the key is appended, but
+    only when the block is a key/value mapping.
+
+    Args:
+        text: Full document text
+        day: New date (YYYY-MM-DD)
+
+    Returns:
+        Tuple of (start, end, new frontmatter) replacing ``text[start:end]``,
+        or None if the document has no frontmatter to update
+    """
+    delimiters = _FRONTMATTER_BOUNDARY_RE.finditer(text)
+    opening = next(delimiters, None)
+    closing = next(delimiters, None)
+    if opening is None or closing is None or text[:opening.start()].strip():
+        return None
+
+    start, end = opening.end(), closing.start()
+    frontmatter = text[start:end]
+    if not frontmatter.strip():
+        return None
+
+    date_line = f"date_updated: {day}"
+    updated, count = _DATE_UPDATED_RE.subn(date_line, frontmatter, count=1)
+    if not count:
+        metadata = _parse_flat_frontmatter(frontmatter)
+        if metadata is None:
+            try:
+                metadata = yaml.load(frontmatter, Loader=_YamlLoader)
+            except yaml.YAMLError:
+                return None
+        if not isinstance(metadata, dict):
+            return None
+        updated = frontmatter.rstrip('\n') + f"\n{date_line}\n"
+    return start, end, updated
+
+
+def batch_cursor(batch: Dict) -> str:
+    """Get the pagination cursor (batch ID) for a batch"""
+    return str(batch.get('batch_id', ''))
+
+
+def story_cursor(story: Dict) -> str:
+    """Get the pagination cursor (story name) for a story"""
+    return Path(story.get('file_path', '')).stem
+
+
+class RecordIndex:
+    """
+    Lookup indexes over a list of parsed records
+
+    Records are indexed by exact status, by lowercased genre and by cursor
+    ID, and sort orders are computed once per sort name and reused.
+    Selections keep the same order a stable sort of the filtered records
+    would give.
+    """
+
+    def __init__(
+        self,
+        records: Sequence[Dict],
+        sorts: Dict[str, Tuple[Callable[[Dict], Any], bool]],
+        cursor: Callable[[Dict], str]
+    ):
+        self.records = list(records)
+        self.sorts = sorts
+        self._by_status: Dict[Any, List[int]] = defaultdict(list)
+        self._by_genre: Dict[str, List[int]] = defaultdict(list)
+        self._by_cursor: Dict[str, int] = {}
+        self._ranks: Dict[str, Optional[Dict[int, int]]] = {}
+
+        for pos, record in enumerate(self.records):
+            try:
+                self._by_status[record.get('status')].append(pos)
+            except TypeError:
+                pass  # Unhashable status can never equal a filter string
+            self._by_genre[str(record.get('genre', '')).lower()].append(pos)
+            self._by_cursor.setdefault(cursor(record), pos)
+
+    def select(
+        self,
+        status: Optional[str] = None,
+        genre: Optional[str] = None,
+        sort: Optional[str] = None,
+        after: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Get records matching the filters, optionally in a named sort order
+
+        Args:
+            status: Exact status to match
+            genre: Case-insensitive substring of the genre
+            sort: Name of a sort order from ``sorts``
+            after: Cursor of the record to resume after
+
+        Returns:
+            List of matching records
+
+        Raises:
+            ValidationError: If the cursor does not match any record
+        """
+        return list(self.iter(status, genre, sort, after))
+
+    def iter(
+        self,
+        status: Optional[str] = None,
+        genre: Optional[str] = None,
+        sort: Optional[str] = None,
+        after: Optional[str] = None
+    ) -> Iterator[Dict]:
+        """
+        Yield records matching the filters in order (see ``select``)
+
+        Resuming from a cursor is a binary search on the record's position
+        in the sort order rather than a scan over the preceding records.
+        """
+        positions = self._positions(status, genre, sort)
+
+        start = 0
+        if after is not None:
+            if after not in self._by_cursor:
+                raise ValidationError(f"Unknown cursor: {after}")
+            cursor_pos = self._by_cursor[after]
+            ranks = self._sort_ranks(sort) if sort else None
+            if ranks is not None:
+                start = bisect_right(positions, ranks[cursor_pos], key=ranks.__getitem__)
+            elif not sort:
+                start = bisect_right(positions, cursor_pos)
+            elif cursor_pos in positions:
+                start = positions.index(cursor_pos) + 1
+            else:
+                raise ValidationError(f"Cursor does not match the current filters: {after}")
+
+        for pos in positions[start:]:
+            yield self.records[pos]
+
+    def count(self, status: Optional[str] = None, genre: Optional[str] = None) -> int:
+        """Count the records matching the filters (see ``select``)"""
+        return len(self._positions(status, genre, None))
+
+    def _positions(self, status: Optional[str], genre: Optional[str], sort: Optional[str]) -> List[int]:
+        """Get the positions of matching records in output order"""
+        positions: Optional[List[int]] = None
+
+        if status:
+            positions = self._by_status.get(status, [])
+        if genre:
+            needle = genre.lower()
+            matches = set()
+            for genre_key, genre_positions in self._by_genre.items():
+                if needle in genre_key:
+                    matches.update(genre_positions)
+            if positions is None:
+                positions = sorted(matches)
+            else:
+                positions = [pos for pos in positions if pos in matches]
+
+        if positions is None:
+            positions = list(range(len(self.records)))
+
+        if sort:
+            ranks = self._sort_ranks(sort)
+            if ranks is None:
+                # Full ordering failed (mixed value types); sort just the
+                # selection so errors surface only when they really apply
+                key, reverse = self.sorts[sort]
+                positions.sort(key=lambda pos: key(self.records[pos]), reverse=reverse)
+            else:
+                positions.sort(key=ranks.__getitem__)
+
+        return positions
+
+    def _sort_ranks(self, sort: str) -> Optional[Dict[int, int]]:
+        """Get (and cache) each record's rank in a named sort order"""
+        if sort not in self._ranks:
+            key, reverse = self.sorts[sort]
+            try:
+                order = sorted(
+                    range(len(self.records)),
+                    key=lambda pos: key(self.records[pos]),
+                    reverse=reverse
+                )
+                self._ranks[sort] = {pos: rank for rank, pos in enumerate(order)}
+            except TypeError:
+                self._ranks[sort] = None
+        return self._ranks[sort]
+
 
 class ConceptDatabase:
     """Manages reading concept batches and stories from markdown files"""
@@ -25,29 +376,67 @@ class ConceptDatabase:
         self.project_root = Path(project_root)
         self.concepts_dir = self.project_root / "concepts"
         self.stories_dir = self.project_root / "stories"
+        self.cache_file = self.project_root / CACHE_FILENAME
+        self._cache: Optional[Dict[str, Dict]] = None
+        self._cache_dirty = False
+        # Incremented whenever a scan finds added, changed or removed files
+        self.version = 0
+        self._indexes: Dict[str, Tuple[int, RecordIndex]] = {}
+        # batch_id -> (file_path, file key, batch), least recently used first
+        self._batch_cache: OrderedDict = OrderedDict()
+        # (directory mtimes, listing) of the last walk, see _walk()
+        self._listing: Optional[Tuple[Tuple, Dict]] = None
+        # section -> (file keys, records) of the last full scan
+        self._scan_memo: Dict[str, Tuple[Tuple, List[Dict]]] = {}
+
+    def refresh(self) -> None:
+        """
+        Drop in-process caches so the next read rescans the workspace
+
+        Cached lookups are already validated against file mtimes; this is
+        for callers that need to discard them outright.
+        """
+        self._cache = None
+        self._indexes.clear()
+        self._batch_cache.clear()
+        self._listing = None
+        self._scan_memo.clear()
+        self.version += 1
 
     def get_all_batches(self) -> List[Dict]:
         """Get all concept batches from all subdirectories"""
-        logger.debug(f"Loading all batches from {self.concepts_dir}")
-        batches = []
+        listing = self._walk()['batches']
+        files = self._stat_files(listing)
+        memoized = self._memoized_scan('batches', files)
+        if memoized is not None:
+            return memoized
 
-        for subdir in ['generated', 'developing', 'favorites']:
-            batch_dir = self.concepts_dir / subdir
-            if batch_dir.exists():
-                for md_file in batch_dir.glob("*.md"):
-                    batch_data = self._parse_batch_file(md_file)
-                    if batch_data:
-                        batch_data['location'] = subdir
-                        batches.append(batch_data)
-                        logger.debug(f"Loaded batch: {batch_data.get('batch_id')}")
-
-        logger.info(f"Loaded {len(batches)} batches from {self.concepts_dir}")
+        logger.debug("Loading all batches from %s", self.concepts_dir)
+        batches = []
+        entries = self._cache_section('batches')
+        seen = {}
+
+        records = self._load_records(files, entries, seen, self._parse_batch_file)
+        for (_, subdir), batch_data in zip(listing, records):
+            if batch_data:
+                batch_data['location'] = subdir
+                batches.append(batch_data)
+                logger.debug("Loaded batch: %s", batch_data.get('batch_id'))
+
+        self._replace_cache_section('batches', entries, seen)
+        self._remember_scan('batches', files, batches)
+        logger.info("Loaded %d batches from %s", len(batches), self.concepts_dir)
         return batches
 
     def get_batch(self, batch_id: str) -> Optional[Dict]:
         """
         Get a specific batch by ID
 
+        The conventionally named ``<batch_id>.md`` is tried in each batch
+        subdirectory first; only if none holds the batch are all batches
+        scanned. If several files share a batch ID, a conventionally named
+        one is therefore preferred.
+
         Args:
             batch_id: The batch ID to retrieve (format: YYYYMMDD-NNN)
 
@@ -60,23 +449,423 @@ class ConceptDatabase:
         # Validate batch ID format
         batch_id = validate_batch_id(batch_id)
 
+        # Serve repeat lookups without a rescan while the file is unchanged
+        cached = self._batch_cache.get(batch_id)
+        if cached is not None:
+            file_path, key, batch = cached
+            try:
+                if _file_key(os.stat(file_path)) == key:
+                    self._batch_cache.move_to_end(batch_id)
+                    return dict(batch)
+            except OSError:
+                pass
+            del self._batch_cache[batch_id]
+
+        # Batches are saved as <subdir>/<batch_id>.md; reading that file
+        # directly avoids listing and checking every batch
+        for subdir in BATCH_SUBDIRS:
+            file_path = self.concepts_dir / subdir / f"{batch_id}.md"
+            if not file_path.is_file():
+                continue
+            batch = self._parse_batch_file(file_path)
+            if batch is not None and batch.get('batch_id') == batch_id:
+                batch['location'] = subdir
+                self._remember_batch(batch_id, batch)
+                return batch
+
+        # Otherwise the batch may live in a file named differently
         for batch in self.get_all_batches():
             if batch.get('batch_id') == batch_id:
+                self._remember_batch(batch_id, batch)
                 return batch
         return None
 
+    def _remember_batch(self, batch_id: str, batch: Dict) -> None:
+        """Add a batch to get_batch()'s LRU cache"""
+        try:
+            key = _file_key(os.stat(batch['file_path']))
+        except (KeyError, OSError):
+            return
+
+        self._batch_cache[batch_id] = (batch['file_path'], key, dict(batch))
+        self._batch_cache.move_to_end(batch_id)
+        if len(self._batch_cache) > BATCH_CACHE_SIZE:
+            self._batch_cache.popitem(last=False)
+
     def get_all_stories(self) -> List[Dict]:
         """Get all story development files"""
+        files = self._stat_files(self._walk()['stories'])
+        memoized = self._memoized_scan('stories', files)
+        if memoized is not None:
+            return memoized
+
         stories = []
+        entries = self._cache_section('stories')
+        seen = {}
 
-        if self.stories_dir.exists():
-            for md_file in self.stories_dir.glob("*.md"):
-                story_data = self._parse_story_file(md_file)
-                if story_data:
-                    stories.append(story_data)
+        for story_data in self._load_records(files, entries, seen, self._parse_story_file):
+            if story_data:
+                stories.append(story_data)
 
+        self._replace_cache_section('stories', entries, seen)
+        self._remember_scan('stories', files, stories)
         return stories
 
+    # ------------------------------------------------------------------
+    # Directory walk and scan memo
+    # ------------------------------------------------------------------
+
+    def _walk(self) -> Dict[str, List[Tuple[str, Optional[str]]]]:
+        """
+        List the markdown files of every section in one traversal
+
+        Returns ``{'batches': [(path, subdir), ...], 'stories': [(path,
+        None), ...]}``. Adding, removing or renaming a file updates its
+        directory's mtime, so the listing is reused while the mtimes of the
+        scanned directories are unchanged; back-to-back calls such as an
+        index rebuild's batches-then-stories share a single walk.
+        """
+        directories = [
+            self.concepts_dir,
+            *(self.concepts_dir / subdir for subdir in BATCH_SUBDIRS),
+            self.stories_dir,
+        ]
+        dir_mtimes = self._dir_mtimes(directories)
+        if self._listing is not None and self._listing[0] == dir_mtimes:
+            return self._listing[1]
+
+        listing = {
+            'batches': [
+                (path, subdir)
+                for subdir in self._batch_subdirs()
+                for path in self._scan_markdown(self.concepts_dir / subdir)
+            ],
+            'stories': [(path, None) for path in self._scan_markdown(self.stories_dir)],
+        }
+        self._listing = (dir_mtimes, listing)
+        return listing
+
+    def _dir_mtimes(self, directories: Sequence[Path]) -> Tuple:
+        """Get the mtimes of directories (None for a missing one)"""
+        mtimes = []
+        for directory in directories:
+            try:
+                mtimes.append(os.stat(directory).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return tuple(mtimes)
+
+    def _stat_files(self, listing: Sequence[Tuple[str, Any]]) -> List[Tuple[str, Optional[os.stat_result]]]:
+        """Stat each listed file (None if it vanished since the walk)"""
+        files = []
+        for file_path, _ in listing:
+            try:
+                files.append((file_path, os.stat(file_path)))
+            except OSError:
+                files.append((file_path, None))
+        return files
+
+    def _memoized_scan(self, section: str, files: Sequence[Tuple[str, Optional[os.stat_result]]]) -> Optional[List[Dict]]:
+        """
+        Return the records of the last full scan if no file has changed
+
+        The listing rules out added and removed files; comparing each
+        file's mtime and size catches files edited in place.
+        """
+        memo = self._scan_memo.get(section)
+        if memo is None or any(stat is None for _, stat in files):
+            return None
+
+        file_keys, records = memo
+        if tuple((file_path, _file_key(stat)) for file_path, stat in files) != file_keys:
+            return None
+        return [dict(record) for record in records]
+
+    def _remember_scan(self, section: str, files: List, records: List[Dict]) -> None:
+        """Memoize a full scan, unless a file could not be stat'ed during it"""
+        if any(stat is None for _, stat in files):
+            self._scan_memo.pop(section, None)
+            return
+        file_keys = tuple((file_path, _file_key(stat)) for file_path, stat in files)
+        self._scan_memo[section] = (file_keys, [dict(record) for record in records])
+
+    def find_batches(
+        self,
+        status: Optional[str] = None,
+        genre: Optional[str] = None,
+        sort: Optional[str] = None,
+        predicate: Optional[Callable[[Dict], bool]] = None
+    ) -> List[Dict]:
+        """
+        Get batches filtered by status/genre and sorted by name
+
+        Args:
+            status: Exact status to match
+            genre: Case-insensitive substring of the genre
+            sort: One of the names in ``BATCH_SORTS``
+            predicate: Optional extra filter called with each batch
+
+        Returns:
+            List of matching batch dictionaries
+        """
+        return list(self.iter_batches(status, genre, sort, predicate=predicate))
+
+    def iter_batches(
+        self,
+        status: Optional[str] = None,
+        genre: Optional[str] = None,
+        sort: Optional[str] = None,
+        after: Optional[str] = None,
+        predicate: Optional[Callable[[Dict], bool]] = None
+    ) -> Iterator[Dict]:
+        """
+        Yield batches filtered by status/genre in a named sort order
+
+        Batches are produced lazily, so a consumer that stops early (e.g.
+        after one page) never copies or tests the rest.
+
+        Args:
+            status: Exact status to match
+            genre: Case-insensitive substring of the genre
+            sort: One of the names in ``BATCH_SORTS``
+            after: Batch ID to resume after (see ``batch_cursor``)
+            predicate: Optional extra filter called with each batch
+
+        Yields:
+            Matching batch dictionaries
+
+        Raises:
+            ValidationError: If ``after`` does not match a batch
+        """
+        index = self._get_index('batches', self.get_all_batches, BATCH_SORTS, batch_cursor)
+        for batch in index.iter(status, genre, sort, after):
+            if predicate is None or predicate(batch):
+                yield dict(batch)
+
+    def count_batches(self, status: Optional[str] = None, genre: Optional[str] = None) -> int:
+        """Count the batches matching the status/genre filters of ``find_batches``"""
+        index = self._get_index('batches', self.get_all_batches, BATCH_SORTS, batch_cursor)
+        return index.count(status, genre)
+
+    def find_stories(
+        self,
+        status: Optional[str] = None,
+        genre: Optional[str] = None,
+        sort: Optional[str] = None,
+        predicate: Optional[Callable[[Dict], bool]] = None
+    ) -> List[Dict]:
+        """
+        Get stories filtered by status/genre and sorted by name
+
+        Args:
+            status: Exact status to match
+            genre: Case-insensitive substring of the genre
+            sort: One of the names in ``STORY_SORTS``
+            predicate: Optional extra filter called with each story
+
+        Returns:
+            List of matching story dictionaries
+        """
+        return list(self.iter_stories(status, genre, sort, predicate=predicate))
+
+    def iter_stories(
+        self,
+        status: Optional[str] = None,
+        genre: Optional[str] = None,
+        sort: Optional[str] = None,
+        after: Optional[str] = None,
+        predicate: Optional[Callable[[Dict], bool]] = None
+    ) -> Iterator[Dict]:
+        """
+        Yield stories filtered by status/genre in a named sort order
+
+        Args:
+            status: Exact status to match
+            genre: Case-insensitive substring of the genre
+            sort: One of the names in ``STORY_SORTS``
+            after: Story name to resume after (see ``story_cursor``)
+            predicate: Optional extra filter called with each story
+
+        Yields:
+            Matching story dictionaries
+
+        Raises:
+            ValidationError: If ``after`` does not match a story
+        """
+        index = self._get_index('stories', self.get_all_stories, STORY_SORTS, story_cursor)
+        for story in index.iter(status, genre, sort, after):
+            if predicate is None or predicate(story):
+                yield dict(story)
+
+    def count_stories(self, status: Optional[str] = None, genre: Optional[str] = None) -> int:
+        """Count the stories matching the status/genre filters of ``find_stories``"""
+        index = self._get_index('stories', self.get_all_stories, STORY_SORTS, story_cursor)
+        return index.count(status, genre)
+
+    def _get_index(
+        self,
+        section: str,
+        loader: Callable[[], List[Dict]],
+        sorts: Dict,
+        cursor: Callable[[Dict], str]
+    ) -> RecordIndex:
+        """Get the index for a section, rebuilding it only if files changed"""
+        records = loader()
+        cached = self._indexes.get(section)
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+
+        index = RecordIndex(records, sorts, cursor)
+        self._indexes[section] = (self.version, index)
+        return index
+
+    # ------------------------------------------------------------------
+    # Parse cache
+    # ------------------------------------------------------------------
+
+    def _cache_section(self, section: str) -> Dict:
+        """
+        Get the cached ``path -> ((mtime_ns, size), record)`` entries for a section
+
+        The on-disk cache is loaded the first time it is needed. A missing,
+        unreadable, or outdated cache file simply yields an empty cache.
+        """
+        if self._cache is None:
+            self._cache = {}
+            try:
+                with open(self.cache_file, 'rb') as f:
+                    data = pickle.load(f)
+                if isinstance(data, dict) and data.get('version') == CACHE_VERSION:
+                    self._cache = data.get('sections', {})
+                    logger.debug("Loaded parse cache from %s", self.cache_file)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning("Ignoring unreadable cache %s: %s", self.cache_file, e)
+
+        return self._cache.get(section, {})
+
+    def _batch_subdirs(self) -> List[str]:
+        """
+        Get the batch subdirectories that exist, in ``BATCH_SUBDIRS`` order
+
+        One scan of ``concepts/`` replaces a failed ``scandir`` per missing
+        subdirectory.
+        """
+        try:
+            with os.scandir(self.concepts_dir) as it:
+                present = {entry.name for entry in it if entry.name in BATCH_SUBDIRS}
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+        return [subdir for subdir in BATCH_SUBDIRS if subdir in present]
+
+    def _scan_markdown(self, directory: Path) -> Iterator[str]:
+        """
+        Yield the paths of the visible markdown files in a directory
+
+        Uses a single ``os.scandir`` pass; a missing directory yields
+        nothing. Paths are the plain strings from the scan so cache hits
+        never build a ``Path``.
+        """
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    # Same selection as glob("*.md"): no hidden files
+                    if entry.name.startswith('.') or not entry.name.endswith('.md'):
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                    except OSError:
+                        continue
+                    yield entry.path
+        except (FileNotFoundError, NotADirectoryError):
+            return
+
+    def _load_records(
+        self,
+        files: Sequence[Tuple[str, Optional[os.stat_result]]],
+        entries: Dict,
+        seen: Dict,
+        parser: Callable[[Path], Optional[Dict]]
+    ) -> List[Optional[Dict]]:
+        """
+        Return the parsed record for each file, re-parsing only changed files
+
+        Records are keyed by path and validated against the file's mtime and
+        size, so an edit that changes the length is noticed even within the
+        filesystem's mtime granularity. Hits and fresh parses are recorded
+        in ``seen`` so the cache can be pruned of deleted files afterwards.
+        When enough files need parsing they are parsed on a thread pool so
+        their reads overlap.
+        """
+        records: List[Optional[Dict]] = [None] * len(files)
+        misses = []
+
+        for i, (file_path, stat) in enumerate(files):
+            cached = entries.get(file_path) if stat is not None else None
+            if cached is not None and cached[0] == _file_key(stat):
+                seen[file_path] = cached
+                records[i] = dict(cached[1])
+            else:
+                misses.append(i)
+
+        paths = [Path(files[i][0]) for i in misses]
+        if len(paths) >= PARALLEL_PARSE_MIN:
+            with ThreadPoolExecutor(max_workers=min(PARALLEL_PARSE_WORKERS, len(paths))) as executor:
+                parsed = list(executor.map(parser, paths))
+        else:
+            parsed = [parser(path) for path in paths]
+
+        for i, record in zip(misses, parsed):
+            if record is None:
+                continue
+            file_path, stat = files[i]
+            if stat is not None:
+                seen[file_path] = (_file_key(stat), record)
+                self._cache_dirty = True
+            records[i] = dict(record)
+
+        return records
+
+    def _replace_cache_section(self, section: str, entries: Dict, seen: Dict) -> None:
+        """Store the entries seen during a full scan and persist if changed"""
+        if len(seen) != len(entries) or any(entries.get(key) is not entry for key, entry in seen.items()):
+            self.version += 1
+            self._cache_dirty = True
+        self._cache[section] = seen
+        self._save_cache()
+
+    def _save_cache(self) -> None:
+        """Write the parse cache to disk (atomically) when it has changed"""
+        if not self._cache_dirty:
+            return
+
+        # A temp file of its own, so concurrent writers (e.g. the CLI and the
+        # MCP server) never truncate or publish each other's half-written file
+        tmp_file = None
+        try:
+            fd, tmp_file = tempfile.mkstemp(
+                prefix=self.cache_file.name + '.', suffix='.tmp', dir=self.cache_file.parent
+            )
+            with open(fd, 'wb') as f:
+                pickle.dump(
+                    {'version': CACHE_VERSION, 'sections': self._cache},
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL
+                )
+            os.replace(tmp_file, self.cache_file)
+            self._cache_dirty = False
+            logger.debug("Saved parse cache to %s", self.cache_file)
+        except (OSError, pickle.PicklingError) as e:
+            # The cache is an optimization only; never fail a read over it
+            logger.warning("Could not write cache %s: %s", self.cache_file, e)
+            if tmp_file is not None:
+                try:
+                    os.unlink(tmp_file)
+                except OSError:
+                    pass
+
     def _parse_batch_file(self, file_path: Path) -> Optional[Dict]:
         """
         Parse a batch markdown file with frontmatter
@@ -85,30 +874,24 @@ class ConceptDatabase:
         graceful degradation when scanning multiple files.
         """
         try:
-            logger.debug(f"Parsing batch file: {file_path}")
-            with open(file_path, 'r', encoding='utf-8') as f:
-                post = frontmatter.load(f)
-
-            metadata = dict(post.metadata)
+            logger.debug("Parsing batch file: %s", file_path)
+            metadata, content = parse_frontmatter(_read_text(file_path))
             metadata['file_path'] = str(file_path)
-            metadata['content'] = post.content
+            metadata['content'] = content
 
-            # Extract concepts from content
-            concepts = self._extract_concepts_from_content(post.content)
-            metadata['concepts'] = concepts
-            logger.debug(f"Parsed batch file: {file_path.name} ({len(concepts)} concepts)")
+            logger.debug("Parsed batch file: %s", file_path.name)
 
             return metadata
 
         except (OSError, IOError, PermissionError) as e:
-            logger.error(f"Error reading {file_path}: {e}", exc_info=True)
+            logger.error("Error reading %s: %s", file_path, e, exc_info=True)
             return None
         except yaml.YAMLError as e:
-            logger.error(f"Invalid YAML frontmatter in {file_path}: {e}", exc_info=True)
+            logger.error("Invalid YAML frontmatter in %s: %s", file_path, e, exc_info=True)
             return None
         except Exception as e:
             # Catch-all for unexpected errors
-            logger.error(f"Unexpected error parsing {file_path}: {e}", exc_info=True)
+            logger.error("Unexpected error parsing %s: %s", file_path, e, exc_info=True)
             return None
 
     def _parse_story_file(self, file_path: Path) -> Optional[Dict]:
@@ -119,70 +902,72 @@ class ConceptDatabase:
         graceful degradation when scanning multiple files.
         """
         try:
-            logger.debug(f"Parsing story file: {file_path}")
-            with open(file_path, 'r', encoding='utf-8') as f:
-                post = frontmatter.load(f)
-
-            metadata = dict(post.metadata)
+            logger.debug("Parsing story file: %s", file_path)
+            metadata, content = parse_frontmatter(_read_text(file_path))
             metadata['file_path'] = str(file_path)
-            metadata['content'] = post.content
-            logger.debug(f"Parsed story file: {file_path.name}")
+            metadata['content'] = content
+            logger.debug("Parsed story file: %s", file_path.name)
 
             return metadata
 
         except (OSError, IOError, PermissionError) as e:
-            logger.error(f"Error reading {file_path}: {e}", exc_info=True)
+            logger.error("Error reading %s: %s", file_path, e, exc_info=True)
             return None
         except yaml.YAMLError as e:
-            logger.error(f"Invalid YAML frontmatter in {file_path}: {e}", exc_info=True)
+            logger.error("Invalid YAML frontmatter in %s: %s", file_path, e, exc_info=True)
             return None
         except Exception as e:
             # Catch-all for unexpected errors
-            logger.error(f"Unexpected error parsing {file_path}: {e}", exc_info=True)
+            logger.error("Unexpected error parsing %s: %s", file_path, e, exc_info=True)
             return None
 
+    def get_concepts(self, batch: Dict) -> List[Dict]:
+        """
+        Get the individual concepts of a batch
+
+        Batch records only carry the raw ``content``; concepts are split out
+        on demand so scans that never look at them (indexing, export,
+        listings) don't pay for it.
+
+        Args:
+            batch: Batch dictionary as returned by the database
+
+        Returns:
+            List of concept dicts with ``number``, ``title`` and ``content``
+        """
+        if 'concepts' in batch:
+            return batch['concepts']
+        return self._extract_concepts_from_content(batch.get('content', ''))
+
     def _extract_concepts_from_content(self, content: str) -> List[Dict]:
         """Extract individual concepts from batch content"""
         concepts = []
-        current_concept = None
-
-        for line in content.split('\n'):
-            # Look for concept headers (## Concept N:)
-            if line.startswith('## Concept '):
-                if current_concept:
-                    concepts.append(current_concept)
-
-                # Extract concept number and title
-                parts = line.replace('## Concept ', '').split(':', 1)
-                number = parts[0].strip()
-                title = parts[1].strip() if len(parts) > 1 else ''
-
-                current_concept = {
-                    'number': number,
-                    'title': title,
-                    'content': ''
-                }
-            elif current_concept:
-                current_concept['content'] += line + '\n'
-
-        # Add last concept
-        if current_concept:
-            concepts.append(current_concept)
+        headers = list(_CONCEPT_HEADER_RE.finditer(content))
+
+        for i, header in enumerate(headers):
+            # Extract concept number and title (repeated header text is dropped)
+            parts = header.group(1).replace('## Concept ', '').split(':', 1)
+            number = parts[0].strip()
+            title = parts[1].strip() if len(parts) > 1 else ''
+
+            # The body runs from the line after the header to the next header;
+            # every body line, including a final unterminated one, ends in '\n'
+            if i + 1 < len(headers):
+                body = content[header.end() + 1:headers[i + 1].start()]
+            elif header.end() < len(content):
+                body = content[header.end() + 1:] + '\n'
+            else:
+                body = ''
+
+            concepts.append({
+                'number': number,
+                'title': title,
+                'content': body
+            })
 
         return concepts
 
     def get_all_files(self) -> List[Path]:
         """Get all markdown files (batches and stories)"""
-        files = []
-
-        # Get concept batches
-        for subdir in ['generated', 'developing', 'favorites']:
-            batch_dir = self.concepts_dir / subdir
-            if batch_dir.exists():
-                files.extend(batch_dir.glob("*.md"))
-
-        # Get stories
-        if self.stories_dir.exists():
-            files.extend(self.stories_dir.glob("*.md"))
-
-        return files
+        listing = self._walk()
+        return [Path(path) for section in ('batches', 'stories') for path, _ in listing[section]]
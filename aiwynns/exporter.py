@@ -6,7 +6,19 @@ import json
 import csv
 import yaml
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterator, List
+
+# Native JSON encoder when installed (``pip install aiwynns-idea-factory[fast]``)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# libyaml's C emitter when PyYAML was built with it
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
 
 
 class Exporter:
@@ -24,48 +36,65 @@ class Exporter:
             format: 'json', 'csv', or 'yaml'
             output_path: Path to output file
         """
-        data = self._gather_data(type)
-
         if format == 'json':
-            self._export_json(data, output_path)
+            self._export_json(type, output_path)
         elif format == 'csv':
-            self._export_csv(data, output_path, type)
+            self._export_csv(self._gather_data(type), output_path, type)
         elif format == 'yaml':
-            self._export_yaml(data, output_path)
+            self._export_yaml(self._gather_data(type), output_path)
         else:
             raise ValueError(f"Unknown format: {format}")
 
-    def _gather_data(self, type: str) -> Dict:
-        """Gather data based on type"""
-        data = {}
+    def _sections(self, type: str) -> List[str]:
+        """Get the sections ('batches', 'stories') included in an export type"""
+        return [section for section in ('batches', 'stories') if type in (section, 'all')]
 
-        if type in ['batches', 'all']:
-            batches = self.db.get_all_batches()
-            # Remove content to keep export clean
-            data['batches'] = [
-                {k: v for k, v in batch.items() if k not in ['content', 'concepts']}
-                for batch in batches
-            ]
+    def _iter_records(self, section: str) -> Iterator[Dict]:
+        """Yield the records of a section one at a time, without their content"""
+        if section == 'batches':
+            records = self.db.get_all_batches()
+            excluded = ('content', 'concepts')
+        else:
+            records = self.db.get_all_stories()
+            excluded = ('content',)
 
-        if type in ['stories', 'all']:
-            stories = self.db.get_all_stories()
+        for record in records:
             # Remove content to keep export clean
-            data['stories'] = [
-                {k: v for k, v in story.items() if k != 'content'}
-                for story in stories
-            ]
+            yield {k: v for k, v in record.items() if k not in excluded}
+
+    def _gather_data(self, type: str) -> Dict:
+        """Gather data based on type"""
+        return {section: list(self._iter_records(section)) for section in self._sections(type)}
 
-        return data
+    def _export_json(self, type: str, output_path: str):
+        """
+        Export to JSON, writing one record at a time
 
-    def _export_json(self, data: Dict, output_path: str):
-        """Export to JSON"""
-        with open(output_path, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        The output is the same as ``json.dump(data, indent=2)`` of the
+        gathered data, but no cleaned copy of the whole database is held in
+        memory.
+        """
+        with open(output_path, 'w', encoding='utf-8') as f:
+            sections = self._sections(type)
+            if not sections:
+                f.write('{}')
+                return
+
+            for i, section in enumerate(sections):
+                f.write('{\n  ' if i == 0 else ',\n  ')
+                f.write(json.dumps(section) + ': [')
+                empty = True
+                for record in self._iter_records(section):
+                    f.write('\n    ' if empty else ',\n    ')
+                    f.write(_dump_json(record).replace('\n', '\n    '))
+                    empty = False
+                f.write(']' if empty else '\n  ]')
+            f.write('\n}')
 
     def _export_yaml(self, data: Dict, output_path: str):
         """Export to YAML"""
         with open(output_path, 'w') as f:
-            yaml.dump(data, f, default_flow_style=False, allow_unicode=True)
+            yaml.dump(data, f, Dumper=_YamlDumper, default_flow_style=False, allow_unicode=True)
 
     def _export_csv(self, data: Dict, output_path: str, type: str):
         """Export to CSV"""
@@ -83,63 +112,75 @@ class Exporter:
         if not batches:
             return
 
-        fieldnames = ['batch_id', 'date_generated', 'genre', 'tropes', 'count', 'status', 'location', 'llm_model']
-        writer = csv.DictWriter(file, fieldnames=fieldnames, extrasaction='ignore')
-
-        writer.writeheader()
+        writer = csv.writer(file)
+        writer.writerow(('batch_id', 'date_generated', 'genre', 'tropes', 'count', 'status', 'location', 'llm_model'))
         for batch in batches:
-            # Convert lists to strings for CSV
-            row = batch.copy()
-            if isinstance(row.get('tropes'), list):
-                row['tropes'] = ', '.join(row['tropes'])
-            if isinstance(row.get('genre'), list):
-                row['genre'] = ', '.join(row['genre'])
-            writer.writerow(row)
+            get = batch.get
+            writer.writerow((
+                get('batch_id', ''), get('date_generated', ''), _joined(get('genre', '')),
+                _joined(get('tropes', '')), get('count', ''), get('status', ''),
+                get('location', ''), get('llm_model', '')
+            ))
 
     def _export_stories_csv(self, stories: List[Dict], file):
         """Export stories to CSV"""
         if not stories:
             return
 
-        fieldnames = ['story_id', 'title', 'genre', 'subgenre', 'tropes', 'status', 'date_created', 'target_length']
-        writer = csv.DictWriter(file, fieldnames=fieldnames, extrasaction='ignore')
-
-        writer.writeheader()
+        writer = csv.writer(file)
+        writer.writerow(('story_id', 'title', 'genre', 'subgenre', 'tropes', 'status', 'date_created', 'target_length'))
         for story in stories:
-            row = story.copy()
-            if isinstance(row.get('tropes'), list):
-                row['tropes'] = ', '.join(row['tropes'])
-            if isinstance(row.get('genre'), list):
-                row['genre'] = ', '.join(row['genre'])
-            writer.writerow(row)
+            get = story.get
+            writer.writerow((
+                get('story_id', ''), get('title', ''), _joined(get('genre', '')),
+                get('subgenre', ''), _joined(get('tropes', '')), get('status', ''),
+                get('date_created', ''), get('target_length', '')
+            ))
 
     def _export_combined_csv(self, data: Dict, file):
         """Export combined data to CSV"""
-        fieldnames = ['type', 'id', 'title', 'genre', 'date', 'status', 'count_or_length']
-        writer = csv.DictWriter(file, fieldnames=fieldnames)
-
-        writer.writeheader()
+        writer = csv.writer(file)
+        writer.writerow(('type', 'id', 'title', 'genre', 'date', 'status', 'count_or_length'))
 
         # Add batches
         for batch in data.get('batches', []):
-            writer.writerow({
-                'type': 'batch',
-                'id': batch.get('batch_id'),
-                'title': f"Batch {batch.get('batch_id')}",
-                'genre': batch.get('genre'),
-                'date': batch.get('date_generated'),
-                'status': batch.get('status'),
-                'count_or_length': batch.get('count')
-            })
+            get = batch.get
+            batch_id = get('batch_id')
+            writer.writerow((
+                'batch', batch_id, f"Batch {batch_id}", get('genre'),
+                get('date_generated'), get('status'), get('count')
+            ))
 
         # Add stories
         for story in data.get('stories', []):
-            writer.writerow({
-                'type': 'story',
-                'id': story.get('story_id'),
-                'title': story.get('title'),
-                'genre': story.get('genre'),
-                'date': story.get('date_created'),
-                'status': story.get('status'),
-                'count_or_length': story.get('target_length')
-            })
+            get = story.get
+            writer.writerow((
+                'story', get('story_id'), get('title'), get('genre'),
+                get('date_created'), get('status'), get('target_length')
+            ))
+
+
+def _dump_json(record: Dict) -> str:
+    """
+    Serialize one record as indented JSON, with orjson when available
+
+    Dates and datetimes go through ``str`` either way so both encoders
+    render them identically; orjson writes non-ASCII text as UTF-8 rather
+    than ``\\u`` escapes. Values orjson cannot encode (e.g. integers wider
+    than 64 bits) fall back to the standard library.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                record,
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            ).decode('utf-8')
+        except orjson.JSONEncodeError:
+            pass
+    return json.dumps(record, indent=2, default=str)
+
+
+def _joined(value):
+    """Join a list value with commas for a CSV cell; other values pass through"""
+    return ', '.join(value) if isinstance(value, list) else value
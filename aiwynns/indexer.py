@@ -2,6 +2,7 @@
 Indexer module for updating INDEX.md
 """
 
+import os
 from pathlib import Path
 from datetime import datetime
 
@@ -13,6 +14,8 @@ class Indexer:
         self.project_root = Path(project_root)
         self.index_file = self.project_root / "INDEX.md"
         self.db = database
+        # "<root>/" for stripping the root off record paths
+        self._root_prefix = os.path.join(str(self.project_root), '')
 
     def update_index(self):
         """Rebuild INDEX.md with current database state"""
@@ -27,8 +30,8 @@ class Indexer:
             1 for story in stories if story.get('status') == 'developing'
         )
 
-        # Start building content
-        content = f"""# Story Concepts Index
+        # Build the file as a list of parts, joined once at the end
+        parts = [f"""# Story Concepts Index
 
 This file tracks all story concepts in the database. Last updated: {datetime.now().strftime("%Y-%m-%d %H:%M")}
 
@@ -42,81 +45,75 @@ This file tracks all story concepts in the database. Last updated: {datetime.now
 
 ## Concept Batches
 
-"""
+"""]
 
-        # Group batches by location
-        batches_by_location = {}
+        # Bucket by location, then sort each bucket by date. Dates are only
+        # compared within a location: a dated batch in one and an undated
+        # (string-valued) one in another must not be compared
+        batches_by_location = {location: [] for location in ('generated', 'developing', 'favorites')}
         for batch in batches:
-            location = batch.get('location', 'unknown')
-            if location not in batches_by_location:
-                batches_by_location[location] = []
-            batches_by_location[location].append(batch)
+            location_batches = batches_by_location.get(batch.get('location', 'unknown'))
+            if location_batches is not None:
+                location_batches.append(batch)
+        for location_batches in batches_by_location.values():
+            location_batches.sort(key=lambda x: x.get('date_generated', ''), reverse=True)
 
         # Add batches organized by location
-        for location in ['generated', 'developing', 'favorites']:
-            if location in batches_by_location:
-                content += f"### {location.upper()}\n\n"
-
-                for batch in sorted(
-                    batches_by_location[location],
-                    key=lambda x: x.get('date_generated', ''),
-                    reverse=True
-                ):
-                    batch_id = batch.get('batch_id', 'N/A')
-                    genre = batch.get('genre', 'N/A')
-                    date = batch.get('date_generated', 'N/A')
-                    count = batch.get('count', 0)
+        for location, location_batches in batches_by_location.items():
+            if location_batches:
+                parts.append(f"### {location.upper()}\n\n")
 
-                    # Get relative path
-                    file_path = Path(batch.get('file_path', ''))
-                    try:
-                        relpath = file_path.relative_to(self.project_root)
-                    except ValueError:
-                        relpath = file_path
+                for batch in location_batches:
+                    get = batch.get
+                    relpath = self._relative_path(get('file_path', ''))
+                    parts.append(
+                        f"- **[{get('batch_id', 'N/A')}]** {get('genre', 'N/A')} "
+                        f"({get('count', 0)} concepts) - {get('date_generated', 'N/A')} - `{relpath}`\n"
+                    )
 
-                    content += f"- **[{batch_id}]** {genre} ({count} concepts) - {date} - `{relpath}`\n"
+                parts.append("\n")
 
-                content += "\n"
-
-        content += """---
+        parts.append("""---
 
 ## Stories in Development
 
-"""
+""")
 
         # Add stories
         for story in sorted(stories, key=lambda x: x.get('date_created', ''), reverse=True):
-            title = story.get('title', 'Untitled')
-            genre = story.get('genre', 'N/A')
-            status = story.get('status', 'N/A')
-            tropes = story.get('tropes', [])
-
-            if isinstance(tropes, list):
-                tropes_str = ', '.join(tropes)
-            else:
-                tropes_str = str(tropes)
-
-            # Get relative path
-            file_path = Path(story.get('file_path', ''))
-            try:
-                relpath = file_path.relative_to(self.project_root)
-            except ValueError:
-                relpath = file_path
-
-            content += f"""- **{title}** [{status}]
-  - Genre: {genre}
+            get = story.get
+            tropes = get('tropes', [])
+            tropes_str = ', '.join(tropes) if isinstance(tropes, list) else str(tropes)
+            relpath = self._relative_path(get('file_path', ''))
+
+            parts.append(f"""- **{get('title', 'Untitled')}** [{get('status', 'N/A')}]
+  - Genre: {get('genre', 'N/A')}
   - Tropes: {tropes_str}
   - File: `{relpath}`
 
-"""
+""")
 
-        content += """---
+        parts.append("""---
 
 ## Manual Updates
 You can manually add notes and cross-references below this line.
 
-"""
+""")
 
         # Write the index file
-        with open(self.index_file, 'w') as f:
-            f.write(content)
+        self.index_file.write_text(''.join(parts), encoding='utf-8')
+
+    def _relative_path(self, file_path: str) -> str:
+        """
+        Get a record's path relative to the project root, if it is inside it
+
+        Record paths are stored as strings built from the project root, so a
+        prefix strip gives the same result as ``Path.relative_to`` without
+        constructing a Path per row.
+        """
+        file_path = str(file_path)
+        if file_path.startswith(self._root_prefix):
+            return file_path[len(self._root_prefix):]
+        if file_path == self._root_prefix[:-1]:
+            return '.'
+        return file_path or '.'
@@ -4,11 +4,14 @@ Logging configuration for Aiwynn's Idea Factory
 Provides centralized logging setup with configurable levels and handlers.
 """
 
+import atexit
+import json
 import logging
+import queue
 import sys
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
-from typing import Optional
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import List, Optional, Tuple
 
 
 # Default log format
@@ -18,26 +21,186 @@ DETAILED_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(linen
 # Default log level
 DEFAULT_LEVEL = logging.INFO
 
+# Records a file handler buffers before writing them out in one go
+FILE_BUFFER_CAPACITY = 256
+
+
+class BatchedRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that writes buffered records in batches
+
+    Records are buffered and written with a single write, flush
+    and rollover check when ``capacity`` records are buffered, a record at
+    ``flush_level`` or above arrives, or ``flush()`` is called, instead of
+    a seek/tell, write and flush per record. A batch may take the file
+    slightly past ``maxBytes`` before it rolls over.
+    """
+
+    def __init__(self, *args, capacity: int = FILE_BUFFER_CAPACITY,
+                 flush_level: int = logging.ERROR, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.capacity = capacity
+        self.flush_level = flush_level
+        self.buffer = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.buffer.append(record)
+        if len(self.buffer) >= self.capacity or record.levelno >= self.flush_level:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write out the buffered records"""
+        with self.lock:
+            if self.buffer:
+                records = self.buffer
+                self.buffer = []
+                try:
+                    text = ''.join(self.format(record) + self.terminator for record in records)
+                    if self.stream is None:
+                        self.stream = self._open()
+                    if self.maxBytes > 0 and self.stream.tell() and \
+                            self.stream.tell() + len(text) >= self.maxBytes:
+                        self.doRollover()
+                    self.stream.write(text)
+                except Exception:
+                    self.handleError(records[-1])
+            super().flush()
+
+    def close(self) -> None:
+        self.flush()
+        super().close()
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Format records as one JSON object per line
+
+    The timestamp is written as epoch seconds (``record.created``) rather
+    than through strftime, and the fields stay machine-readable, e.g. for
+    ``jq``: ``{"t": ..., "name": ..., "level": ..., "msg": ...}``.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            't': record.created,
+            'name': record.name,
+            'level': record.levelname,
+            'msg': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _FlushWhenIdleListener(QueueListener):
+    """QueueListener that flushes its handlers whenever the queue runs dry"""
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        # About to wait for more records: write out whatever the last burst buffered
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+        return super().dequeue(block)
+
+
+class BackgroundHandler(QueueHandler):
+    """
+    Hand records to another handler on a background thread
+
+    The logging thread only puts the record on a queue; a QueueListener
+    thread does the actual (e.g. file) I/O, so callers never wait on disk.
+    The wrapped handler is flushed each time the queue is drained, so a
+    buffering handler writes once per burst of records.
+    """
+
+    def __init__(self, handler: logging.Handler):
+        super().__init__(queue.Queue(-1))
+        self.handler = handler
+        # This handler's level is the filter; the wrapped one handles everything it is given
+        self.listener = _FlushWhenIdleListener(self.queue, handler)
+        self.listener.start()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Once the listener has stopped nothing drains the queue, so a late
+        # record (e.g. from another atexit hook) is handled directly
+        if self.listener._thread is None:
+            self.handler.handle(record)
+        else:
+            super().emit(record)
+
+    def flush(self) -> None:
+        """Wait until every queued record has been written, then flush"""
+        if self.listener._thread is not None:
+            self.queue.join()
+        self.handler.flush()
+
+    def close(self) -> None:
+        """Detach from the logger, write out the queued records, stop the listener and close the wrapped handler"""
+        logging.getLogger('aiwynns').removeHandler(self)
+        if self.listener._thread is not None:
+            self.listener.stop()
+        self.handler.close()
+        super().close()
+
+
+def _close_background_handlers() -> None:
+    """Drain and close background handlers on exit so no records are lost"""
+    for handler in list(logging.getLogger('aiwynns').handlers):
+        if isinstance(handler, BackgroundHandler):
+            handler.close()
+
+
+atexit.register(_close_background_handlers)
+
+# Formatters keep no per-record state, so every handler shares these
+_DEFAULT_FORMATTER = logging.Formatter(DEFAULT_FORMAT)
+_DETAILED_FORMATTER = logging.Formatter(DETAILED_FORMAT)
+_JSON_LINES_FORMATTER = JsonLinesFormatter()
+
+# (settings, handlers) installed by the last successful setup_logging() call
+_configured: Optional[Tuple[Tuple, List[logging.Handler]]] = None
+
+
+def _is_configured(logger: logging.Logger, settings: Tuple) -> bool:
+    """Whether the logger still has exactly the setup made for these settings"""
+    if _configured is None or _configured[0] != settings:
+        return False
+    level, handlers = settings[0], _configured[1]
+    return (
+        logger.level == level
+        and logger.handlers == handlers
+        and all(handler.level == level for handler in handlers)
+        and all(handler.listener._thread is not None
+                for handler in handlers if isinstance(handler, BackgroundHandler))
+    )
+
 
 def setup_logging(
     level: Optional[int] = None,
     log_file: Optional[Path] = None,
     console_output: bool = True,
-    detailed: bool = False
+    detailed: bool = False,
+    structured: Optional[bool] = None
 ) -> None:
     """
     Configure logging for the application
 
+    Calling it again with the same settings keeps the existing handlers,
+    unless they were changed or removed in the meantime.
+
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Optional path to log file
         console_output: Whether to output logs to console
         detailed: Whether to use detailed log format with file/line info
+        structured: Whether to write the log file as JSON lines
 
     Environment Variables:
         AIWYNNS_LOG_LEVEL: Override default log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         AIWYNNS_LOG_FILE: Override default log file path
+        AIWYNNS_LOG_FORMAT: Set to "json" to write the log file as JSON lines
     """
+    global _configured
     import os
 
     # Determine log level from environment or parameter
@@ -51,16 +214,26 @@ def setup_logging(
         if env_log_file:
             log_file = Path(env_log_file)
 
+    # Determine log file format from environment or parameter
+    if structured is None:
+        structured = os.getenv('AIWYNNS_LOG_FORMAT', '').lower() == 'json'
+
     # Get root logger for aiwynns package
     logger = logging.getLogger('aiwynns')
+    settings = (level, log_file, console_output, detailed, structured, sys.stderr if console_output else None)
+    if _is_configured(logger, settings):
+        return
     logger.setLevel(level)
 
     # Remove existing handlers to avoid duplicates
+    _close_background_handlers()
     logger.handlers.clear()
 
+    _configured = None
+    complete = True
+
     # Choose format
-    log_format = DETAILED_FORMAT if detailed else DEFAULT_FORMAT
-    formatter = logging.Formatter(log_format)
+    formatter = _DETAILED_FORMATTER if detailed else _DEFAULT_FORMATTER
 
     # Console handler (stderr to not interfere with stdout output)
     if console_output:
@@ -75,22 +248,28 @@ def setup_logging(
             # Create log directory if it doesn't exist
             log_file.parent.mkdir(parents=True, exist_ok=True)
 
-            # Rotating file handler (10MB max, keep 5 backups)
-            file_handler = RotatingFileHandler(
+            # Rotating file handler (10MB max, keep 5 backups), written in batches
+            file_handler = BatchedRotatingFileHandler(
                 log_file,
                 maxBytes=10 * 1024 * 1024,  # 10MB
                 backupCount=5,
                 encoding='utf-8'
             )
-            file_handler.setLevel(level)
-            file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+            file_handler.setFormatter(_JSON_LINES_FORMATTER if structured else formatter)
+
+            # Write on a background thread so logging calls never block on disk
+            background_handler = BackgroundHandler(file_handler)
+            background_handler.setLevel(level)
+            logger.addHandler(background_handler)
 
         except (OSError, PermissionError) as e:
             # If we can't write to log file, just warn and continue
+            complete = False
             if console_output:
                 logger.warning(f"Could not create log file {log_file}: {e}")
 
+    if complete:
+        _configured = (settings, list(logger.handlers))
     logger.debug(f"Logging initialized at level {logging.getLevelName(level)}")
 
 
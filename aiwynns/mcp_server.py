@@ -6,12 +6,22 @@ Exposes story concept management via Model Context Protocol
 
 import os
 import json
+import asyncio
+import functools
+import itertools
+import threading
 from pathlib import Path
-from typing import Optional, Any
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime, date
 
 from fastmcp import FastMCP
 
+# Native JSON encoder when installed (``pip install aiwynns-idea-factory[fast]``)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Get workspace root
 # When installed as package, use CWD (user's workspace)
 # When developing, use package parent directory
@@ -23,11 +33,12 @@ else:
     PROJECT_ROOT = Path.cwd()
 
 # Import our modules
-from aiwynns.database import ConceptDatabase
+from aiwynns.database import ConceptDatabase, date_updated_edit
 from aiwynns.search import SearchEngine
 from aiwynns.stats import StatsGenerator
-from aiwynns.creator import Creator
+from aiwynns.creator import Creator, parse_concept_sections, render_template
 from aiwynns.logging_config import setup_logging
+from aiwynns.validation import validate_limit
 import logging
 
 # Setup logging (DEBUG level for MCP server, logs to file if AIWYNNS_LOG_FILE env var is set)
@@ -45,21 +56,145 @@ logger.info("MCP server initialized successfully")
 # Create MCP server
 mcp = FastMCP("Aiwynn's Idea Factory")
 
+# Serializes tool and resource calls running in worker threads, see in_thread()
+_workspace_lock = threading.Lock()
+
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def serialize_for_json(obj: Any) -> Any:
-    """Convert Python objects to JSON-serializable types"""
+def in_thread(fn):
+    """
+    Run a blocking tool or resource in a worker thread
+
+    File reads and writes and database scans then no longer hold up the
+    server's event loop. The database, search engine and stats caches are
+    shared and not thread-safe, so calls run one at a time under
+    ``_workspace_lock``; waiting for it also happens off the event loop.
+    """
+    def locked(*args, **kwargs):
+        with _workspace_lock:
+            return fn(*args, **kwargs)
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(locked, *args, **kwargs)
+    return wrapper
+
+
+def take(records, limit: Optional[int]) -> tuple:
+    """
+    Take up to ``limit`` records from an iterator (all if limit is None)
+
+    Returns:
+        Tuple of (records taken, whether more records were left)
+    """
+    if limit is None:
+        return list(records), False
+
+    limit = validate_limit(limit)
+    taken = list(itertools.islice(records, limit + 1))
+    return taken[:limit], len(taken) > limit
+
+
+def to_json(obj: Any, pretty: bool = False) -> str:
+    """
+    Serialize a response as JSON, compact unless ``pretty`` is set
+
+    Uses orjson when available, which encodes dates and datetimes natively
+    as ISO 8601. Otherwise, or for values orjson cannot encode, falls back
+    to the json module with ``_json_default`` producing the same strings.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        try:
+            return orjson.dumps(obj, option=option).decode('utf-8')
+        except orjson.JSONEncodeError:
+            pass
+    if pretty:
+        return json.dumps(obj, indent=2, default=_json_default)
+    return json.dumps(obj, separators=(',', ':'), default=_json_default)
+
+
+def stream_json(head: dict, key: str, items: Iterable[Any], pretty: bool = False) -> Iterator[str]:
+    """
+    Yield the JSON text of ``{**head, key: [*items]}`` piece by piece
+
+    Produces the same text as ``to_json`` on the full object, but each item
+    is encoded as it is consumed, so no response-sized structure has to be
+    built (or walked twice) first.
+    """
+    if not pretty:
+        yield '{'
+        for name, value in head.items():
+            yield f'{to_json(name)}:{to_json(value)},'
+        yield f'{to_json(key)}:['
+        empty = True
+        for item in items:
+            yield to_json(item) if empty else ',' + to_json(item)
+            empty = False
+        yield ']}'
+        return
+
+    yield '{'
+    for name, value in head.items():
+        yield f'\n  {to_json(name)}: ' + to_json(value, pretty=True).replace('\n', '\n  ') + ','
+    yield f'\n  {to_json(key)}: ['
+    empty = True
+    for item in items:
+        yield ('\n    ' if empty else ',\n    ') + to_json(item, pretty=True).replace('\n', '\n    ')
+        empty = False
+    yield ']\n}' if empty else '\n  ]\n}'
+
+
+def apply_edits(text: str, edits: List[Tuple[int, int, str]], start: int = 0) -> str:
+    """
+    Apply sorted, non-overlapping (start, end, replacement) edits to text
+
+    Returns the edited text from offset ``start`` of the original on.
+    """
+    pieces = []
+    cursor = start
+    for edit_start, edit_end, replacement in edits:
+        pieces.extend((text[cursor:edit_start], replacement))
+        cursor = edit_end
+    pieces.append(text[cursor:])
+    return ''.join(pieces)
+
+
+def write_edits(path: Path, original: str, edits: List[Tuple[int, int, str]]) -> None:
+    """
+    Apply edits (as for ``apply_edits``) to a file whose text is ``original``
+
+    Edits that keep their encoded length are overwritten in place; from the
+    first one that does not, the rest of the file is rewritten. Adding a note
+    and bumping a same-width date therefore writes the changed bytes and the
+    text after the note rather than the whole story.
+    """
+    with open(path, 'r+b') as f:
+        pos = byte_pos = 0
+        for i, (start, end, replacement) in enumerate(edits):
+            byte_start = byte_pos + len(original[pos:start].encode('utf-8'))
+            byte_end = byte_start + len(original[start:end].encode('utf-8'))
+            data = replacement.encode('utf-8')
+
+            f.seek(byte_start)
+            if len(data) != byte_end - byte_start:
+                # Length changes: rewrite from here on, applying the remaining edits
+                f.write(apply_edits(original, edits[i:], start).encode('utf-8'))
+                f.truncate()
+                return
+
+            f.write(data)
+            pos, byte_pos = end, byte_end
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode the values json cannot handle itself (dates and datetimes)"""
     if isinstance(obj, (datetime, date)):
         return obj.isoformat()
-    elif isinstance(obj, dict):
-        return {k: serialize_for_json(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [serialize_for_json(item) for item in obj]
-    else:
-        return obj
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
 # ============================================================================
@@ -67,17 +202,13 @@ def serialize_for_json(obj: Any) -> Any:
 # ============================================================================
 
 @mcp.resource("aiwynns://batches/list")
+@in_thread
 def list_batches() -> str:
     """List all concept batches in the database"""
     batches = db.get_all_batches()
 
-    result = {
-        "total": len(batches),
-        "batches": []
-    }
-
-    for batch in batches:
-        result["batches"].append({
+    summaries = (
+        {
             "batch_id": batch.get("batch_id"),
             "date": batch.get("date_generated"),
             "genre": batch.get("genre"),
@@ -85,12 +216,15 @@ def list_batches() -> str:
             "count": batch.get("count"),
             "status": batch.get("status"),
             "location": batch.get("location")
-        })
+        }
+        for batch in batches
+    )
 
-    return json.dumps(serialize_for_json(result), indent=2)
+    return ''.join(stream_json({"total": len(batches)}, "batches", summaries))
 
 
 @mcp.resource("aiwynns://batch/{batch_id}")
+@in_thread
 def read_batch(batch_id: str) -> str:
     """Read a specific batch with all its concepts"""
     batch = db.get_batch(batch_id)
@@ -99,7 +233,7 @@ def read_batch(batch_id: str) -> str:
         return json.dumps({"error": f"Batch {batch_id} not found"})
 
     # Include full content
-    result = {
+    header = {
         "batch_id": batch.get("batch_id"),
         "date_generated": batch.get("date_generated"),
         "genre": batch.get("genre"),
@@ -108,20 +242,22 @@ def read_batch(batch_id: str) -> str:
         "status": batch.get("status"),
         "llm_model": batch.get("llm_model"),
         "prompt_used": batch.get("prompt_used"),
-        "concepts": []
     }
 
-    for concept in batch.get("concepts", []):
-        result["concepts"].append({
+    concepts = (
+        {
             "number": concept.get("number"),
             "title": concept.get("title"),
             "content": concept.get("content")
-        })
+        }
+        for concept in db.get_concepts(batch)
+    )
 
-    return json.dumps(serialize_for_json(result), indent=2)
+    return ''.join(stream_json(header, "concepts", concepts))
 
 
 @mcp.resource("aiwynns://stories/list")
+@in_thread
 def list_stories() -> str:
     """List all stories in development"""
     stories = db.get_all_stories()
@@ -152,26 +288,28 @@ def list_stories() -> str:
             "file_path": story.get("file_path")
         })
 
-    return json.dumps(serialize_for_json(result), indent=2)
+    return to_json(result)
 
 
 @mcp.resource("aiwynns://story/{story_name}")
+@in_thread
 def read_story(story_name: str) -> str:
     """Read a specific story development file"""
-    story_file = PROJECT_ROOT / "stories" / f"{story_name}.md"
-
-    if not story_file.exists():
-        story_file = PROJECT_ROOT / "stories" / story_name
-        if not story_file.exists():
-            return json.dumps({"error": f"Story {story_name} not found"})
+    stories_dir = PROJECT_ROOT / "stories"
 
-    with open(story_file, 'r') as f:
-        content = f.read()
+    # Try the name with .md first, then as given; read directly rather than
+    # stat-ing first so the common case is a single open
+    for story_file in (stories_dir / f"{story_name}.md", stories_dir / story_name):
+        try:
+            return story_file.read_text(encoding='utf-8')
+        except OSError:
+            continue
 
-    return content
+    return json.dumps({"error": f"Story {story_name} not found"})
 
 
 @mcp.resource("aiwynns://stats")
+@in_thread
 def get_stats() -> str:
     """Get database statistics"""
     stats = stats_gen.generate_stats()
@@ -186,26 +324,27 @@ def get_stats() -> str:
         "top_tropes": stats["top_tropes"][:10]
     }
 
-    return json.dumps(serialize_for_json(result), indent=2)
+    return to_json(result)
 
 
 @mcp.resource("aiwynns://index")
+@in_thread
 def read_index() -> str:
     """Read the INDEX.md database file"""
     index_file = PROJECT_ROOT / "INDEX.md"
 
-    if not index_file.exists():
+    try:
+        return index_file.read_text(encoding='utf-8')
+    except FileNotFoundError:
         return "Index file not found. Run update_index tool to create it."
 
-    with open(index_file, 'r') as f:
-        return f.read()
-
 
 # ============================================================================
 # TOOLS - Actions the LLM can take
 # ============================================================================
 
 @mcp.tool()
+@in_thread
 def create_batch(genre: str, tropes: str, model: str, count: int = 10) -> str:
     """
     Create a new concept batch file from template
@@ -231,6 +370,7 @@ def create_batch(genre: str, tropes: str, model: str, count: int = 10) -> str:
 
 
 @mcp.tool()
+@in_thread
 def develop_concept(batch_id: str, concept_number: int) -> str:
     """
     Extract a concept from a batch and create a story development file
@@ -249,7 +389,7 @@ def develop_concept(batch_id: str, concept_number: int) -> str:
             })
 
         # Find the concept
-        concepts = batch.get('concepts', [])
+        concepts = db.get_concepts(batch)
         target_concept = None
         for concept in concepts:
             if concept.get('number') == str(concept_number):
@@ -267,30 +407,15 @@ def develop_concept(batch_id: str, concept_number: int) -> str:
         content = target_concept.get('content', '')
 
         # Parse content for high concept, synopsis, etc.
-        lines = content.split('\n')
-        high_concept = ""
-        synopsis = ""
-        key_elements = []
-
-        current_section = None
-        for line in lines:
-            line = line.strip()
-            if line.startswith('**High Concept**:'):
-                current_section = 'high_concept'
-                high_concept = line.replace('**High Concept**:', '').strip()
-            elif line.startswith('**Synopsis**:'):
-                current_section = 'synopsis'
-                synopsis = line.replace('**Synopsis**:', '').strip()
-            elif line.startswith('**Key Elements**:'):
-                current_section = 'key_elements'
-            elif line.startswith('-') and current_section == 'key_elements':
-                key_elements.append(line[1:].strip())
-            elif line and current_section == 'synopsis' and not line.startswith('**'):
-                synopsis += ' ' + line
+        sections = parse_concept_sections(content)
+        high_concept = sections['high_concept']
+        synopsis = sections['synopsis']
+        key_elements = sections['key_elements']
 
         # Create story file
         filename = creator._slugify(title)
-        story_id = f"{filename}-{int(datetime.now().timestamp())}"
+        now = datetime.now()
+        story_id = f"{filename}-{int(now.timestamp())}"
         story_file = PROJECT_ROOT / "stories" / f"{filename}.md"
 
         if story_file.exists():
@@ -299,45 +424,37 @@ def develop_concept(batch_id: str, concept_number: int) -> str:
                 "error": f"Story file {filename}.md already exists"
             })
 
-        # Read template
-        template_file = PROJECT_ROOT / "templates" / "story-development.md"
-        with open(template_file, 'r') as f:
-            template_content = f.read()
+        # Read template (cached until the file changes)
+        template_content = creator._load_template("story-development.md")
 
         # Replace placeholders
         genre = batch.get('genre', 'Unknown')
-        today = datetime.now().strftime("%Y-%m-%d")
-
-        story_content = template_content.replace("[unique-id]", story_id)
-        story_content = story_content.replace("[Working Title]", title)
-        story_content = story_content.replace("[Story Title]", title)
-        story_content = story_content.replace("[genre]", genre)
-        story_content = story_content.replace("[batch_id if from generated concepts]", batch_id)
-        story_content = story_content.replace("YYYY-MM-DD", today)
-        story_content = story_content.replace(
-            "[One-line pitch that captures the essence]",
-            high_concept if high_concept else "[One-line pitch that captures the essence]"
-        )
-        story_content = story_content.replace(
-            "[2-3 sentence compelling description]",
-            synopsis if synopsis else "[2-3 sentence compelling description]"
-        )
+        today = now.strftime("%Y-%m-%d")
+
+        replacements = {
+            "[unique-id]": story_id,
+            "[Working Title]": title,
+            "[Story Title]": title,
+            "[genre]": genre,
+            "[batch_id if from generated concepts]": batch_id,
+            "YYYY-MM-DD": today,
+        }
+        if high_concept:
+            replacements["[One-line pitch that captures the essence]"] = high_concept
+        if synopsis:
+            replacements["[2-3 sentence compelling description]"] = synopsis
 
         # Add key elements to dev notes
-        dev_notes = f"\n### [{today}] From Batch {batch_id}, Concept #{concept_number}\n\n"
+        dev_notes = [f"\n### [{today}] From Batch {batch_id}, Concept #{concept_number}\n\n"]
         if key_elements:
-            dev_notes += "**Key Elements from Concept:**\n"
-            for element in key_elements:
-                dev_notes += f"- {element}\n"
+            dev_notes.append("**Key Elements from Concept:**\n")
+            dev_notes.extend(f"- {element}\n" for element in key_elements)
+        replacements["## Development Notes"] = "## Development Notes" + "".join(dev_notes)
 
-        if "## Development Notes" in story_content:
-            story_content = story_content.replace(
-                "## Development Notes",
-                f"## Development Notes{dev_notes}"
-            )
+        story_content = render_template(template_content, replacements)
 
         # Write file
-        with open(story_file, 'w') as f:
+        with open(story_file, 'w', encoding='utf-8') as f:
             f.write(story_content)
 
         return json.dumps({
@@ -356,6 +473,7 @@ def develop_concept(batch_id: str, concept_number: int) -> str:
 
 
 @mcp.tool()
+@in_thread
 def add_note(story_name: str, note_text: str, section: Optional[str] = None) -> str:
     """
     Add a note to a story development file
@@ -376,48 +494,62 @@ def add_note(story_name: str, note_text: str, section: Optional[str] = None) ->
                     "error": f"Story {story_name} not found"
                 })
 
-        with open(story_file, 'r') as f:
-            content = f.read()
+        file_text = story_file.read_bytes().decode('utf-8')
+        # Same newline handling as reading in text mode
+        content = file_text.replace('\r\n', '\n').replace('\r', '\n') if '\r' in file_text else file_text
 
         # Format note with timestamp
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+        now = datetime.now()
+        timestamp = now.strftime("%Y-%m-%d %H:%M")
         note_entry = f"\n### [{timestamp}]\n{note_text}\n"
 
-        # Add to appropriate section
+        # Find where the note goes
         if section:
             target_section = f"## {section.title()}"
-            if target_section in content:
-                parts = content.split(target_section)
-                if len(parts) > 1:
-                    next_section_idx = parts[1].find('\n## ')
-                    if next_section_idx != -1:
-                        parts[1] = parts[1][:next_section_idx] + note_entry + parts[1][next_section_idx:]
-                    else:
-                        parts[1] += note_entry
-                    content = target_section.join(parts)
+            start = content.find(target_section)
+            if start != -1:
+                # Insert before the next heading, or before the section's next
+                # mention if that comes first, without splitting the whole file
+                start += len(target_section)
+                end = content.find(target_section, start)
+                if end == -1:
+                    end = len(content)
+                next_section_idx = content.find('\n## ', start, end)
+                insert_at = end if next_section_idx == -1 else next_section_idx
             else:
                 section = None
 
         if not section:
-            if "## Development Notes" in content:
-                content = content.replace("## Development Notes", f"## Development Notes{note_entry}", 1)
+            notes_idx = content.find("## Development Notes")
+            if notes_idx != -1:
+                insert_at = notes_idx + len("## Development Notes")
+            else:
+                insert_at = len(content)
+                note_entry = f"\n\n## Development Notes{note_entry}"
+
+        edits = [(insert_at, insert_at, note_entry)]
+
+        # Update date_updated, editing just that line so the rest of the
+        # frontmatter keeps its original order and formatting
+        today = now.strftime('%Y-%m-%d')
+        edit = date_updated_edit(content, today)
+        if edit:
+            frontmatter_start, frontmatter_end, frontmatter_text = edit
+            if insert_at >= frontmatter_end:
+                if frontmatter_text != content[frontmatter_start:frontmatter_end]:
+                    edits.insert(0, edit)
             else:
-                content += f"\n\n## Development Notes{note_entry}"
-
-        # Update date_updated
-        import yaml
-        parts = content.split('---', 2)
-        if len(parts) >= 3:
-            try:
-                frontmatter = yaml.safe_load(parts[1])
-                frontmatter['date_updated'] = datetime.now().strftime("%Y-%m-%d")
-                parts[1] = '\n' + yaml.dump(frontmatter, default_flow_style=False)
-                content = '---'.join(parts)
-            except:
-                pass
-
-        with open(story_file, 'w') as f:
-            f.write(content)
+                # The note lands before the end of the frontmatter: insert it,
+                # then update the frontmatter of the result
+                noted = apply_edits(content, edits)
+                edit = date_updated_edit(noted, today)
+                edits = [(0, len(content), apply_edits(noted, [edit]) if edit else noted)]
+
+        if content is not file_text:
+            # Line endings were normalized, so the whole file is rewritten
+            edits = [(0, len(file_text), apply_edits(content, edits))]
+
+        write_edits(story_file, file_text, edits)
 
         return json.dumps({
             "success": True,
@@ -433,13 +565,15 @@ def add_note(story_name: str, note_text: str, section: Optional[str] = None) ->
 
 
 @mcp.tool()
+@in_thread
 def search_concepts(
     query: str,
     genre: Optional[str] = None,
     trope: Optional[str] = None,
     status: Optional[str] = None,
     fuzzy: bool = False,
-    limit: int = 20
+    limit: int = 20,
+    pretty: bool = False
 ) -> str:
     """
     Search through all concepts and stories
@@ -451,6 +585,7 @@ def search_concepts(
         status: Optional status filter
         fuzzy: Use fuzzy matching (default: False)
         limit: Maximum results to return (default: 20)
+        pretty: Indent the JSON response (default: compact)
     """
     try:
         results = search_engine.search(
@@ -462,11 +597,11 @@ def search_concepts(
             limit=limit
         )
 
-        return json.dumps(serialize_for_json({
+        return to_json({
             "success": True,
             "count": len(results),
             "results": results
-        }), indent=2)
+        }, pretty=pretty)
 
     except Exception as e:
         return json.dumps({
@@ -476,6 +611,7 @@ def search_concepts(
 
 
 @mcp.tool()
+@in_thread
 def update_index() -> str:
     """Update the INDEX.md database file with current state"""
     try:
@@ -497,9 +633,12 @@ def update_index() -> str:
 
 
 @mcp.tool()
+@in_thread
 def list_batches_tool(
     status: Optional[str] = None,
-    genre: Optional[str] = None
+    genre: Optional[str] = None,
+    limit: Optional[int] = None,
+    pretty: bool = False
 ) -> str:
     """
     List all concept batches with optional filtering
@@ -507,19 +646,17 @@ def list_batches_tool(
     Args:
         status: Optional status filter (e.g., "generated", "developing")
         genre: Optional genre filter (e.g., "Romantasy", "Fantasy")
+        limit: Optional maximum number of batches to return
+        pretty: Indent the JSON response (default: compact)
     """
     try:
-        batches = db.get_all_batches()
-
-        # Apply filters
-        if status:
-            batches = [b for b in batches if b.get('status') == status]
-        if genre:
-            batches = [b for b in batches if genre.lower() in str(b.get('genre', '')).lower()]
+        batches, has_more = take(db.iter_batches(status=status, genre=genre), limit)
 
         result = {
             "success": True,
-            "total": len(batches),
+            "total": db.count_batches(status=status, genre=genre),
+            "returned": len(batches),
+            "has_more": has_more,
             "batches": []
         }
 
@@ -534,7 +671,7 @@ def list_batches_tool(
                 "location": batch.get("location")
             })
 
-        return json.dumps(serialize_for_json(result), indent=2)
+        return to_json(result, pretty=pretty)
 
     except Exception as e:
         return json.dumps({
@@ -544,9 +681,12 @@ def list_batches_tool(
 
 
 @mcp.tool()
+@in_thread
 def list_stories_tool(
     status: Optional[str] = None,
-    genre: Optional[str] = None
+    genre: Optional[str] = None,
+    limit: Optional[int] = None,
+    pretty: bool = False
 ) -> str:
     """
     List all stories in development with optional filtering
@@ -554,19 +694,17 @@ def list_stories_tool(
     Args:
         status: Optional status filter (e.g., "developing", "draft", "complete")
         genre: Optional genre filter (e.g., "Romantasy", "Fantasy")
+        limit: Optional maximum number of stories to return
+        pretty: Indent the JSON response (default: compact)
     """
     try:
-        stories = db.get_all_stories()
-
-        # Apply filters
-        if status:
-            stories = [s for s in stories if s.get('status') == status]
-        if genre:
-            stories = [s for s in stories if genre.lower() in str(s.get('genre', '')).lower()]
+        stories, has_more = take(db.iter_stories(status=status, genre=genre), limit)
 
         result = {
             "success": True,
-            "total": len(stories),
+            "total": db.count_stories(status=status, genre=genre),
+            "returned": len(stories),
+            "has_more": has_more,
             "stories": []
         }
 
@@ -574,7 +712,6 @@ def list_stories_tool(
             # Extract story name (filename without .md) for use with other tools
             file_path = story.get("file_path", "")
             if file_path:
-                from pathlib import Path
                 story_name = Path(file_path).stem
             else:
                 story_name = None
@@ -591,7 +728,7 @@ def list_stories_tool(
                 "file_path": story.get("file_path")
             })
 
-        return json.dumps(serialize_for_json(result), indent=2)
+        return to_json(result, pretty=pretty)
 
     except Exception as e:
         return json.dumps({
@@ -2,8 +2,11 @@
 Search module with fuzzy matching and advanced filtering
 """
 
-from typing import List, Dict, Optional
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Any, Iterator, List, Dict, Optional, Tuple
 import logging
+import numpy as np
 from rapidfuzz import fuzz, process
 from .validation import (
     sanitize_search_query,
@@ -14,12 +17,22 @@ from .exceptions import ValidationError, SearchError
 
 logger = logging.getLogger(__name__)
 
+# Fuzzy matches must score above this (0-100 partial_ratio)
+FUZZY_THRESHOLD = 60
+# Fuzzy scoring uses every core only from this many candidates; below it,
+# starting the threads costs more than it saves
+PARALLEL_SEARCH_MIN = 256
+# Joins texts for a single substring scan; sanitized queries never contain it
+_SEPARATOR = '\x00'
+
 
 class SearchEngine:
     """Advanced search with fuzzy matching"""
 
     def __init__(self, database):
         self.db = database
+        # (database version, batch entries, story entries), see _get_index()
+        self._index: Optional[Tuple[Any, List[Tuple], List[Tuple]]] = None
 
     def search(
         self,
@@ -56,105 +69,163 @@ class SearchEngine:
         if status:
             status = validate_string(status, "status", max_length=50)
 
-        logger.info(f"Searching: query='{query}', fuzzy={fuzzy}, limit={limit}, genre={genre}, trope={trope}, status={status}")
+        logger.info(
+            "Searching: query='%s', fuzzy=%s, limit=%s, genre=%s, trope=%s, status=%s",
+            query, fuzzy, limit, genre, trope, status
+        )
 
-        results = []
+        query_lower = query.lower()
+        genre_lower = genre.lower() if genre else None
+        trope_lower = trope.lower() if trope else None
+        batch_entries, story_entries = self._get_index()
+
+        # Collect the concepts and stories passing the filters, in order, as
+        # (batch or story, concept or None, text, lowered text)
+        candidates = []
 
         # Search batches
-        for batch in self.db.get_all_batches():
-            # Apply filters
-            if genre and genre.lower() not in str(batch.get('genre', '')).lower():
+        for batch, batch_genre, batch_status, batch_tropes, concepts in batch_entries:
+            # Apply filters, the cheap equality check first
+            if status and batch_status != status:
                 continue
-            if status and batch.get('status') != status:
+            if genre and genre_lower not in batch_genre:
                 continue
-            if trope and trope.lower() not in str(batch.get('tropes', '')).lower():
+            if trope and trope_lower not in batch_tropes:
                 continue
 
-            # Search in batch metadata
-            searchable = f"{batch.get('genre', '')} {batch.get('tropes', '')} {batch.get('notes', '')}"
-
             # Search in individual concepts
-            for concept in batch.get('concepts', []):
-                concept_text = f"{concept.get('title', '')} {concept.get('content', '')}"
-                searchable += " " + concept_text
-
-                if fuzzy:
-                    score = fuzz.partial_ratio(query.lower(), concept_text.lower())
-                    if score > 60:  # Threshold for fuzzy matching
-                        results.append({
-                            'type': 'concept',
-                            'title': concept.get('title', 'Untitled'),
-                            'batch_id': batch.get('batch_id'),
-                            'genre': batch.get('genre'),
-                            'file': batch.get('file_path'),
-                            'score': score / 100.0,
-                            'preview': concept_text[:200]
-                        })
-                else:
-                    if query.lower() in concept_text.lower():
-                        results.append({
-                            'type': 'concept',
-                            'title': concept.get('title', 'Untitled'),
-                            'batch_id': batch.get('batch_id'),
-                            'genre': batch.get('genre'),
-                            'file': batch.get('file_path'),
-                            'preview': self._get_preview(concept_text, query)
-                        })
+            for concept, concept_text, concept_lower in concepts:
+                candidates.append((batch, concept, concept_text, concept_lower))
 
         # Search stories
-        for story in self.db.get_all_stories():
-            # Apply filters
-            if genre and genre.lower() not in str(story.get('genre', '')).lower():
+        for story, story_genre, story_status, story_tropes, story_text, story_lower in story_entries:
+            # Apply filters, the cheap equality check first
+            if status and story_status != status:
                 continue
-            if status and story.get('status') != status:
+            if genre and genre_lower not in story_genre:
                 continue
-            if trope and trope.lower() not in str(story.get('tropes', '')).lower():
+            if trope and trope_lower not in story_tropes:
                 continue
 
-            story_text = f"{story.get('title', '')} {story.get('content', '')}"
+            candidates.append((story, None, story_text, story_lower))
 
-            if fuzzy:
-                score = fuzz.partial_ratio(query.lower(), story_text.lower())
-                if score > 60:
-                    results.append({
-                        'type': 'story',
-                        'title': story.get('title', 'Untitled'),
-                        'genre': story.get('genre'),
-                        'file': story.get('file_path'),
-                        'score': score / 100.0,
-                        'preview': story_text[:200]
-                    })
-            else:
-                if query.lower() in story_text.lower():
-                    results.append({
-                        'type': 'story',
-                        'title': story.get('title', 'Untitled'),
-                        'genre': story.get('genre'),
-                        'file': story.get('file_path'),
-                        'preview': self._get_preview(story_text, query)
-                    })
+        results = []
+        if fuzzy:
+            if candidates:
+                # Score every candidate in one call; the loop runs in C without the GIL
+                scores = process.cdist(
+                    [query_lower],
+                    [candidate[3] for candidate in candidates],
+                    scorer=fuzz.partial_ratio,
+                    score_cutoff=FUZZY_THRESHOLD,
+                    dtype=np.float64,
+                    workers=-1 if len(candidates) >= PARALLEL_SEARCH_MIN else 1
+                )[0]
+                for (record, concept, text, _), score in zip(candidates, scores):
+                    if score > FUZZY_THRESHOLD:
+                        result = self._result(record, concept)
+                        result['score'] = float(score) / 100.0
+                        result['preview'] = text[:200]
+                        results.append(result)
+        else:
+            for i, idx in _first_matches([candidate[3] for candidate in candidates], query_lower):
+                record, concept, text, _ = candidates[i]
+                result = self._result(record, concept)
+                result['preview'] = self._preview_at(text, idx, len(query))
+                results.append(result)
 
         # Sort results by score if fuzzy matching
         if fuzzy:
             results.sort(key=lambda x: x.get('score', 0), reverse=True)
 
         limited_results = results[:limit]
-        logger.info(f"Search completed: found {len(results)} results, returning {len(limited_results)}")
-        logger.debug(f"Result types: {[r['type'] for r in limited_results]}")
+        logger.info("Search completed: found %d results, returning %d", len(results), len(limited_results))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Result types: %s", [r['type'] for r in limited_results])
 
         return limited_results
 
+    @staticmethod
+    def _result(record: Dict, concept: Optional[Dict]) -> Dict[str, Any]:
+        """Start a search result for a batch concept, or a story if concept is None"""
+        if concept is None:
+            return {
+                'type': 'story',
+                'title': record.get('title', 'Untitled'),
+                'genre': record.get('genre'),
+                'file': record.get('file_path')
+            }
+        return {
+            'type': 'concept',
+            'title': concept.get('title', 'Untitled'),
+            'batch_id': record.get('batch_id'),
+            'genre': record.get('genre'),
+            'file': record.get('file_path')
+        }
+
+    def _get_index(self) -> Tuple[List[Tuple], List[Tuple]]:
+        """
+        Get the searchable text of every batch concept and story
+
+        Filter fields and searchable text are lowercased once when the index
+        is built rather than on every query. The index is rebuilt whenever
+        the database's version changes, i.e. after files were added,
+        changed or removed.
+
+        Returns:
+            Tuple of (batch entries, story entries). Batch entries are
+            ``(batch, genre, status, tropes, concepts)`` with concepts as
+            ``(concept, text, lowered text)``; story entries are
+            ``(story, genre, status, tropes, text, lowered text)``.
+        """
+        batches = self.db.get_all_batches()
+        stories = self.db.get_all_stories()
+        version = getattr(self.db, 'version', None)
+        if self._index is not None and version is not None and self._index[0] == version:
+            return self._index[1], self._index[2]
+
+        batch_entries = []
+        for batch in batches:
+            concepts = []
+            for concept in self.db.get_concepts(batch):
+                concept_text = f"{concept.get('title', '')} {concept.get('content', '')}"
+                concepts.append((concept, concept_text, concept_text.lower()))
+            batch_entries.append((
+                batch,
+                str(batch.get('genre', '')).lower(),
+                batch.get('status'),
+                str(batch.get('tropes', '')).lower(),
+                concepts
+            ))
+
+        story_entries = []
+        for story in stories:
+            story_text = f"{story.get('title', '')} {story.get('content', '')}"
+            story_entries.append((
+                story,
+                str(story.get('genre', '')).lower(),
+                story.get('status'),
+                str(story.get('tropes', '')).lower(),
+                story_text,
+                story_text.lower()
+            ))
+
+        self._index = (version, batch_entries, story_entries)
+        return batch_entries, story_entries
+
     def _get_preview(self, text: str, query: str, context_chars: int = 100) -> str:
         """Get a preview of text around the query match"""
-        query_lower = query.lower()
-        text_lower = text.lower()
-
-        idx = text_lower.find(query_lower)
+        idx = text.lower().find(query.lower())
         if idx == -1:
             return text[:200]
 
+        return self._preview_at(text, idx, len(query), context_chars)
+
+    @staticmethod
+    def _preview_at(text: str, idx: int, match_length: int, context_chars: int = 100) -> str:
+        """Get a preview of text around a match already found at idx"""
         start = max(0, idx - context_chars)
-        end = min(len(text), idx + len(query) + context_chars)
+        end = min(len(text), idx + match_length + context_chars)
 
         preview = text[start:end]
         if start > 0:
@@ -163,3 +234,29 @@ class SearchEngine:
             preview = preview + '...'
 
         return preview
+
+
+def _first_matches(texts: List[str], needle: str) -> Iterator[Tuple[int, int]]:
+    """
+    Yield (index, offset) of the first occurrence of needle in each text containing it
+
+    The texts are joined with a separator the needle cannot contain and
+    scanned with ``str.find``, so the Python loop runs once per matching
+    text rather than once per text.
+    """
+    if not needle or _SEPARATOR in needle:
+        for i, text in enumerate(texts):
+            idx = text.find(needle)
+            if idx != -1:
+                yield i, idx
+        return
+
+    corpus = _SEPARATOR.join(texts)
+    # starts[i] is the offset of texts[i] in the corpus
+    starts = list(accumulate((len(text) + 1 for text in texts), initial=0))
+    pos = corpus.find(needle)
+    while pos != -1:
+        i = bisect_right(starts, pos) - 1
+        yield i, pos - starts[i]
+        # Only the first match per text is needed; resume at the next text
+        pos = corpus.find(needle, starts[i + 1])
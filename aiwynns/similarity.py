@@ -2,8 +2,10 @@
 Similarity module for finding duplicate or similar concepts
 """
 
-from typing import List, Tuple, Dict
-from rapidfuzz import fuzz
+import heapq
+from typing import Any, Iterator, List, Optional, Tuple, Dict
+import numpy as np
+from rapidfuzz import fuzz, process
 
 
 class SimilarityFinder:
@@ -11,53 +13,54 @@ class SimilarityFinder:
 
     def __init__(self, database):
         self.db = database
+        # (database version, corpus columns), see _get_corpus()
+        self._corpus: Optional[Tuple[Any, Tuple]] = None
+        # (corpus columns, lowered texts), see _get_texts()
+        self._texts: Optional[Tuple[Tuple, List[str]]] = None
 
     def find_similar_concepts(
         self,
-        threshold: float = 0.8
+        threshold: float = 0.8,
+        top_k: Optional[int] = None
     ) -> List[Tuple[Dict, Dict, float]]:
         """
         Find similar concepts across all batches
 
         Args:
             threshold: Similarity threshold (0.0 to 1.0)
+            top_k: Return only this many of the most similar pairs
 
         Returns:
             List of tuples: (concept1, concept2, similarity_score)
         """
         similar_pairs = []
-        all_concepts = []
+        corpus, texts = self._get_texts()
+        batch_ids = corpus[0]
 
-        # Gather all concepts from all batches
-        for batch in self.db.get_all_batches():
-            batch_id = batch.get('batch_id')
-            for concept in batch.get('concepts', []):
-                all_concepts.append({
-                    'batch': batch_id,
-                    'number': concept.get('number'),
-                    'title': concept.get('title', ''),
-                    'content': concept.get('content', ''),
-                    'text': f"{concept.get('title', '')} {concept.get('content', '')}"
-                })
-
-        # Compare all pairs
-        for i, concept1 in enumerate(all_concepts):
-            for concept2 in all_concepts[i + 1:]:
-                # Skip if from same batch
-                if concept1['batch'] == concept2['batch']:
-                    continue
-
-                # Calculate similarity
-                score = self._calculate_similarity(
-                    concept1['text'],
-                    concept2['text']
-                )
-
-                if score >= threshold:
-                    similar_pairs.append((concept1, concept2, score))
-
-        # Sort by similarity score (descending)
-        similar_pairs.sort(key=lambda x: x[2], reverse=True)
+        if len(texts) < 2:
+            return similar_pairs
+
+        # Score all cross-batch pairs at once (same weighting as _calculate_similarity)
+        rows, cols, pair_scores = self._score_pairs(texts, batch_ids, threshold)
+        keep = pair_scores >= threshold
+        rows, cols, pair_scores = rows[keep], cols[keep], pair_scores[keep]
+
+        # Sort by similarity score (descending), ties in pair order; for top_k,
+        # select the best pairs with a heap rather than sorting them all
+        if top_k is None:
+            order = np.argsort(-pair_scores, kind='stable')
+        else:
+            order = heapq.nlargest(top_k, range(len(pair_scores)), key=pair_scores.__getitem__)
+
+        # A concept in several pairs is built once and shared between them
+        concepts = {}
+        for k in order:
+            i, j = rows[k], cols[k]
+            if i not in concepts:
+                concepts[i] = self._concept(corpus, i)
+            if j not in concepts:
+                concepts[j] = self._concept(corpus, j)
+            similar_pairs.append((concepts[i], concepts[j], float(pair_scores[k])))
 
         return similar_pairs
 
@@ -79,49 +82,213 @@ class SimilarityFinder:
             List of tuples: (concept, similarity_score)
         """
         results = []
-        all_concepts = []
+        corpus, texts = self._get_texts()
 
-        # Gather all concepts
-        for batch in self.db.get_all_batches():
-            batch_id = batch.get('batch_id')
-            for concept in batch.get('concepts', []):
-                all_concepts.append({
-                    'batch': batch_id,
-                    'number': concept.get('number'),
-                    'title': concept.get('title', ''),
-                    'content': concept.get('content', ''),
-                    'text': f"{concept.get('title', '')} {concept.get('content', '')}"
-                })
+        # Compare against all concepts at once (same weighting as _calculate_similarity)
+        scores = self._score_against(concept_text.lower(), texts, threshold)
+        matches = np.flatnonzero(scores >= threshold)
+
+        # Best limit matches by score (ties in corpus order) from a heap, building only those results
+        for i in heapq.nlargest(limit, matches.tolist(), key=scores.__getitem__):
+            results.append((self._concept(corpus, i), float(scores[i])))
+
+        return results
+
+    def _get_corpus(self) -> Tuple[np.ndarray, List, List[str], List[str]]:
+        """
+        Get every batch concept as parallel columns
+
+        Scoring only needs the lowercased texts (see ``_get_texts``) and
+        batch IDs, so concepts are kept column-wise and turned into dicts
+        (see ``_concept``) only for the results returned. The corpus is kept
+        until the database's version changes, i.e. after files were added,
+        changed or removed, so repeated queries do not walk the batches
+        again.
 
-        # Compare against all concepts
-        for concept in all_concepts:
-            score = self._calculate_similarity(concept_text, concept['text'])
+        Returns:
+            Tuple of (batch IDs as an object array, numbers, titles,
+            contents), in batch and concept order
+        """
+        batches = self.db.get_all_batches()
+        version = getattr(self.db, 'version', None)
+        if self._corpus is not None and version is not None and self._corpus[0] == version:
+            return self._corpus[1]
+
+        # Gather all concepts from all batches straight into the columns
+        batch_ids, numbers, titles, contents = [], [], [], []
+        for batch_id, number, title, content in self._iter_concepts(batches):
+            batch_ids.append(batch_id)
+            numbers.append(number)
+            titles.append(title)
+            contents.append(content)
+
+        corpus = (np.array(batch_ids, dtype=object), numbers, titles, contents)
+        self._corpus = (version, corpus)
+        return corpus
+
+    def _get_texts(self) -> Tuple[Tuple, List[str]]:
+        """
+        Get the corpus with the lowercased "title content" text of each concept
 
-            if score >= threshold:
-                results.append((concept, score))
+        The texts are built on first use per corpus, so title-only scans
+        such as ``find_duplicate_titles`` never concatenate the contents.
+        """
+        corpus = self._get_corpus()
+        if self._texts is None or self._texts[0] is not corpus:
+            _, _, titles, contents = corpus
+            self._texts = (corpus, [f"{title} {content}".lower() for title, content in zip(titles, contents)])
+        return self._texts
 
-        # Sort by score and limit
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:limit]
+    def _iter_concepts(self, batches: List[Dict]) -> Iterator[Tuple[Any, Any, str, str]]:
+        """Yield (batch ID, number, title, content) for each concept of the given batches"""
+        for batch in batches:
+            batch_id = batch.get('batch_id')
+            for concept in self.db.get_concepts(batch):
+                yield batch_id, concept.get('number'), concept.get('title', ''), concept.get('content', '')
 
-    def _calculate_similarity(self, text1: str, text2: str) -> float:
+    @staticmethod
+    def _concept(corpus: Tuple, i: int) -> Dict:
+        """Build the result dict for the concept at index i of a corpus"""
+        batch_ids, numbers, titles, contents = corpus
+        return {
+            'batch': batch_ids[i],
+            'number': numbers[i],
+            'title': titles[i],
+            'content': contents[i],
+            'text': f"{titles[i]} {contents[i]}"
+        }
+
+    def _calculate_similarity(self, text1: str, text2: str, threshold: float = 0.0) -> float:
         """
         Calculate similarity between two texts
 
         Uses a combination of token set ratio and partial ratio
-        for more robust similarity detection
+        for more robust similarity detection. With a ``threshold``, each
+        ratio is given the score cutoff below which the pair cannot reach
+        it, so hopeless pairs skip the partial ratio and score 0.
         """
-        # Token set ratio (good for unordered text)
-        token_score = fuzz.token_set_ratio(text1.lower(), text2.lower())
+        text1, text2 = text1.lower(), text2.lower()
+
+        # Token set ratio (good for unordered text); the partial ratio adds
+        # at most 30 points (less a margin for float rounding)
+        token_cutoff = (threshold * 100 - 30) / 0.7 - 1e-6
+        if token_cutoff > 0:
+            token_score = fuzz.token_set_ratio(text1, text2, score_cutoff=token_cutoff)
+            if token_score < token_cutoff:
+                return 0.0
+        else:
+            token_score = fuzz.token_set_ratio(text1, text2)
 
         # Partial ratio (good for substring matches)
-        partial_score = fuzz.partial_ratio(text1.lower(), text2.lower())
+        partial_cutoff = (threshold * 100 - token_score * 0.7) / 0.3 - 1e-6
+        if partial_cutoff > 0:
+            partial_score = fuzz.partial_ratio(text1, text2, score_cutoff=partial_cutoff)
+        else:
+            partial_score = fuzz.partial_ratio(text1, text2)
 
         # Weighted average
         combined_score = (token_score * 0.7 + partial_score * 0.3)
 
         return combined_score / 100.0
 
+    def _score_pairs(
+        self,
+        texts: List[str],
+        batch_ids: np.ndarray,
+        threshold: float
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Score every unordered cross-batch pair of already-lowercased texts
+
+        Vectorized equivalent of ``_calculate_similarity``, computed by
+        RapidFuzz in native code across all cores. Token set ratios are
+        computed batch by batch against the concepts of every later batch,
+        so pairs within a batch are never scored and no full N x N matrix
+        is held; within each block, a text repeated across batches (e.g.
+        copied into favorites) is scored once. The costlier partial ratio
+        is only computed for pairs whose token score leaves them able to
+        reach ``threshold``.
+
+        Returns:
+            Tuple of (row indices, column indices, scores) for the pairs
+            that may reach the threshold, in upper-triangle order
+        """
+        # Map each text to its first occurrence; equal texts score the same
+        unique_ids: Dict[str, int] = {}
+        text_ids = np.array([unique_ids.setdefault(text, len(unique_ids)) for text in texts], dtype=np.intp)
+        unique_texts = list(unique_ids)
+
+        # Group concept indices by batch, in order of first appearance
+        group_ids: Dict[Any, int] = {}
+        groups = np.array([group_ids.setdefault(batch_id, len(group_ids)) for batch_id in batch_ids], dtype=np.intp)
+        by_group = np.argsort(groups, kind='stable')
+        bounds = np.searchsorted(groups[by_group], np.arange(len(group_ids) + 1))
+
+        # The partial ratio adds at most 30 points, so below this token score
+        # a pair cannot reach the threshold (less a margin for float rounding)
+        token_cutoff = (threshold * 100 - 30) / 0.7 - 1e-6
+        row_parts, col_parts, score_parts = [], [], []
+        for group in range(len(group_ids) - 1):
+            members = by_group[bounds[group]:bounds[group + 1]]
+            later = by_group[bounds[group + 1]:]
+            member_ids, member_rows = np.unique(text_ids[members], return_inverse=True)
+            later_ids, later_cols = np.unique(text_ids[later], return_inverse=True)
+            block = process.cdist(
+                [unique_texts[k] for k in member_ids], [unique_texts[k] for k in later_ids],
+                scorer=fuzz.token_set_ratio, dtype=np.float64, workers=-1,
+                score_cutoff=token_cutoff if token_cutoff > 0 else None
+            )[member_rows[:, None], later_cols]
+            if token_cutoff > 0:
+                r, c = np.nonzero(block >= token_cutoff)
+            else:
+                r, c = np.indices(block.shape).reshape(2, -1)
+            i, j = members[r], later[c]
+            row_parts.append(np.minimum(i, j))
+            col_parts.append(np.maximum(i, j))
+            score_parts.append(block[r, c])
+
+        if not row_parts:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp), np.zeros(0)
+        rows, cols, token_scores = np.concatenate(row_parts), np.concatenate(col_parts), np.concatenate(score_parts)
+
+        # Back into upper-triangle order, which ties in the ranking keep
+        order = np.lexsort((cols, rows))
+        rows, cols, token_scores = rows[order], cols[order], token_scores[order]
+
+        partial_scores = process.cpdist(
+            [texts[i] for i in rows], [texts[j] for j in cols],
+            scorer=fuzz.partial_ratio, dtype=np.float64, workers=-1
+        ) if len(rows) else np.zeros(0)
+
+        return rows, cols, (token_scores * 0.7 + partial_scores * 0.3) / 100.0
+
+    def _score_against(self, query: str, texts: List[str], threshold: float) -> np.ndarray:
+        """
+        Score already-lowercased texts against one already-lowercased query
+
+        Vectorized equivalent of ``_calculate_similarity``, pruned like
+        ``_score_pairs``: texts whose token score cannot reach ``threshold``
+        are not given a partial ratio and score -1.
+        """
+        if not texts:
+            return np.zeros(0)
+
+        token_cutoff = (threshold * 100 - 30) / 0.7 - 1e-6
+        token_scores = process.cdist(
+            [query], texts, scorer=fuzz.token_set_ratio, dtype=np.float64, workers=-1,
+            score_cutoff=token_cutoff if token_cutoff > 0 else None
+        )[0]
+        scores = np.full(len(texts), -1.0)
+        candidates = np.flatnonzero(token_scores >= token_cutoff) if token_cutoff > 0 else np.arange(len(texts))
+        if len(candidates):
+            partial_scores = process.cdist(
+                [query], [texts[i] for i in candidates],
+                scorer=fuzz.partial_ratio, dtype=np.float64, workers=-1
+            )[0]
+            scores[candidates] = (token_scores[candidates] * 0.7 + partial_scores * 0.3) / 100.0
+
+        return scores
+
     def find_duplicate_titles(self) -> List[Tuple[str, List[str]]]:
         """
         Find concepts with duplicate or very similar titles
@@ -130,15 +297,12 @@ class SimilarityFinder:
             List of tuples: (title, [batch_ids])
         """
         titles = {}
+        batch_ids, _, concept_titles, _ = self._get_corpus()
 
-        for batch in self.db.get_all_batches():
-            batch_id = batch.get('batch_id')
-            for concept in batch.get('concepts', []):
-                title = concept.get('title', '').strip().lower()
-                if title:
-                    if title not in titles:
-                        titles[title] = []
-                    titles[title].append(batch_id)
+        for batch_id, title in zip(batch_ids, concept_titles):
+            title = title.strip().lower()
+            if title:
+                titles.setdefault(title, []).append(batch_id)
 
         # Return only titles that appear in multiple batches
         duplicates = [(title, batches) for title, batches in titles.items() if len(batches) > 1]
@@ -3,7 +3,8 @@ Statistics and analytics module
 """
 
 from collections import Counter
-from typing import Dict, List
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 
 class StatsGenerator:
@@ -11,70 +12,27 @@ class StatsGenerator:
 
     def __init__(self, database):
         self.db = database
+        # (database version, aggregate), see _aggregate()
+        self._aggregate_cache: Optional[Tuple[Any, Dict[str, Any]]] = None
 
     def generate_stats(self) -> Dict:
         """Generate comprehensive statistics"""
         batches = self.db.get_all_batches()
-        stories = self.db.get_all_stories()
+        aggregate = self._aggregate()
 
         stats = {
             'total_batches': len(batches),
-            'total_concepts': 0,
-            'total_stories': len(stories),
-            'stories_in_development': 0,
-            'batches_by_status': Counter(),
-            'genres': Counter(),
-            'tropes': Counter(),
+            'total_concepts': aggregate['concepts'],
+            'total_stories': aggregate['stories'],
+            'stories_in_development': aggregate['stories_developing'],
+            'batches_by_status': Counter(aggregate['status']),
+            'genres': Counter(aggregate['genres']),
+            'tropes': Counter(aggregate['tropes']),
             'top_genres': [],
             'top_tropes': [],
             'recent_batches': []
         }
 
-        # Analyze batches
-        for batch in batches:
-            stats['total_concepts'] += batch.get('count', 0)
-            stats['batches_by_status'][batch.get('status', 'unknown')] += 1
-
-            # Count genres
-            genre = batch.get('genre', 'Unknown')
-            if isinstance(genre, list):
-                for g in genre:
-                    stats['genres'][g] += 1
-            else:
-                stats['genres'][genre] += 1
-
-            # Count tropes
-            tropes = batch.get('tropes', [])
-            if isinstance(tropes, str):
-                # Parse comma-separated tropes
-                tropes = [t.strip() for t in tropes.split(',')]
-            if isinstance(tropes, list):
-                for trope in tropes:
-                    if trope:
-                        stats['tropes'][trope] += 1
-
-        # Analyze stories
-        for story in stories:
-            if story.get('status') == 'developing':
-                stats['stories_in_development'] += 1
-
-            # Count genres from stories
-            genre = story.get('genre', 'Unknown')
-            if isinstance(genre, list):
-                for g in genre:
-                    stats['genres'][g] += 1
-            else:
-                stats['genres'][genre] += 1
-
-            # Count tropes from stories
-            tropes = story.get('tropes', [])
-            if isinstance(tropes, str):
-                tropes = [t.strip() for t in tropes.split(',')]
-            if isinstance(tropes, list):
-                for trope in tropes:
-                    if trope:
-                        stats['tropes'][trope] += 1
-
         # Get top genres and tropes
         stats['top_genres'] = stats['genres'].most_common(10)
         stats['top_tropes'] = stats['tropes'].most_common(10)
@@ -90,52 +48,58 @@ class StatsGenerator:
 
     def get_genre_breakdown(self) -> Dict[str, int]:
         """Get breakdown of all genres"""
-        batches = self.db.get_all_batches()
-        stories = self.db.get_all_stories()
-
-        genres = Counter()
-
-        for batch in batches:
-            genre = batch.get('genre', 'Unknown')
-            if isinstance(genre, list):
-                for g in genre:
-                    genres[g] += 1
-            else:
-                genres[genre] += 1
-
-        for story in stories:
-            genre = story.get('genre', 'Unknown')
-            if isinstance(genre, list):
-                for g in genre:
-                    genres[g] += 1
-            else:
-                genres[genre] += 1
-
-        return dict(genres)
+        return dict(self._aggregate()['genres'])
 
     def get_trope_breakdown(self) -> Dict[str, int]:
         """Get breakdown of all tropes"""
+        return dict(self._aggregate()['tropes'])
+
+    def _aggregate(self) -> Dict[str, Any]:
+        """
+        Count genres, tropes, statuses, concepts and stories in one pass
+
+        The counts are kept until the database's version changes, i.e.
+        until files were added, changed or removed, so calling several of
+        the public methods reads each record once. Callers get copies.
+        """
         batches = self.db.get_all_batches()
         stories = self.db.get_all_stories()
+        version = getattr(self.db, 'version', None)
+        if self._aggregate_cache is not None and version is not None and self._aggregate_cache[0] == version:
+            return self._aggregate_cache[1]
+
+        # Each Counter consumes a chained generator, so the counting loops run in C
+        records = batches + stories
+        genres = Counter(chain.from_iterable(_genres(record) for record in records))
+        tropes = Counter(chain.from_iterable(_tropes(record) for record in records))
+        status = Counter(batch.get('status', 'unknown') for batch in batches)
+        concepts = sum(batch.get('count', 0) for batch in batches)
+        stories_developing = sum(1 for story in stories if story.get('status') == 'developing')
+
+        aggregate = {
+            'genres': genres,
+            'tropes': tropes,
+            'status': status,
+            'concepts': concepts,
+            'stories': len(stories),
+            'stories_developing': stories_developing
+        }
+        self._aggregate_cache = (version, aggregate)
+        return aggregate
+
+
+def _genres(record: Dict) -> List:
+    """Genres of a batch or story; a single genre or a list of them"""
+    genre = record.get('genre', 'Unknown')
+    return genre if isinstance(genre, list) else [genre]
+
 
-        tropes = Counter()
-
-        for batch in batches:
-            batch_tropes = batch.get('tropes', [])
-            if isinstance(batch_tropes, str):
-                batch_tropes = [t.strip() for t in batch_tropes.split(',')]
-            if isinstance(batch_tropes, list):
-                for trope in batch_tropes:
-                    if trope:
-                        tropes[trope] += 1
-
-        for story in stories:
-            story_tropes = story.get('tropes', [])
-            if isinstance(story_tropes, str):
-                story_tropes = [t.strip() for t in story_tropes.split(',')]
-            if isinstance(story_tropes, list):
-                for trope in story_tropes:
-                    if trope:
-                        tropes[trope] += 1
-
-        return dict(tropes)
+def _tropes(record: Dict) -> Iterator[str]:
+    """Non-empty tropes of a batch or story, given as a list or comma-separated"""
+    tropes = record.get('tropes', [])
+    if isinstance(tropes, str):
+        # Parse comma-separated tropes
+        return (t for t in (t.strip() for t in tropes.split(',')) if t)
+    if isinstance(tropes, list):
+        return (t for t in tropes if t)
+    return iter(())
@@ -24,7 +24,7 @@ def temp_workspace(tmp_path):
     return workspace
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_batch_content():
     """Sample batch file content with valid frontmatter"""
     return """---
@@ -0,0 +1,77 @@
+"""
+Tests for app.py - CLI output helpers
+"""
+
+import io
+import sys
+import types
+
+import pytest
+from rich.console import Console
+from aiwynns import app
+
+
+COLUMNS = [("Title", "str", {}), ("Genre", "str", {})]
+
+
+@pytest.fixture
+def terminal(monkeypatch):
+    """Render to an in-memory terminal console with a recording speedtable stand-in"""
+    output = io.StringIO()
+    monkeypatch.setattr(app, 'get_console', lambda: Console(file=output, force_terminal=True, width=300))
+
+    rendered = []
+    speedtable = types.SimpleNamespace(render_table=lambda data, *args: rendered.append(data) or "")
+    monkeypatch.setitem(sys.modules, 'speedtable', speedtable)
+    return output, rendered
+
+
+class TestPrintTable:
+    """Test choosing a table renderer"""
+
+    def test_ascii_rows_use_speedtable(self, terminal):
+        """Test that short ASCII cells are laid out by speedtable"""
+        _, rendered = terminal
+
+        app.print_table("Batches", COLUMNS, [("Magic Sword", "Fantasy")])
+
+        assert rendered[0]['rows'] == [{"Title": "Magic Sword", "Genre": "Fantasy"}]
+
+    def test_non_ascii_rows_use_rich(self, terminal):
+        """Test that multi-byte cells, which speedtable would misalign, are rendered by Rich"""
+        output, rendered = terminal
+
+        app.print_table("Batches", COLUMNS, [("Café Noir", "Fantasy"), ("Magic Sword", "Fantasy")])
+
+        assert rendered == []
+        assert "Café Noir" in output.getvalue()
+
+    def test_long_cells_not_cut(self, terminal):
+        """Test that cells too long for speedtable are rendered in full by Rich"""
+        output, rendered = terminal
+        title = "x" * (app.SPEEDTABLE_MAX_CELL + 50)
+
+        app.print_table("Batches", COLUMNS, [(title, "Fantasy")])
+
+        assert rendered == []
+        assert title in output.getvalue()
+
+
+class TestNote:
+    """Test the note command"""
+
+    def test_scene_breaks_without_frontmatter(self, temp_workspace, monkeypatch):
+        """Test that a story with --- scene breaks but no frontmatter only gains the note"""
+        from click.testing import CliRunner
+
+        monkeypatch.setattr(app, 'PROJECT_ROOT', temp_workspace)
+        story_file = temp_workspace / "stories" / "test-story.md"
+        content = "# Test Story\n\nOpening scene.\n\n---\n\nSecond scene.\n\n---\n\nThird scene.\n"
+        story_file.write_text(content, encoding='utf-8')
+
+        result = CliRunner().invoke(app.cli, ['note', 'test-story', 'A new idea'])
+
+        assert result.exit_code == 0
+        text = story_file.read_text(encoding='utf-8')
+        assert text.startswith(content + "\n\n## Development Notes\n### [")
+        assert "date_updated" not in text
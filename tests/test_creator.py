@@ -2,10 +2,11 @@
 Tests for creator.py - File generation
 """
 
+import os
 import pytest
 from pathlib import Path
 from datetime import datetime
-from aiwynns.creator import Creator
+from aiwynns.creator import Creator, parse_concept_sections, render_template
 
 
 class TestCreator:
@@ -58,6 +59,30 @@ class TestCreator:
         assert batch_id1.endswith('-001')
         assert batch_id2.endswith('-002')
 
+    def test_create_batch_reuses_free_number(self, temp_workspace, mock_templates):
+        """Test that the next batch number is the lowest one not used today"""
+        creator = Creator(temp_workspace)
+        today = datetime.now().strftime("%Y%m%d")
+        for num in (1, 2, 3, 5):
+            (creator.concepts_dir / f"{today}-{num:03d}.md").write_text("---\n---\n")
+        (creator.concepts_dir / "19991231-004.md").write_text("---\n---\n")
+
+        file_path = creator.create_batch("Fantasy", "magic", "Test", 10)
+
+        assert file_path.stem == f"{today}-004"
+
+    def test_create_batch_past_999(self, temp_workspace, mock_templates):
+        """Test that four-digit batch numbers are counted as used"""
+        creator = Creator(temp_workspace)
+        today = datetime.now().strftime("%Y%m%d")
+        for num in range(1, 1001):
+            (creator.concepts_dir / f"{today}-{num:03d}.md").write_text("---\n---\n")
+
+        file_path = creator.create_batch("Fantasy", "magic", "Test", 10)
+
+        assert file_path.stem == f"{today}-1001"
+        assert (creator.concepts_dir / f"{today}-1000.md").read_text() == "---\n---\n"
+
     def test_create_story(self, temp_workspace, mock_templates):
         """Test creating a new story file"""
         creator = Creator(temp_workspace)
@@ -78,6 +103,29 @@ class TestCreator:
         assert "genre: Fantasy" in content
         assert "origin_batch: 20250101-001" in content
 
+    def test_create_story_leaves_other_temp_files(self, temp_workspace, mock_templates):
+        """Test that the write uses a temp file of its own and leaves none behind"""
+        creator = Creator(temp_workspace)
+        other_tmp = creator.stories_dir / "the-magic-sword.md.tmp"
+        other_tmp.write_text("another writer")
+
+        file_path = creator.create_story(title="The Magic Sword", genre="Fantasy")
+
+        assert "title: The Magic Sword" in file_path.read_text()
+        assert other_tmp.read_text() == "another writer"
+        assert sorted(p.name for p in creator.stories_dir.iterdir()) == ["the-magic-sword.md", "the-magic-sword.md.tmp"]
+
+    @pytest.mark.skipif(os.name != 'posix', reason="POSIX file modes")
+    def test_create_story_file_mode(self, temp_workspace, mock_templates):
+        """Test that the written file gets the umask's mode, not the temp file's private one"""
+        creator = Creator(temp_workspace)
+        umask = os.umask(0)
+        os.umask(umask)
+
+        file_path = creator.create_story(title="The Magic Sword", genre="Fantasy")
+
+        assert file_path.stat().st_mode & 0o777 == 0o666 & ~umask
+
     def test_create_story_duplicate_title(self, temp_workspace, mock_templates):
         """Test creating stories with duplicate titles"""
         creator = Creator(temp_workspace)
@@ -188,6 +236,40 @@ class TestCreator:
         assert "Science Fiction & Fantasy" in content
         assert "time travel, first contact, aliens" in content
 
+    def test_create_batch_values_not_rescanned(self, temp_workspace, mock_templates):
+        """Test that a value resembling a placeholder is inserted verbatim"""
+        creator = Creator(temp_workspace)
+
+        file_path = creator.create_batch("YYYY-MM-DD noir", "magic", "Test", 10)
+
+        assert "genre: YYYY-MM-DD noir" in file_path.read_text()
+
+    def test_write_failure_leaves_no_partial_file(self, temp_workspace, mock_templates, mocker):
+        """Test that a failed write raises and cleans up its temporary file"""
+        from aiwynns.exceptions import FileWriteError
+
+        creator = Creator(temp_workspace)
+        mocker.patch('aiwynns.creator.os.replace', side_effect=OSError("disk full"))
+
+        with pytest.raises(FileWriteError):
+            creator.create_story("Test Story", "Fantasy")
+
+        assert list(creator.stories_dir.iterdir()) == []
+
+    def test_edited_template_is_reread(self, temp_workspace, mock_templates):
+        """Test that a cached template is reloaded once the file changes"""
+        creator = Creator(temp_workspace)
+        creator.create_batch("Fantasy", "magic", "Test", 10)
+
+        template = temp_workspace / "templates" / "concept-batch.md"
+        template.write_text("---\nbatch_id: YYYYMMDD-001\ngenre: [genre]\nedited: true\n---\n")
+        stat = template.stat()
+        os.utime(template, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        file_path = creator.create_batch("Fantasy", "magic", "Test", 10)
+
+        assert "edited: true" in file_path.read_text()
+
     def test_batch_directory_created(self, tmp_path):
         """Test that batch directory is created if it doesn't exist"""
         workspace = tmp_path / "new_workspace"
@@ -309,3 +391,81 @@ class TestSlugifySecurity:
         # Leading dots should be removed by strip
         result = creator._slugify(".hidden")
         assert not result.startswith('.')
+
+
+class TestParseConceptSections:
+    """Test extraction of labelled concept sections"""
+
+    def test_parse_sample_concept(self, temp_workspace, sample_batch_content):
+        """Test parsing a concept extracted from a batch file"""
+        from aiwynns.database import ConceptDatabase
+
+        db = ConceptDatabase(temp_workspace)
+        concept = db._extract_concepts_from_content(sample_batch_content)[0]
+
+        sections = parse_concept_sections(concept['content'])
+
+        assert sections['high_concept'] == "A young hero discovers a magical sword"
+        assert sections['synopsis'] == "This is a test synopsis for concept 1."
+        assert sections['key_elements'] == ["Magic sword", "Young hero", "Epic quest"]
+        assert sections['initial_thoughts'] == ""
+
+    def test_multiline_sections(self):
+        """Test that synopsis and thoughts continue over several lines"""
+        content = (
+            "**High Concept**: One line\nnot part of it\n"
+            "**Synopsis**: First line\nsecond line\n\n"
+            "**Initial Thoughts**: Maybe\na trilogy\n"
+        )
+
+        sections = parse_concept_sections(content)
+
+        assert sections['high_concept'] == "One line"
+        assert sections['synopsis'] == "First line second line"
+        assert sections['initial_thoughts'] == "Maybe a trilogy"
+
+    def test_empty_bullets_and_rule_ignored(self):
+        """Test that template bullets and the trailing rule are not elements"""
+        content = "**Key Elements**:\n-\n- Real element\n-\n\n---\n"
+
+        assert parse_concept_sections(content)['key_elements'] == ["Real element"]
+
+    def test_no_sections(self):
+        """Test that content without labels yields empty values"""
+        sections = parse_concept_sections("Just some text")
+
+        assert sections == {
+            'high_concept': '',
+            'synopsis': '',
+            'key_elements': [],
+            'initial_thoughts': '',
+        }
+
+
+class TestRenderTemplate:
+    """Test single-pass placeholder substitution"""
+
+    def test_replaces_all_occurrences(self):
+        """Test that every occurrence of each placeholder is replaced"""
+        result = render_template(
+            "# [Story Title]\ntitle: [Working Title]\ncreated: YYYY-MM-DD\nupdated: YYYY-MM-DD",
+            {"[Story Title]": "Dune", "[Working Title]": "Dune", "YYYY-MM-DD": "2025-01-01"}
+        )
+
+        assert result == "# Dune\ntitle: Dune\ncreated: 2025-01-01\nupdated: 2025-01-01"
+
+    def test_values_not_rescanned(self):
+        """Test that substituted text is not itself substituted"""
+        result = render_template("[Story Title] / [genre]", {"[Story Title]": "All about [genre]", "[genre]": "Fantasy"})
+
+        assert result == "All about [genre] / Fantasy"
+
+    def test_longest_placeholder_wins(self):
+        """Test that overlapping placeholders prefer the longest match"""
+        result = render_template("## Development Notes", {"## Development": "X", "## Development Notes": "Y"})
+
+        assert result == "Y"
+
+    def test_no_replacements(self):
+        """Test that an empty mapping returns the template unchanged"""
+        assert render_template("[genre]", {}) == "[genre]"
@@ -4,7 +4,8 @@ Tests for database.py - Data access layer
 
 import pytest
 from pathlib import Path
-from aiwynns.database import ConceptDatabase
+from aiwynns.database import ConceptDatabase, date_updated_edit, parse_frontmatter
+from aiwynns.exceptions import ValidationError
 
 
 class TestConceptDatabase:
@@ -123,8 +124,8 @@ class TestConceptDatabase:
         assert batch is not None
         assert batch['batch_id'] == '20250101-001'
         assert batch['genre'] == 'Fantasy'
-        assert 'concepts' in batch
-        assert len(batch['concepts']) == 3
+        assert 'concepts' not in batch
+        assert len(db.get_concepts(batch)) == 3
 
     def test_parse_batch_file_invalid_yaml(self, temp_workspace, invalid_yaml_content):
         """Test parsing a batch file with invalid YAML"""
@@ -242,6 +243,19 @@ Content
         assert len(batches) == 1
         assert batches[0]['genre'] == "Science Fiction & Fantasy"
 
+    def test_batch_with_windows_line_endings(self, temp_workspace, sample_batch_content):
+        """Test that CRLF files parse the same as LF files"""
+        lf_file = temp_workspace / "concepts" / "generated" / "lf.md"
+        crlf_file = temp_workspace / "concepts" / "favorites" / "crlf.md"
+        lf_file.write_bytes(sample_batch_content.encode('utf-8'))
+        crlf_file.write_bytes(sample_batch_content.replace('\n', '\r\n').encode('utf-8'))
+
+        db = ConceptDatabase(temp_workspace)
+        lf, crlf = (db._parse_batch_file(path) for path in (lf_file, crlf_file))
+
+        assert crlf['content'] == lf['content']
+        assert {k: v for k, v in crlf.items() if k != 'file_path'} == {k: v for k, v in lf.items() if k != 'file_path'}
+
     def test_batch_with_date_object(self, temp_workspace):
         """Test that date objects are preserved from YAML"""
         content = """---
@@ -266,3 +280,429 @@ Content
         # date_generated should be a date object from YAML
         from datetime import date
         assert isinstance(batch['date_generated'], date)
+
+
+class TestParseFrontmatter:
+    """Test the frontmatter splitter"""
+
+    def test_metadata_and_body(self):
+        """Test splitting a document with YAML frontmatter"""
+        metadata, body = parse_frontmatter("---\ntitle: Test\ncount: 3\n---\n\n# Heading\n")
+
+        assert metadata == {'title': 'Test', 'count': 3}
+        assert body == "# Heading"
+
+    def test_rule_in_body_kept(self):
+        """Test that a horizontal rule in the body is not a delimiter"""
+        _, body = parse_frontmatter("---\na: 1\n---\nOne\n\n---\n\nTwo")
+
+        assert body == "One\n\n---\n\nTwo"
+
+    def test_no_frontmatter(self):
+        """Test that a document without a delimiter has no metadata"""
+        assert parse_frontmatter("  Just text\n") == ({}, "Just text")
+
+    def test_non_mapping_ignored(self):
+        """Test that frontmatter which is not a mapping yields no metadata"""
+        assert parse_frontmatter("---\n- a\n- b\n---\nBody") == ({}, "Body")
+
+    @pytest.mark.parametrize("frontmatter", [
+        "batch_id: 20250101-001\ndate_generated: 2025-01-15\ncount: 10\ngenre: Science Fiction\nstatus:",
+        "title: \"Quoted: with # signs\"\nsummary: 'It''s escaped'\ndraft: yes\nrating: 007",
+        "tropes: [one, two]\ngenre: Fantasy  # comment\nnested:\n  key: value",
+    ])
+    def test_simple_lines_resolved_like_yaml(self, frontmatter):
+        """Test that the fast path for flat frontmatter agrees with the YAML parser"""
+        import yaml
+
+        metadata, _ = parse_frontmatter(f"---\n{frontmatter}\n---\nBody")
+
+        expected = yaml.safe_load(frontmatter)
+        assert metadata == expected
+        assert [type(v) for v in metadata.values()] == [type(v) for v in expected.values()]
+
+
+class TestDateUpdatedEdit:
+    """Test building the frontmatter date_updated edit"""
+
+    def test_existing_line_replaced(self):
+        """Test that an existing date_updated line is replaced in place"""
+        text = "---\ntitle: Test\ndate_updated: 2025-01-01\n---\nBody\n"
+
+        assert date_updated_edit(text, "2025-03-04") == (3, 41, "\ntitle: Test\ndate_updated: 2025-03-04\n")
+
+    def test_missing_line_appended(self):
+        """Test that date_updated is appended to a frontmatter mapping without one"""
+        _, _, frontmatter = date_updated_edit("---\ntitle: Test\n---\nBody\n", "2025-03-04")
+
+        assert frontmatter == "\ntitle: Test\ndate_updated: 2025-03-04\n"
+
+    def test_scene_breaks_without_frontmatter(self):
+        """Test that --- scene breaks in a story without frontmatter are not edited"""
+        text = "# Story\n\nOpening scene.\n\n---\n\nSecond scene.\n\n---\n\nThird scene.\n"
+
+        assert date_updated_edit(text, "2025-03-04") is None
+
+    def test_non_mapping_block(self):
+        """Test that a block which is not a key/value mapping gets no date_updated"""
+        assert date_updated_edit("---\nOpening scene.\n---\nSecond scene.\n", "2025-03-04") is None
+
+class TestParseCache:
+    """Test the on-disk parse cache"""
+
+    def test_cache_file_written(self, temp_workspace, sample_batch_content):
+        """Test that scanning persists a cache file in the workspace"""
+        (temp_workspace / "concepts" / "generated" / "20250101-001.md").write_text(
+            sample_batch_content
+        )
+
+        db = ConceptDatabase(temp_workspace)
+        db.get_all_batches()
+
+        assert db.cache_file.exists()
+
+    def test_cache_writers_use_own_temp_files(self, temp_workspace, sample_batch_content, mocker):
+        """Test that each cache write goes through a temp file of its own and leaves none behind"""
+        import os
+
+        (temp_workspace / "concepts" / "generated" / "20250101-001.md").write_text(
+            sample_batch_content
+        )
+        replace = mocker.spy(os, 'replace')
+
+        ConceptDatabase(temp_workspace).get_all_batches()
+        db = ConceptDatabase(temp_workspace)
+        db._cache_dirty = True
+        db._cache = {}
+        db._save_cache()
+
+        temp_files = [call.args[0] for call in replace.call_args_list]
+        assert len(temp_files) == 2 and temp_files[0] != temp_files[1]
+        assert all(os.path.dirname(path) == str(temp_workspace) for path in temp_files)
+        assert not list(temp_workspace.glob("*.tmp"))
+
+    def test_unchanged_files_not_reparsed(self, temp_workspace, sample_batch_content, mocker):
+        """Test that a fresh instance reuses cached records for unchanged files"""
+        (temp_workspace / "concepts" / "generated" / "20250101-001.md").write_text(
+            sample_batch_content
+        )
+        ConceptDatabase(temp_workspace).get_all_batches()
+
+        db = ConceptDatabase(temp_workspace)
+        parse = mocker.spy(db, '_parse_batch_file')
+        batches = db.get_all_batches()
+
+        assert parse.call_count == 0
+        assert len(batches) == 1
+        assert batches[0]['batch_id'] == '20250101-001'
+        assert batches[0]['location'] == 'generated'
+
+    def test_modified_file_reparsed(self, temp_workspace, sample_batch_content):
+        """Test that a changed file is re-parsed instead of served from cache"""
+        import os
+
+        batch_file = temp_workspace / "concepts" / "generated" / "20250101-001.md"
+        batch_file.write_text(sample_batch_content)
+        ConceptDatabase(temp_workspace).get_all_batches()
+
+        batch_file.write_text(sample_batch_content.replace("genre: Fantasy", "genre: Horror"))
+        stat = batch_file.stat()
+        os.utime(batch_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        batches = ConceptDatabase(temp_workspace).get_all_batches()
+        assert batches[0]['genre'] == 'Horror'
+
+    def test_resized_file_with_same_mtime_reparsed(self, temp_workspace, sample_batch_content):
+        """Test that an edit changing the size is noticed even if the mtime is unchanged"""
+        import os
+
+        batch_file = temp_workspace / "concepts" / "generated" / "20250101-001.md"
+        batch_file.write_text(sample_batch_content)
+        stat = batch_file.stat()
+        ConceptDatabase(temp_workspace).get_all_batches()
+
+        batch_file.write_text(sample_batch_content.replace("genre: Fantasy", "genre: Science Fiction"))
+        os.utime(batch_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        batches = ConceptDatabase(temp_workspace).get_all_batches()
+        assert batches[0]['genre'] == 'Science Fiction'
+
+    def test_deleted_file_dropped(self, temp_workspace, sample_story_content):
+        """Test that deleted files disappear from results and the cache"""
+        story_file = temp_workspace / "stories" / "test-story.md"
+        story_file.write_text(sample_story_content)
+        ConceptDatabase(temp_workspace).get_all_stories()
+
+        story_file.unlink()
+
+        assert ConceptDatabase(temp_workspace).get_all_stories() == []
+
+    def test_corrupt_cache_ignored(self, temp_workspace, sample_batch_content):
+        """Test that an unreadable cache file falls back to parsing"""
+        (temp_workspace / "concepts" / "generated" / "20250101-001.md").write_text(
+            sample_batch_content
+        )
+        db = ConceptDatabase(temp_workspace)
+        db.cache_file.write_bytes(b"not a pickle")
+
+        batches = db.get_all_batches()
+
+        assert len(batches) == 1
+
+
+    def test_parallel_parse_matches_serial(self, temp_workspace, sample_batch_content, mocker):
+        """Test that parsing on a thread pool keeps scan order and results"""
+        for n in range(1, 13):
+            batch_id = f"20250101-{n:03d}"
+            (temp_workspace / "concepts" / "generated" / f"{batch_id}.md").write_text(
+                sample_batch_content.replace("20250101-001", batch_id)
+            )
+
+        parallel = ConceptDatabase(temp_workspace).get_all_batches()
+        ConceptDatabase(temp_workspace).cache_file.unlink()
+        mocker.patch('aiwynns.database.PARALLEL_PARSE_MIN', 1000)
+        serial = ConceptDatabase(temp_workspace).get_all_batches()
+
+        assert len(parallel) == 12
+        assert parallel == serial
+
+class TestFindRecords:
+    """Test indexed filtering and sorting of batches and stories"""
+
+    def _write_batch(self, workspace, content, batch_id, genre, status, count):
+        content = (content
+                   .replace("20250101-001", batch_id)
+                   .replace("genre: Fantasy", f"genre: {genre}")
+                   .replace("status: generated", f"status: {status}")
+                   .replace("count: 3", f"count: {count}"))
+        (workspace / "concepts" / "generated" / f"{batch_id}.md").write_text(content)
+
+    def test_find_batches_filters(self, temp_workspace, sample_batch_content):
+        """Test that status and genre filters match the linear-scan semantics"""
+        self._write_batch(temp_workspace, sample_batch_content, "20250101-001", "Fantasy", "generated", 3)
+        self._write_batch(temp_workspace, sample_batch_content, "20250101-002", "Dark Fantasy", "developing", 5)
+        self._write_batch(temp_workspace, sample_batch_content, "20250101-003", "SciFi", "generated", 1)
+
+        db = ConceptDatabase(temp_workspace)
+
+        assert len(db.find_batches()) == 3
+        assert {b['batch_id'] for b in db.find_batches(status="generated")} == {"20250101-001", "20250101-003"}
+        assert {b['batch_id'] for b in db.find_batches(genre="fantasy")} == {"20250101-001", "20250101-002"}
+        assert [b['batch_id'] for b in db.find_batches(status="generated", genre="FANT")] == ["20250101-001"]
+        assert db.find_batches(status="archived") == []
+
+    def test_find_batches_sorted(self, temp_workspace, sample_batch_content):
+        """Test that named sort orders match sorting the filtered list"""
+        self._write_batch(temp_workspace, sample_batch_content, "20250101-001", "Fantasy", "generated", 3)
+        self._write_batch(temp_workspace, sample_batch_content, "20250101-002", "Horror", "generated", 5)
+        self._write_batch(temp_workspace, sample_batch_content, "20250101-003", "Comedy", "developing", 1)
+
+        db = ConceptDatabase(temp_workspace)
+
+        assert [b['count'] for b in db.find_batches(sort="count")] == [5, 3, 1]
+        assert [b['genre'] for b in db.find_batches(sort="genre")] == ["Comedy", "Fantasy", "Horror"]
+        assert [b['count'] for b in db.find_batches(status="generated", sort="count")] == [5, 3]
+
+    def test_find_stories(self, temp_workspace, sample_story_content):
+        """Test filtering and sorting stories"""
+        (temp_workspace / "stories" / "a.md").write_text(sample_story_content)
+        (temp_workspace / "stories" / "b.md").write_text(
+            sample_story_content.replace("title: Test Story", "title: Another")
+            .replace("status: developing", "status: drafting")
+        )
+
+        db = ConceptDatabase(temp_workspace)
+
+        assert [s['title'] for s in db.find_stories(sort="title")] == ["Another", "Test Story"]
+        assert [s['title'] for s in db.find_stories(status="drafting")] == ["Another"]
+
+    def test_index_rebuilt_after_change(self, temp_workspace, sample_batch_content):
+        """Test that the version bumps and indexes refresh when files change"""
+        self._write_batch(temp_workspace, sample_batch_content, "20250101-001", "Fantasy", "generated", 3)
+
+        db = ConceptDatabase(temp_workspace)
+        assert len(db.find_batches(genre="horror")) == 0
+        version = db.version
+
+        db.find_batches()
+        assert db.version == version
+
+        self._write_batch(temp_workspace, sample_batch_content, "20250101-002", "Horror", "generated", 2)
+        assert len(db.find_batches(genre="horror")) == 1
+        assert db.version > version
+
+    def test_iter_batches_after_cursor(self, temp_workspace, sample_batch_content):
+        """Test that iteration resumes right after the cursor record"""
+        for n, count in enumerate([3, 5, 1, 4], start=1):
+            self._write_batch(temp_workspace, sample_batch_content, f"20250101-00{n}", "Fantasy", "generated", count)
+
+        db = ConceptDatabase(temp_workspace)
+
+        ordered = [b['batch_id'] for b in db.iter_batches(sort="count")]
+        assert ordered == ["20250101-002", "20250101-004", "20250101-001", "20250101-003"]
+
+        resumed = [b['batch_id'] for b in db.iter_batches(sort="count", after="20250101-004")]
+        assert resumed == ["20250101-001", "20250101-003"]
+
+    def test_iter_batches_unknown_cursor(self, temp_workspace, sample_batch_content):
+        """Test that an unknown cursor raises ValidationError"""
+        self._write_batch(temp_workspace, sample_batch_content, "20250101-001", "Fantasy", "generated", 3)
+
+        db = ConceptDatabase(temp_workspace)
+
+        with pytest.raises(ValidationError):
+            list(db.iter_batches(after="20990101-001"))
+
+    def test_iter_batches_predicate(self, temp_workspace, sample_batch_content):
+        """Test that a predicate filters lazily alongside the indexed filters"""
+        for n, count in enumerate([3, 5, 1], start=1):
+            self._write_batch(temp_workspace, sample_batch_content, f"20250101-00{n}", "Fantasy", "generated", count)
+
+        db = ConceptDatabase(temp_workspace)
+
+        big = db.find_batches(sort="count", predicate=lambda b: b.get('count', 0) >= 3)
+        assert [b['batch_id'] for b in big] == ["20250101-002", "20250101-001"]
+
+        first = next(db.iter_batches(predicate=lambda b: b.get('count') == 1))
+        assert first['batch_id'] == "20250101-003"
+
+
+class TestGetBatchCache:
+    """Test the in-process get_batch() cache"""
+
+    def test_repeat_lookup_skips_scan(self, temp_workspace, sample_batch_content, mocker):
+        """Test that a second lookup of an unchanged batch does not rescan"""
+        (temp_workspace / "concepts" / "generated" / "20250101-001.md").write_text(sample_batch_content)
+
+        db = ConceptDatabase(temp_workspace)
+        assert db.get_batch("20250101-001") is not None
+
+        scan = mocker.spy(db, 'get_all_batches')
+        batch = db.get_batch("20250101-001")
+
+        assert scan.call_count == 0
+        assert batch['batch_id'] == "20250101-001"
+        assert batch['location'] == "generated"
+
+    def test_modified_batch_reloaded(self, temp_workspace, sample_batch_content):
+        """Test that a changed file invalidates its cached batch"""
+        import os
+
+        batch_file = temp_workspace / "concepts" / "generated" / "20250101-001.md"
+        batch_file.write_text(sample_batch_content)
+
+        db = ConceptDatabase(temp_workspace)
+        db.get_batch("20250101-001")
+
+        batch_file.write_text(sample_batch_content.replace("genre: Fantasy", "genre: Horror"))
+        stat = batch_file.stat()
+        os.utime(batch_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert db.get_batch("20250101-001")['genre'] == "Horror"
+
+    def test_deleted_batch_not_served(self, temp_workspace, sample_batch_content):
+        """Test that a deleted file is not served from the cache"""
+        batch_file = temp_workspace / "concepts" / "generated" / "20250101-001.md"
+        batch_file.write_text(sample_batch_content)
+
+        db = ConceptDatabase(temp_workspace)
+        db.get_batch("20250101-001")
+        batch_file.unlink()
+
+        assert db.get_batch("20250101-001") is None
+
+    def test_refresh_clears_cache(self, temp_workspace, sample_batch_content, mocker):
+        """Test that refresh() forces the next lookup to read the file again"""
+        (temp_workspace / "concepts" / "generated" / "20250101-001.md").write_text(sample_batch_content)
+
+        db = ConceptDatabase(temp_workspace)
+        db.get_batch("20250101-001")
+        db.refresh()
+
+        parse = mocker.spy(db, '_parse_batch_file')
+        db.get_batch("20250101-001")
+
+        assert parse.call_count == 1
+
+    def test_lookup_by_filename_skips_scan(self, temp_workspace, sample_batch_content, mocker):
+        """Test that a batch saved as <batch_id>.md is found without scanning every batch"""
+        (temp_workspace / "concepts" / "favorites" / "20250101-001.md").write_text(sample_batch_content)
+        (temp_workspace / "concepts" / "generated" / "other.md").write_text(
+            sample_batch_content.replace("20250101-001", "20250101-002")
+        )
+
+        db = ConceptDatabase(temp_workspace)
+        scan = mocker.spy(db, 'get_all_batches')
+        batch = db.get_batch("20250101-001")
+
+        assert batch['batch_id'] == "20250101-001"
+        assert batch['location'] == "favorites"
+        assert scan.call_count == 0
+
+    def test_lookup_falls_back_to_scan(self, temp_workspace, sample_batch_content):
+        """Test that batches in differently named files are still found"""
+        (temp_workspace / "concepts" / "generated" / "renamed.md").write_text(sample_batch_content)
+
+        batch = ConceptDatabase(temp_workspace).get_batch("20250101-001")
+
+        assert batch['batch_id'] == "20250101-001"
+        assert batch['location'] == "generated"
+
+
+class TestScanMemo:
+    """Test the in-process memo of full directory scans"""
+
+    def test_repeat_scan_skips_listing(self, temp_workspace, sample_batch_content, mocker):
+        """Test that an unchanged workspace is served without listing directories"""
+        (temp_workspace / "concepts" / "generated" / "20250101-001.md").write_text(sample_batch_content)
+
+        db = ConceptDatabase(temp_workspace)
+        db.get_all_batches()
+
+        scan = mocker.spy(db, '_scan_markdown')
+        batches = db.get_all_batches()
+
+        assert scan.call_count == 0
+        assert [b['batch_id'] for b in batches] == ['20250101-001']
+
+    def test_sections_share_one_walk(self, temp_workspace, sample_batch_content, sample_story_content, mocker):
+        """Test that batches, stories and files are listed from a single walk"""
+        (temp_workspace / "concepts" / "generated" / "20250101-001.md").write_text(sample_batch_content)
+        (temp_workspace / "stories" / "test-story.md").write_text(sample_story_content)
+
+        db = ConceptDatabase(temp_workspace)
+        scan = mocker.spy(db, '_scan_markdown')
+        db.get_all_batches()
+        db.get_all_stories()
+        files = db.get_all_files()
+
+        # One scandir per batch subdirectory plus one for stories
+        assert scan.call_count == 4
+        assert len(files) == 2
+
+    def test_in_place_edit_detected(self, temp_workspace, sample_story_content):
+        """Test that editing a file without touching its directory is noticed"""
+        import os
+
+        story_file = temp_workspace / "stories" / "test-story.md"
+        story_file.write_text(sample_story_content)
+
+        db = ConceptDatabase(temp_workspace)
+        db.get_all_stories()
+
+        story_file.write_text(sample_story_content.replace("genre: Fantasy", "genre: Horror"))
+        stat = story_file.stat()
+        os.utime(story_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert db.get_all_stories()[0]['genre'] == 'Horror'
+
+    def test_added_file_detected(self, temp_workspace, sample_batch_content):
+        """Test that a new file in a batch directory is picked up"""
+        db = ConceptDatabase(temp_workspace)
+        assert db.get_all_batches() == []
+
+        (temp_workspace / "concepts" / "favorites" / "20250101-002.md").write_text(
+            sample_batch_content.replace("20250101-001", "20250101-002")
+        )
+
+        assert [b['batch_id'] for b in db.get_all_batches()] == ['20250101-002']
@@ -0,0 +1,41 @@
+"""
+Tests for indexer.py - INDEX.md generation
+"""
+
+from aiwynns.database import ConceptDatabase
+from aiwynns.indexer import Indexer
+
+
+def write_batch(workspace, location, batch_id, date_line):
+    """Write a one-concept batch file into a concepts subdirectory"""
+    (workspace / "concepts" / location / f"{batch_id}.md").write_text(
+        f"---\nbatch_id: {batch_id}\n{date_line}genre: Fantasy\ncount: 1\nstatus: generated\n---\n\n"
+        f"## Concept 1: Test\nContent\n"
+    )
+
+
+class TestUpdateIndex:
+    """Test rebuilding INDEX.md"""
+
+    def test_batches_sorted_by_date_within_location(self, temp_workspace):
+        """Test that each location lists its batches newest first"""
+        write_batch(temp_workspace, "generated", "20250101-001", "date_generated: 2025-01-01\n")
+        write_batch(temp_workspace, "generated", "20250301-001", "date_generated: 2025-03-01\n")
+        write_batch(temp_workspace, "favorites", "20250201-001", "date_generated: 2025-02-01\n")
+
+        Indexer(temp_workspace, ConceptDatabase(temp_workspace)).update_index()
+
+        index = (temp_workspace / "INDEX.md").read_text()
+        assert index.index("### GENERATED") < index.index("20250301-001") < index.index("20250101-001")
+        assert index.index("20250101-001") < index.index("### FAVORITES") < index.index("20250201-001")
+
+    def test_undated_batch_in_other_location(self, temp_workspace):
+        """Test that a dated and an undated batch in different locations are never compared"""
+        write_batch(temp_workspace, "generated", "20250101-001", "date_generated: 2025-01-01\n")
+        write_batch(temp_workspace, "favorites", "20250102-001", "")
+
+        Indexer(temp_workspace, ConceptDatabase(temp_workspace)).update_index()
+
+        index = (temp_workspace / "INDEX.md").read_text()
+        assert "**[20250101-001]**" in index
+        assert "**[20250102-001]**" in index
@@ -7,6 +7,9 @@ import logging
 import tempfile
 from pathlib import Path
 from aiwynns.logging_config import (
+    BackgroundHandler,
+    BatchedRotatingFileHandler,
+    JsonLinesFormatter,
     setup_logging,
     get_logger,
     set_level,
@@ -61,11 +64,150 @@ class TestLoggingSetup:
 
         finally:
             # Close handlers before deleting
-            for handler in logging.getLogger('aiwynns').handlers:
+            for handler in list(logging.getLogger('aiwynns').handlers):
                 handler.close()
             if log_file.exists():
                 log_file.unlink()
 
+    def test_file_handler_writes_on_background_thread(self, tmp_path):
+        """Test that file writes happen on the listener thread, not the caller's"""
+        import threading
+
+        log_file = tmp_path / "aiwynns.log"
+        setup_logging(level=logging.INFO, log_file=log_file, console_output=False)
+
+        logger = logging.getLogger('aiwynns')
+        try:
+            background = [h for h in logger.handlers if isinstance(h, BackgroundHandler)]
+            assert len(background) == 1
+
+            writer_threads = []
+            original_emit = background[0].handler.emit
+
+            def emit(record):
+                writer_threads.append(threading.current_thread())
+                original_emit(record)
+
+            background[0].handler.emit = emit
+            get_logger('aiwynns.test_module').info("Queued message")
+            background[0].flush()
+
+            assert writer_threads and threading.current_thread() not in writer_threads
+            assert "Queued message" in log_file.read_text()
+        finally:
+            for handler in list(logger.handlers):
+                handler.close()
+
+    def test_setup_logging_again_stops_listener(self, tmp_path):
+        """Test that reconfiguring logging stops the previous background listener"""
+        setup_logging(level=logging.INFO, log_file=tmp_path / "a.log", console_output=False)
+        old_handler = logging.getLogger('aiwynns').handlers[0]
+
+        setup_logging(level=logging.INFO, console_output=False)
+
+        assert old_handler.listener._thread is None
+        assert old_handler not in logging.getLogger('aiwynns').handlers
+
+    def test_records_after_close_are_written_directly(self, tmp_path):
+        """Test that a closed background handler detaches and no longer waits on its queue"""
+        import threading
+
+        log_file = tmp_path / "aiwynns.log"
+        setup_logging(level=logging.INFO, log_file=log_file, console_output=False)
+        handler = logging.getLogger('aiwynns').handlers[0]
+
+        handler.close()
+        handler.handle(logging.LogRecord('aiwynns.late', logging.INFO, __file__, 0, "Late message", None, None))
+        flusher = threading.Thread(target=handler.flush, daemon=True)
+        flusher.start()
+        flusher.join(timeout=10)
+
+        assert not flusher.is_alive()
+        assert handler not in logging.getLogger('aiwynns').handlers
+        assert "Late message" in log_file.read_text()
+
+    def test_logging_from_later_atexit_hook_exits(self, tmp_path):
+        """Test that logging after the background handlers were closed at exit does not hang"""
+        import subprocess
+        import sys
+
+        script = (
+            "import atexit, logging\n"
+            "atexit.register(lambda: logging.getLogger('aiwynns.late').warning('Late message'))\n"
+            "from pathlib import Path\n"
+            "from aiwynns.logging_config import setup_logging\n"
+            f"setup_logging(level=logging.INFO, log_file=Path({str(tmp_path / 'a.log')!r}), console_output=False)\n"
+            "logging.getLogger('aiwynns.test').info('Early message')\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script], cwd=Path(__file__).parent.parent,
+            capture_output=True, timeout=30
+        )
+
+        assert result.returncode == 0
+        assert "Early message" in (tmp_path / "a.log").read_text()
+
+    def test_batched_file_handler_buffers_until_flush(self, tmp_path):
+        """Test that records are written in batches, and errors straight away"""
+        log_file = tmp_path / "batched.log"
+        handler = BatchedRotatingFileHandler(log_file, capacity=3, encoding='utf-8')
+        logger = logging.getLogger('aiwynns.batched')
+        logger.addHandler(handler)
+        logger.propagate = False
+        try:
+            logger.warning("first")
+            logger.warning("second")
+            assert "first" not in log_file.read_text()
+
+            logger.warning("third")
+            assert log_file.read_text().splitlines() == ["first", "second", "third"]
+
+            logger.error("failure")
+            assert log_file.read_text().splitlines()[-1] == "failure"
+        finally:
+            logger.removeHandler(handler)
+            logger.propagate = True
+            handler.close()
+
+    def test_batched_file_handler_rolls_over(self, tmp_path):
+        """Test that a batch that would exceed maxBytes starts a new file"""
+        log_file = tmp_path / "rolled.log"
+        handler = BatchedRotatingFileHandler(log_file, maxBytes=50, backupCount=1, encoding='utf-8')
+        record = logging.LogRecord('aiwynns', logging.INFO, __file__, 1, "x" * 30, None, None)
+        try:
+            handler.handle(record)
+            handler.flush()
+            handler.handle(record)
+            handler.flush()
+        finally:
+            handler.close()
+
+        assert log_file.read_text() == "x" * 30 + "\n"
+        assert (tmp_path / "rolled.log.1").read_text() == "x" * 30 + "\n"
+
+    def test_structured_log_file(self, tmp_path, monkeypatch):
+        """Test that AIWYNNS_LOG_FORMAT=json writes the log file as JSON lines"""
+        import json
+
+        monkeypatch.setenv('AIWYNNS_LOG_FORMAT', 'json')
+        log_file = tmp_path / "aiwynns.jsonl"
+        setup_logging(level=logging.INFO, log_file=log_file, console_output=False)
+
+        logger = logging.getLogger('aiwynns')
+        try:
+            assert isinstance(logger.handlers[0].handler.formatter, JsonLinesFormatter)
+            get_logger('aiwynns.test_module').info("Found %d results", 3)
+            logger.handlers[0].flush()
+        finally:
+            for handler in list(logger.handlers):
+                handler.close()
+
+        entries = [json.loads(line) for line in log_file.read_text().splitlines()]
+        assert entries[-1]['name'] == 'aiwynns.test_module'
+        assert entries[-1]['level'] == 'INFO'
+        assert entries[-1]['msg'] == "Found 3 results"
+        assert isinstance(entries[-1]['t'], float)
+
     def test_setup_logging_no_console(self):
         """Test logging setup without console output"""
         setup_logging(level=logging.INFO, console_output=False)
@@ -151,6 +293,25 @@ class TestLoggingSetup:
         # Handlers should be cleared and recreated, not duplicated
         assert len(logger.handlers) == initial_count
 
+    def test_repeat_setup_keeps_handlers(self):
+        """Test that setting up again with the same settings keeps the handlers"""
+        setup_logging(level=logging.INFO, console_output=True)
+        logger = logging.getLogger('aiwynns')
+        handlers = list(logger.handlers)
+
+        setup_logging(level=logging.INFO, console_output=True)
+        assert logger.handlers == handlers and all(a is b for a, b in zip(logger.handlers, handlers))
+
+        # Changed settings or a changed logger are set up again
+        set_level(logging.DEBUG)
+        setup_logging(level=logging.INFO, console_output=True)
+        assert logger.level == logging.INFO
+        assert all(handler.level == logging.INFO for handler in logger.handlers)
+
+        logger.handlers.clear()
+        setup_logging(level=logging.INFO, console_output=True)
+        assert logger.handlers
+
 
 class TestLoggingIntegration:
     """Test logging integration with other modules"""
@@ -0,0 +1,186 @@
+"""
+Tests for mcp_server.py - MCP tools
+"""
+
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+from aiwynns import mcp_server
+
+
+class FixedDatetime(datetime):
+    """datetime whose now() is a fixed moment"""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2025, 3, 4, 5, 6)
+
+
+NOTE = b"\n### [2025-03-04 05:06]\nA new idea\n"
+
+
+@pytest.fixture
+def story_workspace(temp_workspace, monkeypatch):
+    """Point the MCP server at a temporary workspace with a fixed clock"""
+    monkeypatch.setattr(mcp_server, 'PROJECT_ROOT', temp_workspace)
+    monkeypatch.setattr(mcp_server, 'datetime', FixedDatetime)
+    return temp_workspace
+
+
+def add_note(workspace, content: bytes, section=None) -> bytes:
+    """Write a story, add a note to it and return the resulting file bytes"""
+    story_file = workspace / "stories" / "test-story.md"
+    story_file.write_bytes(content)
+
+    result = json.loads(asyncio.run(mcp_server.add_note("test-story", "A new idea", section)))
+
+    assert result['success'] is True
+    return story_file.read_bytes()
+
+
+class TestAddNote:
+    """Test adding notes to story files"""
+
+    def test_same_width_date_updated_in_place(self, story_workspace, mocker):
+        """Test that a same-width date is overwritten and only the text after the note rewritten"""
+        content = (
+            b"---\ntitle: Test Story\ndate_updated: 2025-01-01\n---\n\n"
+            b"## Development Notes\nOld note\n\n## Themes\nHope\n"
+        )
+        write = mocker.spy(mcp_server, 'write_edits')
+
+        result = add_note(story_workspace, content)
+
+        assert result == (
+            b"---\ntitle: Test Story\ndate_updated: 2025-03-04\n---\n\n"
+            b"## Development Notes" + NOTE + b"\nOld note\n\n## Themes\nHope\n"
+        )
+        # The frontmatter edit keeps its width, so write_edits overwrites it in place
+        assert write.call_args.args[2][0] == (3, 47, "\ntitle: Test Story\ndate_updated: 2025-03-04\n")
+
+    def test_same_width_edit_leaves_other_bytes_alone(self, tmp_path):
+        """Test that write_edits only writes the bytes of an edit that keeps its width"""
+        story_file = tmp_path / "story.md"
+        # The bytes after the edit differ from the text passed in: only an
+        # in-place overwrite of the edited range leaves them as they are
+        story_file.write_bytes("dätë: 2025-01-01\nON DISK\n".encode('utf-8'))
+
+        mcp_server.write_edits(story_file, "dätë: 2025-01-01\nin text\n", [(6, 16, "2025-03-04")])
+
+        assert story_file.read_bytes() == "dätë: 2025-03-04\nON DISK\n".encode('utf-8')
+
+    def test_date_length_changes(self, story_workspace):
+        """Test that a date of a different width rewrites the rest of the file"""
+        content = b"---\ntitle: Test Story\ndate_updated: 2025-1-1\n---\n\n## Development Notes\nOld note\n"
+
+        result = add_note(story_workspace, content)
+
+        assert result == (
+            b"---\ntitle: Test Story\ndate_updated: 2025-03-04\n---\n\n"
+            b"## Development Notes" + NOTE + b"\nOld note\n"
+        )
+
+    def test_multibyte_characters_before_note(self, story_workspace):
+        """Test that byte offsets account for multi-byte characters before the edits"""
+        content = (
+            "---\ntitle: Café Noir — ünïcode\ndate_updated: 2025-01-01\n---\n\n"
+            "## Logline\nA café in Zürich ☕\n\n## Development Notes\nÄltere Notiz\n"
+        ).encode('utf-8')
+
+        result = add_note(story_workspace, content)
+
+        assert result == (
+            "---\ntitle: Café Noir — ünïcode\ndate_updated: 2025-03-04\n---\n\n"
+            "## Logline\nA café in Zürich ☕\n\n## Development Notes"
+        ).encode('utf-8') + NOTE + "\nÄltere Notiz\n".encode('utf-8')
+
+    def test_crlf_file_rewritten_with_lf(self, story_workspace):
+        """Test that CRLF line endings are normalized like a text-mode read and write"""
+        content = (
+            b"---\r\ntitle: Test Story\r\ndate_updated: 2025-01-01\r\n---\r\n\r\n"
+            b"## Development Notes\r\nOld note\r\n"
+        )
+
+        result = add_note(story_workspace, content)
+
+        assert result == (
+            b"---\ntitle: Test Story\ndate_updated: 2025-03-04\n---\n\n"
+            b"## Development Notes" + NOTE + b"\nOld note\n"
+        )
+
+    def test_no_frontmatter(self, story_workspace):
+        """Test that a story without frontmatter gets a notes section and no date"""
+        content = b"# Test Story\n\nJust text.\n"
+
+        result = add_note(story_workspace, content)
+
+        assert result == b"# Test Story\n\nJust text.\n\n\n## Development Notes" + NOTE
+
+    def test_scene_breaks_without_frontmatter(self, story_workspace):
+        """Test that --- scene breaks in a story without frontmatter are left alone"""
+        content = b"# Test Story\n\nOpening scene.\n\n---\n\nSecond scene.\n\n---\n\nThird scene.\n"
+
+        result = add_note(story_workspace, content)
+
+        assert result == content + b"\n\n## Development Notes" + NOTE
+
+    def test_missing_section_falls_back_to_notes(self, story_workspace):
+        """Test that a section heading that is not in the story falls back to Development Notes"""
+        content = (
+            b"---\ntitle: Test Story\ndate_updated: 2025-01-01\n---\n\n"
+            b"## Development Notes\nOld note\n"
+        )
+
+        result = add_note(story_workspace, content, section="themes")
+
+        assert result == (
+            b"---\ntitle: Test Story\ndate_updated: 2025-03-04\n---\n\n"
+            b"## Development Notes" + NOTE + b"\nOld note\n"
+        )
+
+    def test_note_added_to_section(self, story_workspace):
+        """Test that a note for an existing section goes before the next heading"""
+        content = (
+            b"---\ntitle: Test Story\ndate_updated: 2025-01-01\n---\n\n"
+            b"## Themes\nHope\n\n## Development Notes\nOld note\n"
+        )
+
+        result = add_note(story_workspace, content, section="themes")
+
+        assert result == (
+            b"---\ntitle: Test Story\ndate_updated: 2025-03-04\n---\n\n"
+            b"## Themes\nHope\n" + NOTE + b"\n## Development Notes\nOld note\n"
+        )
+
+
+class TestListBatches:
+    """Test listing batches"""
+
+    def test_limit_keeps_full_total(self, temp_workspace, sample_batch_content, monkeypatch):
+        """Test that total counts every matching batch while returned counts the page"""
+        from aiwynns.database import ConceptDatabase
+
+        for num in range(1, 4):
+            batch_id = f"20250101-00{num}"
+            content = sample_batch_content.replace("20250101-001", batch_id)
+            (temp_workspace / "concepts" / "generated" / f"{batch_id}.md").write_text(content)
+        monkeypatch.setattr(mcp_server, 'db', ConceptDatabase(temp_workspace))
+
+        result = json.loads(asyncio.run(mcp_server.list_batches_tool(status="generated", limit=2)))
+
+        assert result['total'] == 3
+        assert result['returned'] == 2
+        assert result['has_more'] is True
+        assert len(result['batches']) == 2
+
+
+class TestReadStory:
+    """Test the story resource"""
+
+    def test_unreadable_name_not_found(self, story_workspace):
+        """Test that a name the filesystem rejects is reported as not found"""
+        result = json.loads(asyncio.run(mcp_server.read_story("x" * 300)))
+
+        assert result == {"error": f"Story {'x' * 300} not found"}
@@ -3,62 +3,57 @@ Tests for search.py - Search functionality
 """
 
 import pytest
+from aiwynns.database import ConceptDatabase
 from aiwynns.search import SearchEngine
 from aiwynns.validation import ValidationError
 
 
+@pytest.fixture(scope="module")
+def validation_only_search(tmp_path_factory):
+    """SearchEngine over an empty workspace, shared by tests that never write files"""
+    workspace = tmp_path_factory.mktemp("ws_val")
+    (workspace / "concepts" / "generated").mkdir(parents=True)
+    return SearchEngine(ConceptDatabase(workspace))
+
+
+@pytest.fixture(scope="module")
+def populated_workspace(tmp_path_factory, sample_batch_content):
+    """Workspace with five copies of the sample batch, shared by tests that only read it"""
+    workspace = tmp_path_factory.mktemp("populated")
+    generated = workspace / "concepts" / "generated"
+    generated.mkdir(parents=True)
+    for i in range(5):
+        (generated / f"batch{i}.md").write_text(sample_batch_content)
+    return workspace
+
+
 class TestSearchValidation:
     """Test validation in SearchEngine"""
 
-    def test_search_empty_query(self, temp_workspace):
+    def test_search_empty_query(self, validation_only_search):
         """Test that empty query raises ValidationError"""
-        from aiwynns.database import ConceptDatabase
-
-        db = ConceptDatabase(temp_workspace)
-        search = SearchEngine(db)
-
         with pytest.raises(ValidationError):
-            search.search("")
+            validation_only_search.search("")
 
-    def test_search_none_query(self, temp_workspace):
+    def test_search_none_query(self, validation_only_search):
         """Test that None query raises ValidationError"""
-        from aiwynns.database import ConceptDatabase
-
-        db = ConceptDatabase(temp_workspace)
-        search = SearchEngine(db)
-
         with pytest.raises(ValidationError):
-            search.search(None)
+            validation_only_search.search(None)
 
-    def test_search_invalid_limit_negative(self, temp_workspace):
+    def test_search_invalid_limit_negative(self, validation_only_search):
         """Test that negative limit raises ValidationError"""
-        from aiwynns.database import ConceptDatabase
-
-        db = ConceptDatabase(temp_workspace)
-        search = SearchEngine(db)
-
         with pytest.raises(ValidationError):
-            search.search("test", limit=-1)
+            validation_only_search.search("test", limit=-1)
 
-    def test_search_invalid_limit_too_large(self, temp_workspace):
+    def test_search_invalid_limit_too_large(self, validation_only_search):
         """Test that limit > 1000 raises ValidationError"""
-        from aiwynns.database import ConceptDatabase
-
-        db = ConceptDatabase(temp_workspace)
-        search = SearchEngine(db)
-
         with pytest.raises(ValidationError):
-            search.search("test", limit=2000)
+            validation_only_search.search("test", limit=2000)
 
-    def test_search_valid_inputs(self, temp_workspace):
+    def test_search_valid_inputs(self, validation_only_search):
         """Test that valid inputs work correctly"""
-        from aiwynns.database import ConceptDatabase
-
-        db = ConceptDatabase(temp_workspace)
-        search = SearchEngine(db)
-
         # Should not raise
-        results = search.search("test", genre="Fantasy", limit=10)
+        results = validation_only_search.search("test", genre="Fantasy", limit=10)
         assert isinstance(results, list)
 
 
@@ -67,38 +62,24 @@ class TestSearchFunctionality:
 
     def test_search_returns_list(self, temp_workspace):
         """Test that search returns a list"""
-        from aiwynns.database import ConceptDatabase
-
         db = ConceptDatabase(temp_workspace)
         search = SearchEngine(db)
 
         results = search.search("test")
         assert isinstance(results, list)
 
-    def test_search_respects_limit(self, temp_workspace, sample_batch_content):
+    def test_search_respects_limit(self, populated_workspace):
         """Test that search respects limit parameter"""
-        from aiwynns.database import ConceptDatabase
-
-        # Create multiple batch files
-        for i in range(5):
-            batch_file = temp_workspace / "concepts" / "generated" / f"batch{i}.md"
-            batch_file.write_text(sample_batch_content)
-
-        db = ConceptDatabase(temp_workspace)
+        db = ConceptDatabase(populated_workspace)
         search = SearchEngine(db)
 
         # Search should return at most the limit
         results = search.search("Test", limit=2)
         assert len(results) <= 2
 
-    def test_search_with_genre_filter(self, temp_workspace, sample_batch_content):
+    def test_search_with_genre_filter(self, populated_workspace):
         """Test search with genre filter"""
-        from aiwynns.database import ConceptDatabase
-
-        batch_file = temp_workspace / "concepts" / "generated" / "batch1.md"
-        batch_file.write_text(sample_batch_content)
-
-        db = ConceptDatabase(temp_workspace)
+        db = ConceptDatabase(populated_workspace)
         search = SearchEngine(db)
 
         # Search with matching genre
@@ -108,3 +89,34 @@ class TestSearchFunctionality:
         # Search with non-matching genre
         results = search.search("Test", genre="SciFi")
         assert isinstance(results, list)
+
+    def test_search_index_reused_until_files_change(self, temp_workspace, sample_batch_content, mocker):
+        """Test that the search index is only rebuilt when the database changes"""
+        batch_file = temp_workspace / "concepts" / "generated" / "batch1.md"
+        batch_file.write_text(sample_batch_content)
+
+        db = ConceptDatabase(temp_workspace)
+        search = SearchEngine(db)
+        spy = mocker.spy(db, 'get_concepts')
+
+        first = search.search("Test")
+        assert search.search("Test") == first
+        assert spy.call_count == 1
+
+        (temp_workspace / "concepts" / "generated" / "batch2.md").write_text(sample_batch_content)
+
+        assert len(search.search("Test")) == 2 * len(first)
+        assert spy.call_count == 3
+
+    def test_exact_search_matches_each_text_once(self, temp_workspace, sample_batch_content):
+        """Test that exact search returns each matching concept once, in order"""
+        batch_file = temp_workspace / "concepts" / "generated" / "batch1.md"
+        batch_file.write_text(sample_batch_content)
+
+        db = ConceptDatabase(temp_workspace)
+        search = SearchEngine(db)
+
+        titles = [c['title'] for c in db.get_concepts(db.get_all_batches()[0])]
+        results = search.search("concept")
+        assert [r['title'] for r in results] == titles
+        assert all('concept' in r['preview'].lower() for r in results)
@@ -0,0 +1,169 @@
+"""
+Tests for similarity.py - Similar concept detection
+"""
+
+import pytest
+from aiwynns.database import ConceptDatabase
+from aiwynns.similarity import SimilarityFinder
+
+
+def write_batch(workspace, batch_id, concepts):
+    """Write a batch file with the given (title, body) concepts"""
+    sections = "\n".join(
+        f"## Concept {n}: {title}\n{body}\n" for n, (title, body) in enumerate(concepts, start=1)
+    )
+    (workspace / "concepts" / "generated" / f"{batch_id}.md").write_text(
+        f"---\nbatch_id: {batch_id}\ngenre: Fantasy\nstatus: generated\n---\n\n{sections}"
+    )
+
+
+@pytest.fixture
+def similar_workspace(temp_workspace):
+    """Workspace with overlapping concepts across three batches"""
+    write_batch(temp_workspace, "20250101-001", [
+        ("The Magic Sword", "A young hero discovers a magical sword in a lake."),
+        ("The Dark Forest", "Adventurers must traverse a haunted forest."),
+    ])
+    write_batch(temp_workspace, "20250101-002", [
+        ("The Magic Sword", "A young hero finds a magical sword in a lake."),
+        ("Star Merchants", "Traders smuggle relics between dying suns."),
+    ])
+    write_batch(temp_workspace, "20250101-003", [
+        ("Dark Forest", "Adventurers traverse a haunted forest at night."),
+        ("The Magic Blade", "A young heroine discovers a magical blade."),
+    ])
+    return temp_workspace
+
+
+class TestFindSimilarConcepts:
+    """Test pairwise similarity across batches"""
+
+    def test_matches_pairwise_scores(self, similar_workspace):
+        """Test that vectorized scoring matches scoring each pair separately"""
+        finder = SimilarityFinder(ConceptDatabase(similar_workspace))
+
+        pairs = finder.find_similar_concepts(threshold=0.5)
+
+        assert pairs
+        for concept1, concept2, score in pairs:
+            assert score == finder._calculate_similarity(concept1['text'], concept2['text'])
+            assert score >= 0.5
+
+    def test_high_threshold_matches_unpruned_scores(self, similar_workspace):
+        """Test that pruning on the token score drops no pair that reaches the threshold"""
+        finder = SimilarityFinder(ConceptDatabase(similar_workspace))
+
+        every_pair = finder.find_similar_concepts(threshold=0.0)
+        expected = [(c1['title'], c2['title'], score) for c1, c2, score in every_pair if score >= 0.7]
+
+        pairs = finder.find_similar_concepts(threshold=0.7)
+
+        assert expected
+        assert [(c1['title'], c2['title'], score) for c1, c2, score in pairs] == expected
+
+    def test_skips_same_batch_pairs(self, similar_workspace):
+        """Test that concepts are never paired with their own batch"""
+        finder = SimilarityFinder(ConceptDatabase(similar_workspace))
+
+        for concept1, concept2, _ in finder.find_similar_concepts(threshold=0.0):
+            assert concept1['batch'] != concept2['batch']
+
+    def test_all_cross_batch_pairs_at_zero_threshold(self, similar_workspace):
+        """Test that each unordered cross-batch pair is reported exactly once"""
+        finder = SimilarityFinder(ConceptDatabase(similar_workspace))
+
+        pairs = finder.find_similar_concepts(threshold=0.0)
+
+        keys = {frozenset([(c1['batch'], c1['number']), (c2['batch'], c2['number'])]) for c1, c2, _ in pairs}
+        # 6 concepts in 3 batches of 2: 15 pairs minus 3 same-batch pairs
+        assert len(pairs) == len(keys) == 12
+
+    def test_sorted_by_score(self, similar_workspace):
+        """Test that results are sorted by descending score"""
+        finder = SimilarityFinder(ConceptDatabase(similar_workspace))
+
+        scores = [score for _, _, score in finder.find_similar_concepts(threshold=0.0)]
+
+        assert scores == sorted(scores, reverse=True)
+
+    def test_top_k_returns_best_pairs(self, similar_workspace):
+        """Test that top_k returns the leading pairs of the full ranking"""
+        finder = SimilarityFinder(ConceptDatabase(similar_workspace))
+
+        every_pair = finder.find_similar_concepts(threshold=0.0)
+
+        assert finder.find_similar_concepts(threshold=0.0, top_k=3) == every_pair[:3]
+        assert finder.find_similar_concepts(threshold=0.0, top_k=100) == every_pair
+
+    def test_no_concepts(self, temp_workspace):
+        """Test that an empty workspace yields no pairs"""
+        finder = SimilarityFinder(ConceptDatabase(temp_workspace))
+
+        assert finder.find_similar_concepts() == []
+
+
+class TestFindSimilarToConcept:
+    """Test scoring the corpus against a single text"""
+
+    def test_matches_pairwise_scores(self, similar_workspace):
+        """Test that scores match _calculate_similarity and respect the threshold"""
+        finder = SimilarityFinder(ConceptDatabase(similar_workspace))
+        text = "A hero discovers a magical sword"
+
+        results = finder.find_similar_to_concept(text, limit=10, threshold=0.5)
+
+        assert results
+        for concept, score in results:
+            assert score == finder._calculate_similarity(text, concept['text'])
+            assert score >= 0.5
+
+    def test_threshold_keeps_every_reachable_match(self, similar_workspace):
+        """Test that pruning drops only concepts below the threshold"""
+        finder = SimilarityFinder(ConceptDatabase(similar_workspace))
+        text = "Adventurers in a haunted forest"
+
+        everything = finder.find_similar_to_concept(text, limit=100, threshold=0.0)
+        expected = [(c['title'], score) for c, score in everything if score >= 0.6]
+
+        results = finder.find_similar_to_concept(text, limit=100, threshold=0.6)
+
+        assert [(c['title'], score) for c, score in results] == expected
+
+    def test_limit(self, similar_workspace):
+        """Test that at most limit results are returned, best first"""
+        finder = SimilarityFinder(ConceptDatabase(similar_workspace))
+
+        results = finder.find_similar_to_concept("magic sword", limit=2, threshold=0.0)
+
+        assert len(results) == 2
+        assert results[0][1] >= results[1][1]
+
+    def test_corpus_reused_until_files_change(self, similar_workspace, mocker):
+        """Test that concepts are only gathered again when the database changes"""
+        db = ConceptDatabase(similar_workspace)
+        finder = SimilarityFinder(db)
+        spy = mocker.spy(db, 'get_concepts')
+
+        first = finder.find_similar_to_concept("magic sword", limit=100, threshold=0.0)
+        assert finder.find_similar_to_concept("magic sword", limit=100, threshold=0.0) == first
+        finder.find_similar_concepts(threshold=0.0)
+        assert spy.call_count == 3
+
+        write_batch(similar_workspace, "20250101-004", [("The Magic Sword", "A hero finds a sword.")])
+
+        assert len(finder.find_similar_to_concept("magic sword", limit=100, threshold=0.0)) == len(first) + 1
+        assert spy.call_count == 7
+
+
+class TestCalculateSimilarity:
+    """Test scoring a single pair of texts"""
+
+    def test_threshold_only_cuts_pairs_below_it(self):
+        """Test that a threshold leaves reachable scores unchanged and zeroes the rest"""
+        finder = SimilarityFinder(None)
+        close = ("The Magic Sword", "the magic swords of the lake")
+        far = ("The Magic Sword", "Star merchants smuggle relics")
+
+        assert finder._calculate_similarity(*close, threshold=0.6) == finder._calculate_similarity(*close)
+        assert finder._calculate_similarity(*far) < 0.6
+        assert finder._calculate_similarity(*far, threshold=0.6) == 0.0